@@ -6,14 +6,28 @@
 
 # pyre-strict
 
+import asyncio
+import functools
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Generic, List, Optional, Type, TypeVar
+from time import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from fbpcs.bolt.bolt_checkpoint import bolt_checkpoint
 
 from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs
+from fbpcs.bolt.constants import BOLT_CLIENT_STATE_STALENESS_SEC
 from fbpcs.private_computation.entity.pcs_feature import PCSFeature
 
 from fbpcs.private_computation.entity.private_computation_status import (
@@ -36,16 +50,45 @@ class BoltState:
     server_hostnames: Optional[List[str]] = None
 
 
+C = TypeVar("C", bound="BoltClient")
+
+
+def single_flight(
+    update_instance: Callable[[C, str], Awaitable[BoltState]]
+) -> Callable[[C, str], Awaitable[BoltState]]:
+    """Makes the concurrent or closely spaced calls of update_instance share one read
+
+    The calls for an instance that come while a read of it is in flight wait for
+    it, and the state it returns is reused by the calls of the next
+    state_staleness seconds, until invalidate_state is called.
+    """
+
+    @functools.wraps(update_instance)
+    async def wrapper(self: C, instance_id: str) -> BoltState:
+        return await self._read_state(
+            instance_id, lambda: update_instance(self, instance_id)
+        )
+
+    return wrapper
+
+
 class BoltClient(ABC, Generic[T]):
     """
     Exposes async methods for creating instances, running stages, updating instances,
     and validating the correctness of a computation
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        state_staleness: float = BOLT_CLIENT_STATE_STALENESS_SEC,
+    ) -> None:
         self.logger: logging.Logger = (
             logging.getLogger(__name__) if logger is None else logger
         )
+        self.state_staleness = state_staleness
+        self._states: Dict[str, Tuple[float, BoltState]] = {}
+        self._state_reads: Dict[str, "asyncio.Future[BoltState]"] = {}
 
     @abstractmethod
     async def create_instance(self, instance_args: T) -> str:
@@ -72,6 +115,32 @@ class BoltClient(ABC, Generic[T]):
     async def update_instance(self, instance_id: str) -> BoltState:
         pass
 
+    async def update_instances(self, instance_ids: List[str]) -> Dict[str, BoltState]:
+        """Updates several instances at once
+
+        Clients that can read several instances with a single request override
+        this to do so. The instances that could not be updated are left out of
+        the result, so that the caller can get their error from update_instance.
+
+        Args:
+            - instance_ids: the instances to update
+
+        Returns:
+            The state of each instance that was updated, by instance id
+        """
+        states = await asyncio.gather(
+            *(
+                self.update_instance(instance_id=instance_id)
+                for instance_id in instance_ids
+            ),
+            return_exceptions=True,
+        )
+        return {
+            instance_id: state
+            for instance_id, state in zip(instance_ids, states)
+            if isinstance(state, BoltState)
+        }
+
     @abstractmethod
     async def has_feature(self, instance_id: str, feature: PCSFeature) -> bool:
         pass
@@ -159,3 +228,39 @@ class BoltClient(ABC, Generic[T]):
     @bolt_checkpoint()
     async def log_failed_containers(self, instance_id: str) -> None:
         pass
+
+    def close(self) -> None:
+        """Releases the resources of the client, once the runs using it are done"""
+        pass
+
+    def invalidate_state(self, instance_id: str) -> None:
+        """Makes the next update_instance read the instance, e.g. after running a stage"""
+        self._states.pop(instance_id, None)
+        # the result of a read in flight is not reused either
+        self._state_reads.pop(instance_id, None)
+
+    async def _read_state(
+        self, instance_id: str, read: Callable[[], Awaitable[BoltState]]
+    ) -> BoltState:
+        cached = self._states.get(instance_id)
+        if cached and time() - cached[0] < self.state_staleness:
+            return cached[1]
+        state_read = self._state_reads.get(instance_id)
+        if state_read is None:
+            state_read = asyncio.ensure_future(read())
+            self._state_reads[instance_id] = state_read
+            state_read.add_done_callback(
+                functools.partial(self._on_state_read, instance_id)
+            )
+        # a caller that is cancelled doesn't cancel the read of the others
+        return await asyncio.shield(state_read)
+
+    def _on_state_read(
+        self, instance_id: str, state_read: "asyncio.Future[BoltState]"
+    ) -> None:
+        if self._state_reads.get(instance_id) is not state_read:
+            # invalidated while in flight
+            return
+        del self._state_reads[instance_id]
+        if not state_read.cancelled() and state_read.exception() is None:
+            self._states[instance_id] = (time(), state_read.result())
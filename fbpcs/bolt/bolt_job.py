@@ -63,6 +63,13 @@ class BoltJob(DataClassJsonMixin, Generic[T, U]):
     # The timeout should be in seconds
     stage_timeout_override: Optional[int] = None
 
+    # the queued jobs with the highest priority get a job slot first
+    priority: int = 0
+    # unix timestamp by which the results of the study are needed
+    deadline: Optional[float] = None
+    # the expected runtime of the job in seconds, to start the shortest jobs first
+    expected_runtime: Optional[float] = None
+
     # allows the final stage to be configured for each job to stop a run early
     # if one isn't given, final_stage defaults to the final stage of the job's stage_flow
     final_stage: Optional[PrivateComputationBaseStageFlow] = None
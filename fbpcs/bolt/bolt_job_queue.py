@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import math
+from enum import Enum
+from time import time
+from typing import Any, AsyncIterator, Iterator, List, Tuple
+
+from fbpcs.bolt.bolt_job import BoltJob
+
+
+class BoltJobQueueOrder(Enum):
+    # the order the jobs were queued in
+    FIFO = "FIFO"
+    # highest priority first, then earliest deadline, then shortest expected runtime
+    PRIORITY = "PRIORITY"
+    # shortest expected runtime first, then highest priority, then earliest deadline
+    SHORTEST_JOB_FIRST = "SHORTEST_JOB_FIRST"
+
+
+class BoltJobQueue:
+    """Hands out a fixed number of job slots to the queued jobs, in a BoltJobQueueOrder
+
+    Jobs that are queued at the same rank start in the order they were queued.
+    """
+
+    def __init__(
+        self,
+        max_parallel_runs: int,
+        order: BoltJobQueueOrder = BoltJobQueueOrder.PRIORITY,
+    ) -> None:
+        """
+        Args:
+            - max_parallel_runs: the number of jobs that hold a slot at the same time
+            - order: the order in which the queued jobs get a slot
+        """
+        self.max_parallel_runs = max_parallel_runs
+        self.order = order
+        # the time each job waited for its slot, in seconds
+        self.wait_times: List[float] = []
+        self.max_depth = 0
+        self._running = 0
+        self._queue: List[Tuple[Tuple[float, ...], int, "asyncio.Future[None]"]] = []
+        self._counter: Iterator[int] = itertools.count()
+
+    @property
+    def depth(self) -> int:
+        """The number of jobs waiting for a slot"""
+        return sum(not future.done() for _, _, future in self._queue)
+
+    def get_sort_key(self, job: BoltJob[Any, Any]) -> Tuple[float, ...]:
+        deadline = job.deadline if job.deadline is not None else math.inf
+        expected_runtime = (
+            job.expected_runtime if job.expected_runtime is not None else math.inf
+        )
+        if self.order is BoltJobQueueOrder.PRIORITY:
+            return (-job.priority, deadline, expected_runtime)
+        if self.order is BoltJobQueueOrder.SHORTEST_JOB_FIRST:
+            return (expected_runtime, -job.priority, deadline)
+        return ()
+
+    @contextlib.asynccontextmanager
+    async def job_slot(self, job: BoltJob[Any, Any]) -> AsyncIterator[None]:
+        """Holds a job slot, waiting in the queue for one to be free"""
+        await self._acquire(job)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, job: BoltJob[Any, Any]) -> None:
+        start_time = time()
+        if self._running < self.max_parallel_runs and not self.depth:
+            self._running += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(
+                self._queue, (self.get_sort_key(job), next(self._counter), future)
+            )
+            self.max_depth = max(self.max_depth, self.depth)
+            try:
+                await future
+            except asyncio.CancelledError:
+                # the slot may have been handed over before the job was cancelled
+                if future.done() and not future.cancelled():
+                    self._release()
+                raise
+        self.wait_times.append(time() - start_time)
+
+    def _release(self) -> None:
+        # a slot that is freed goes straight to the first job of the queue
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._running -= 1
@@ -18,7 +18,9 @@ from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow i
 
 class BoltMetricType(Enum):
     JOB_QUEUE_TIME = "JOB_QUEUE_TIME"
+    JOB_QUEUE_DEPTH = "JOB_QUEUE_DEPTH"
     JOB_RUN_TIME = "JOB_RUN_TIME"
+    STAGE_QUEUE_TIME = "STAGE_QUEUE_TIME"
     STAGE_START_UP_TIME = "STAGE_START_UP_TIME"
     STAGE_WAIT_FOR_COMPLETED = "STAGE_WAIT_FOR_COMPLETED"
     STAGE_TOTAL_RUNTIME = "STAGE_TOTAL_RUNTIME"
@@ -31,6 +33,8 @@ class BoltMetric:
     value: float
     stage: Optional[PrivateComputationBaseStageFlow] = None
     role: Optional[PrivateComputationRole] = None
+    # when the measured time started, or when the value was taken, in seconds since the epoch
+    start_time: Optional[float] = None
 
     def __repr__(self) -> str:
         stage_name = self.stage.name if self.stage else None
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import logging
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+from fbpcs.bolt.bolt_job_summary import BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal
+from fbpcs.bolt.constants import (
+    ADAPTIVE_POLL_BACKOFF_FACTOR,
+    ADAPTIVE_POLL_HISTORY_SIZE,
+    MAX_ADAPTIVE_POLL_INTERVAL_SEC,
+)
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+
+
+class BoltPollPolicy:
+    """Polls a stage at the fixed poll interval of its job"""
+
+    def get_poll_interval(
+        self,
+        stage: PrivateComputationBaseStageFlow,
+        elapsed: float,
+        poll_interval: float,
+    ) -> float:
+        """Gets the time to wait before the next poll of a stage
+
+        Args:
+            - stage: the stage being waited on
+            - elapsed: the time since the stage started being waited on, in seconds
+            - poll_interval: the poll interval of the job, in seconds
+
+        Returns:
+            The time to wait before polling the stage again, in seconds
+        """
+        return poll_interval
+
+    def record_stage_duration(
+        self, stage: PrivateComputationBaseStageFlow, duration: float
+    ) -> None:
+        pass
+
+    def record_metrics(self, bolt_metrics: Iterable[BoltMetric]) -> None:
+        """Learns from the STAGE_WAIT_FOR_COMPLETED metrics of past jobs"""
+        for metric in bolt_metrics:
+            if (
+                metric.metric_type is BoltMetricType.STAGE_WAIT_FOR_COMPLETED
+                and metric.stage is not None
+            ):
+                self.record_stage_duration(metric.stage, metric.value)
+
+
+class AdaptiveBoltPollPolicy(BoltPollPolicy):
+    """Backs off while a stage is far from its expected completion, and tightens near it
+
+    The expected duration of a stage is the shortest of its recent durations, so
+    that a stage finishing as early as it ever did is still polled at the job's
+    interval. Until then, each wait is a share of the expected time left, which
+    takes a number of polls logarithmic in the stage duration instead of linear.
+    Stages that were never seen complete are polled at the job's interval.
+    """
+
+    def __init__(
+        self,
+        backoff_factor: float = ADAPTIVE_POLL_BACKOFF_FACTOR,
+        max_poll_interval: float = MAX_ADAPTIVE_POLL_INTERVAL_SEC,
+        history_size: int = ADAPTIVE_POLL_HISTORY_SIZE,
+    ) -> None:
+        self.backoff_factor = backoff_factor
+        self.max_poll_interval = max_poll_interval
+        self.history_size = history_size
+        self._durations: Dict[PrivateComputationBaseStageFlow, Deque[float]] = {}
+
+    @classmethod
+    def from_run_journals(
+        cls,
+        run_journal_paths: Iterable[str],
+        logger: Optional[logging.Logger] = None,
+    ) -> "AdaptiveBoltPollPolicy":
+        """Creates a policy that already knows the stage durations of past runs
+
+        Args:
+            - run_journal_paths: the journals of the past runs, see BoltRunJournal
+            - logger: logger
+        """
+        policy = cls()
+        for path in run_journal_paths:
+            policy.record_metrics(BoltRunJournal(path, logger).get_bolt_metrics())
+        return policy
+
+    def get_expected_duration(
+        self, stage: PrivateComputationBaseStageFlow
+    ) -> Optional[float]:
+        durations = self._durations.get(stage)
+        return min(durations) if durations else None
+
+    def get_poll_interval(
+        self,
+        stage: PrivateComputationBaseStageFlow,
+        elapsed: float,
+        poll_interval: float,
+    ) -> float:
+        expected_duration = self.get_expected_duration(stage)
+        if expected_duration is None:
+            return poll_interval
+        remaining = expected_duration - elapsed
+        return max(
+            poll_interval,
+            min(remaining * self.backoff_factor, self.max_poll_interval),
+        )
+
+    def record_stage_duration(
+        self, stage: PrivateComputationBaseStageFlow, duration: float
+    ) -> None:
+        self._durations.setdefault(stage, deque(maxlen=self.history_size)).append(
+            duration
+        )
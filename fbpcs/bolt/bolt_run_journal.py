@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from enum import Enum
+from time import time
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from fbpcs.bolt.bolt_job_summary import BoltMetric, BoltMetricType
+from fbpcs.bolt.exceptions import RunJournalMismatchError
+from fbpcs.private_computation.entity.infra_config import PrivateComputationRole
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+
+
+class BoltRunJournalEvent(Enum):
+    # the instances of the job were created and its stage flow is known
+    INSTANCES_READY = "INSTANCES_READY"
+    # a try of a stage was started
+    STAGE_STARTED = "STAGE_STARTED"
+    # a try of a stage failed and will be retried
+    STAGE_FAILED = "STAGE_FAILED"
+    STAGE_COMPLETED = "STAGE_COMPLETED"
+    JOB_FINISHED = "JOB_FINISHED"
+
+
+@dataclass
+class BoltJobProgress:
+    """The progress of a job, as rebuilt from the journal"""
+
+    publisher_id: Optional[str] = None
+    partner_id: Optional[str] = None
+    stage_flow: Optional[Type[PrivateComputationBaseStageFlow]] = None
+    # the stage that was started but not seen complete
+    stage: Optional[PrivateComputationBaseStageFlow] = None
+    # the number of tries of the stage that were already made
+    tries: int = 0
+    previous_attempt_timeout: bool = False
+    previous_attempt_cancelled: bool = False
+    is_success: Optional[bool] = None
+    bolt_metrics: List[BoltMetric] = field(default_factory=list)
+
+
+class BoltRunJournal:
+    """An append-only journal of the stage transitions of the jobs of a BoltRunner
+
+    Each transition is a JSON line appended to a local file and synced to disk
+    before the runner moves on. A runner restarted with the same journal
+    replays it to get back the instances, stage flow, current stage, tries and
+    metrics of each job, without a round trip to the instances. Jobs that
+    finished successfully are not run again, and jobs that failed start over.
+
+    The first line of the journal records the identity of the run that wrote it,
+    so that a journal left by another run, whose jobs may have the same names,
+    is not resumed from.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        logger: Optional[logging.Logger] = None,
+        run_identity: Optional[str] = None,
+    ) -> None:
+        """
+        Args:
+            - path: the journal file, created if it doesn't exist
+            - logger: logger
+            - run_identity: identifies the run, e.g. its study and input paths. If set,
+                an existing journal is only resumed from if it has the same identity
+
+        Raises:
+            RunJournalMismatchError: the existing journal was written by another run
+        """
+        self.path = path
+        self.logger: logging.Logger = (
+            logging.getLogger(__name__) if logger is None else logger
+        )
+        self.run_identity = run_identity
+        self._progress: Dict[str, BoltJobProgress] = {}
+        if os.path.exists(path):
+            self._replay()
+        if not os.path.exists(path) or not os.path.getsize(path):
+            self._append({"run_identity": run_identity})
+
+    def get_progress(self, job_name: str) -> Optional[BoltJobProgress]:
+        return self._progress.get(job_name)
+
+    def get_bolt_metrics(self) -> List[BoltMetric]:
+        """Gets the metrics journaled for the jobs that didn't fail, e.g. to learn from a past run"""
+        return [
+            metric
+            for progress in self._progress.values()
+            for metric in progress.bolt_metrics
+        ]
+
+    def record(
+        self,
+        job_name: str,
+        event: BoltRunJournalEvent,
+        bolt_metrics: Sequence[BoltMetric] = (),
+        publisher_id: Optional[str] = None,
+        partner_id: Optional[str] = None,
+        stage_flow: Optional[Type[PrivateComputationBaseStageFlow]] = None,
+        stage: Optional[PrivateComputationBaseStageFlow] = None,
+        tries: int = 0,
+        previous_attempt_timeout: bool = False,
+        previous_attempt_cancelled: bool = False,
+        is_success: Optional[bool] = None,
+    ) -> None:
+        """Appends a transition of a job to the journal
+
+        Args:
+            - job_name: the job that made the transition
+            - event: the transition
+            - bolt_metrics: all of the metrics of the job so far, only the ones
+                that are not in the journal yet are written
+            - publisher_id, partner_id, stage_flow: the instances and stage flow,
+                for INSTANCES_READY
+            - stage, tries, previous_attempt_timeout, previous_attempt_cancelled:
+                the stage and retry state, for the STAGE_* events
+            - is_success: whether the job succeeded, for JOB_FINISHED
+        """
+        progress = self._progress.get(job_name)
+        recorded_metrics = len(progress.bolt_metrics) if progress else 0
+        entry: Dict[str, Any] = {
+            "job_name": job_name,
+            "event": event.value,
+            "time": time(),
+            "bolt_metrics": [
+                self._dump_metric(metric) for metric in bolt_metrics[recorded_metrics:]
+            ],
+        }
+        if event is BoltRunJournalEvent.INSTANCES_READY and stage_flow:
+            entry["publisher_id"] = publisher_id
+            entry["partner_id"] = partner_id
+            entry["stage_flow"] = stage_flow.get_cls_name()
+        elif stage is not None:
+            entry["stage"] = stage.name
+            entry["tries"] = tries
+            entry["previous_attempt_timeout"] = previous_attempt_timeout
+            entry["previous_attempt_cancelled"] = previous_attempt_cancelled
+        elif event is BoltRunJournalEvent.JOB_FINISHED:
+            entry["is_success"] = is_success
+
+        self._append(entry)
+        self._apply(entry)
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _replay(self) -> None:
+        with open(self.path, "rb+") as f:
+            content = f.read()
+            if not content.endswith(b"\n"):
+                # the last line is cut short if the runner died while writing it,
+                # it is dropped so that the next entry doesn't extend it
+                self.logger.warning(f"Dropping the partial last entry of {self.path}")
+                content = content[: content.rfind(b"\n") + 1]
+                f.truncate(len(content))
+        for i, line in enumerate(content.decode("utf-8").splitlines()):
+            entry = json.loads(line)
+            if i == 0:
+                self._check_run_identity(entry)
+            if "job_name" in entry:
+                self._apply(entry)
+
+    def _check_run_identity(self, header: Dict[str, Any]) -> None:
+        journal_run_identity = header.get("run_identity")
+        if self.run_identity is not None and journal_run_identity != self.run_identity:
+            raise RunJournalMismatchError(
+                f"The run journal {self.path} was written by another run ({journal_run_identity}),"
+                f" not by {self.run_identity}. Use another run journal path to start this run."
+            )
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        job_name = entry["job_name"]
+        event = BoltRunJournalEvent(entry["event"])
+        if event is BoltRunJournalEvent.JOB_FINISHED and not entry["is_success"]:
+            # a failed job is run again from the start
+            self._progress.pop(job_name, None)
+            return
+
+        progress = self._progress.setdefault(job_name, BoltJobProgress())
+        if event is BoltRunJournalEvent.INSTANCES_READY:
+            progress.publisher_id = entry["publisher_id"]
+            progress.partner_id = entry["partner_id"]
+            progress.stage_flow = PrivateComputationBaseStageFlow.cls_name_to_cls(
+                entry["stage_flow"]
+            )
+        elif event in (
+            BoltRunJournalEvent.STAGE_STARTED,
+            BoltRunJournalEvent.STAGE_FAILED,
+        ):
+            progress.stage = self._load_stage(progress, entry["stage"])
+            progress.tries = entry["tries"]
+            progress.previous_attempt_timeout = entry["previous_attempt_timeout"]
+            progress.previous_attempt_cancelled = entry["previous_attempt_cancelled"]
+        elif event is BoltRunJournalEvent.STAGE_COMPLETED:
+            progress.stage = None
+            progress.tries = 0
+            progress.previous_attempt_timeout = False
+            progress.previous_attempt_cancelled = False
+        elif event is BoltRunJournalEvent.JOB_FINISHED:
+            progress.is_success = True
+
+        progress.bolt_metrics.extend(
+            BoltMetric(
+                BoltMetricType(metric["metric_type"]),
+                metric["value"],
+                self._load_stage(progress, metric["stage"])
+                if metric["stage"]
+                else None,
+                PrivateComputationRole(metric["role"]) if metric["role"] else None,
+                metric.get("start_time"),
+            )
+            for metric in entry["bolt_metrics"]
+        )
+
+    @staticmethod
+    def _load_stage(
+        progress: BoltJobProgress, stage_name: str
+    ) -> PrivateComputationBaseStageFlow:
+        if progress.stage_flow is None:
+            raise ValueError(f"Stage {stage_name} was journaled before its stage flow")
+        return progress.stage_flow.get_stage_from_str(stage_name)
+
+    @staticmethod
+    def _dump_metric(metric: BoltMetric) -> Dict[str, Any]:
+        return {
+            "metric_type": metric.metric_type.value,
+            "value": metric.value,
+            "stage": metric.stage.name if metric.stage else None,
+            "role": metric.role.value if metric.role else None,
+            "start_time": metric.start_time,
+        }
@@ -7,10 +7,21 @@
 # pyre-strict
 
 import asyncio
+import contextlib
 import itertools
 import logging
 from time import time
-from typing import Awaitable, Generic, List, Optional, Tuple, Type, TypeVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from fbpcs.bolt.bolt_checkpoint import bolt_checkpoint
 
@@ -23,8 +34,18 @@ from fbpcs.bolt.bolt_hook import (
     BoltHookTiming,
 )
 from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs, BoltJob
+from fbpcs.bolt.bolt_job_queue import BoltJobQueue, BoltJobQueueOrder
 from fbpcs.bolt.bolt_job_summary import BoltJobSummary, BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_poll_policy import AdaptiveBoltPollPolicy, BoltPollPolicy
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal, BoltRunJournalEvent
+from fbpcs.bolt.bolt_stage_scheduler import BoltStageScheduler
+from fbpcs.bolt.bolt_status_notifier import BoltStatusNotifier
+from fbpcs.bolt.bolt_status_poller import BoltStatusPoller
 from fbpcs.bolt.bolt_summary import BoltSummary
+from fbpcs.bolt.bolt_summary_exporter import (
+    format_metric_percentiles,
+    get_metric_percentiles,
+)
 from fbpcs.bolt.constants import (
     DEFAULT_MAX_PARALLEL_RUNS,
     DEFAULT_NUM_TRIES,
@@ -66,50 +87,155 @@ class BoltRunner(Generic[T, U]):
         max_parallel_runs: Optional[int] = None,
         num_tries: Optional[int] = None,
         logger: Optional[logging.Logger] = None,
+        batch_status_polls: bool = False,
+        poll_policy: Optional[BoltPollPolicy] = None,
+        status_notifier: Optional[BoltStatusNotifier] = None,
+        stage_scheduler: Optional[BoltStageScheduler] = None,
+        job_queue_order: Optional[BoltJobQueueOrder] = None,
+        run_journal: Optional[BoltRunJournal] = None,
     ) -> None:
+        """
+        Args:
+            - publisher_client: the client of the publisher instances
+            - partner_client: the client of the partner instances
+            - max_parallel_runs: the number of jobs run at the same time
+            - num_tries: the number of tries of each stage, unless the job overrides it
+            - logger: logger
+            - batch_status_polls: if set, the jobs waiting on their stages share a status
+                poller for each client, which polls the instances waited on at the same
+                time in a single batched request
+            - poll_policy: chooses the time between two polls of a stage, defaults to an
+                AdaptiveBoltPollPolicy learning the stage durations of the jobs it runs.
+                It also learns the stage durations already in run_journal
+            - status_notifier: if set, wakes up the jobs waiting on an instance as soon
+                as it is notified, instead of at the end of their poll interval
+            - stage_scheduler: if set, limits the stages running at the same time by
+                stage pool. The max_parallel_runs slots then only limit the jobs
+                creating their instances, up to the start of their first stage
+            - job_queue_order: the order in which the jobs waiting for one of the
+                max_parallel_runs slots get it, defaults to BoltJobQueueOrder.PRIORITY
+            - run_journal: if set, the stage transitions of the jobs are journaled, and
+                the jobs already in the journal resume from where they were
+        """
         self.publisher_client = publisher_client
         self.partner_client = partner_client
-        self.semaphore = asyncio.Semaphore(
-            max_parallel_runs or DEFAULT_MAX_PARALLEL_RUNS
+        self.job_queue = BoltJobQueue(
+            max_parallel_runs or DEFAULT_MAX_PARALLEL_RUNS,
+            job_queue_order or BoltJobQueueOrder.PRIORITY,
         )
         self.logger: logging.Logger = (
             logging.getLogger(__name__) if logger is None else logger
         )
         self.num_tries: int = num_tries or DEFAULT_NUM_TRIES
+        self.poll_policy: BoltPollPolicy = poll_policy or AdaptiveBoltPollPolicy()
+        self.status_notifier = status_notifier
+        self.stage_scheduler = stage_scheduler
+        self.run_journal = run_journal
+        if run_journal:
+            self.poll_policy.record_metrics(run_journal.get_bolt_metrics())
+        self.publisher_status_poller: Optional[BoltStatusPoller[T]] = None
+        self.partner_status_poller: Optional[BoltStatusPoller[U]] = None
+        if batch_status_polls:
+            self.publisher_status_poller = BoltStatusPoller(
+                publisher_client, self.logger
+            )
+            self.partner_status_poller = BoltStatusPoller(partner_client, self.logger)
 
     async def run_async(
         self,
         jobs: List[BoltJob[T, U]],
     ) -> BoltSummary:
         start_time = time()
-        results = list(await asyncio.gather(*[self.run_one(job=job) for job in jobs]))
+        # the jobs are started in queue order, so that the first free job slots
+        # go to the most urgent jobs rather than to the first jobs of the list
+        queue_order = sorted(
+            range(len(jobs)), key=lambda i: self.job_queue.get_sort_key(jobs[i])
+        )
+        queued_results = await asyncio.gather(
+            *[self.run_one(job=jobs[i]) for i in queue_order]
+        )
+        # the summaries are returned in the order of the jobs
+        results = [
+            result
+            for _, result in sorted(
+                zip(queue_order, queued_results), key=lambda item: item[0]
+            )
+        ]
         end_time = time()
         self.logger.info(f"BoltSummary: overall runtime: {end_time - start_time}")
-        return BoltSummary(job_summaries=results)
+        if self.job_queue.wait_times:
+            self.logger.info(
+                f"BoltSummary: job queue max depth: {self.job_queue.max_depth}, max wait time: {max(self.job_queue.wait_times)}"
+            )
+        summary = BoltSummary(job_summaries=results)
+        percentiles = get_metric_percentiles([summary])
+        if percentiles:
+            self.logger.info(
+                f"BoltSummary: stage metrics across jobs, in seconds:\n{format_metric_percentiles(percentiles)}"
+            )
+        return summary
 
     @bolt_checkpoint(
         dump_return_val=True,
     )
     async def run_one(self, job: BoltJob[T, U]) -> BoltJobSummary:
-        bolt_metrics = []
+        summary = await self._run_one(job)
+        self._record_journal(
+            job,
+            BoltRunJournalEvent.JOB_FINISHED,
+            summary.bolt_metrics,
+            is_success=summary.is_success,
+        )
+        return summary
+
+    async def _run_one(self, job: BoltJob[T, U]) -> BoltJobSummary:
+        progress = (
+            self.run_journal.get_progress(job.job_name) if self.run_journal else None
+        )
+        if progress and progress.is_success:
+            self.logger.info(f"{job.job_name} already completed, per the run journal.")
+            return BoltJobSummary(
+                job_name=job.job_name,
+                publisher_instance_id=job.publisher_bolt_args.create_instance_args.instance_id,
+                partner_instance_id=job.partner_bolt_args.create_instance_args.instance_id,
+                is_success=True,
+                bolt_metrics=progress.bolt_metrics,
+            )
+        # the metrics of the runs before a restart come first
+        bolt_metrics = list(progress.bolt_metrics) if progress else []
         queue_start_time = time()
-        async with self.semaphore:
+        bolt_metrics.append(
+            BoltMetric(
+                BoltMetricType.JOB_QUEUE_DEPTH,
+                self.job_queue.depth,
+                start_time=queue_start_time,
+            )
+        )
+        async with contextlib.AsyncExitStack() as job_slot:
+            await job_slot.enter_async_context(self.job_queue.job_slot(job))
             bolt_metrics.append(
                 BoltMetric(
                     BoltMetricType.JOB_QUEUE_TIME,
                     time() - queue_start_time,
+                    start_time=queue_start_time,
                 )
             )
             job_start_time = time()
             try:
-                publisher_id, partner_id = await asyncio.gather(
-                    self.publisher_client.get_or_create_instance(
-                        job.publisher_bolt_args.create_instance_args
-                    ),
-                    self.partner_client.get_or_create_instance(
-                        job.partner_bolt_args.create_instance_args
-                    ),
-                )
+                if progress and progress.publisher_id and progress.partner_id:
+                    publisher_id, partner_id = (
+                        progress.publisher_id,
+                        progress.partner_id,
+                    )
+                else:
+                    publisher_id, partner_id = await asyncio.gather(
+                        self.publisher_client.get_or_create_instance(
+                            job.publisher_bolt_args.create_instance_args
+                        ),
+                        self.partner_client.get_or_create_instance(
+                            job.partner_bolt_args.create_instance_args
+                        ),
+                    )
 
                 logger = LoggerAdapter(logger=self.logger, prefix=partner_id)
                 await self.wait_valid_publisher_status(
@@ -117,8 +243,30 @@ class BoltRunner(Generic[T, U]):
                     poll_interval=job.poll_interval,
                     timeout=WAIT_VALID_STATUS_TIMEOUT,
                 )
-                stage_flow = await self.get_stage_flow(job=job)
-                stage = await self.get_next_valid_stage(job=job, stage_flow=stage_flow)
+                if progress and progress.stage_flow:
+                    stage_flow = progress.stage_flow
+                else:
+                    stage_flow = await self.get_stage_flow(job=job)
+                self._record_journal(
+                    job,
+                    BoltRunJournalEvent.INSTANCES_READY,
+                    bolt_metrics,
+                    publisher_id=publisher_id,
+                    partner_id=partner_id,
+                    stage_flow=stage_flow,
+                )
+                if self.stage_scheduler:
+                    # the job slot only bounds the jobs creating their instances,
+                    # the stage slots bound their stages from here on
+                    await job_slot.aclose()
+                # a stage that was started before a restart is waited on again, it
+                # is only invoked again if it failed in the meantime
+                if progress and progress.stage:
+                    stage = progress.stage
+                else:
+                    stage = await self.get_next_valid_stage(
+                        job=job, stage_flow=stage_flow
+                    )
                 # hierarchy: BoltJob num_tries --> BoltRunner num_tries --> default
                 max_tries = job.num_tries or self.num_tries
 
@@ -129,8 +277,22 @@ class BoltRunner(Generic[T, U]):
                     tries = 0
                     previous_attempt_timeout = False
                     previous_attempt_cancelled = False
+                    if progress and stage is progress.stage:
+                        tries = progress.tries
+                        previous_attempt_timeout = progress.previous_attempt_timeout
+                        previous_attempt_cancelled = progress.previous_attempt_cancelled
+                        progress = None
 
                     while tries < max_tries:
+                        self._record_journal(
+                            job,
+                            BoltRunJournalEvent.STAGE_STARTED,
+                            bolt_metrics,
+                            stage=stage,
+                            tries=tries,
+                            previous_attempt_timeout=previous_attempt_timeout,
+                            previous_attempt_cancelled=previous_attempt_cancelled,
+                        )
                         tries += 1
                         try:
                             if await self.job_is_finished(
@@ -165,49 +327,71 @@ class BoltRunner(Generic[T, U]):
                             if not stage.is_retryable:
                                 tries = max_tries + 1
 
-                            stage_startup_time = time()
-                            next_stage_metrics = await self.run_next_stage(
-                                publisher_id=publisher_id,
-                                partner_id=partner_id,
-                                stage=stage,
-                                poll_interval=job.poll_interval,
-                                logger=logger,
-                            )
-                            bolt_metrics.append(
-                                BoltMetric(
-                                    BoltMetricType.STAGE_START_UP_TIME,
-                                    time() - stage_startup_time,
-                                    stage,
+                            stage_queue_time = time()
+                            async with self._stage_slot(stage):
+                                bolt_metrics.append(
+                                    BoltMetric(
+                                        BoltMetricType.STAGE_QUEUE_TIME,
+                                        time() - stage_queue_time,
+                                        stage,
+                                        start_time=stage_queue_time,
+                                    )
                                 )
-                            )
-                            bolt_metrics.extend(next_stage_metrics)
-
-                            stage_wait_time = time()
 
-                            await self._execute_event(
-                                self.wait_stage_complete(
+                                stage_startup_time = time()
+                                next_stage_metrics = await self.run_next_stage(
                                     publisher_id=publisher_id,
                                     partner_id=partner_id,
                                     stage=stage,
                                     poll_interval=job.poll_interval,
                                     logger=logger,
-                                    stage_timeout_override=job.stage_timeout_override,
-                                    previous_attempt_cancelled=previous_attempt_cancelled,
-                                    previous_attempt_timeout=previous_attempt_timeout,
-                                ),
-                                job=job,
-                                event=BoltHookEvent.STAGE_WAIT_FOR_COMPLETED,
-                                stage=stage,
-                                role=PrivateComputationRole.PARTNER,
-                            )
-                            bolt_metrics.append(
-                                BoltMetric(
-                                    BoltMetricType.STAGE_WAIT_FOR_COMPLETED,
-                                    time() - stage_wait_time,
-                                    stage,
                                 )
-                            )
-                            break
+                                bolt_metrics.append(
+                                    BoltMetric(
+                                        BoltMetricType.STAGE_START_UP_TIME,
+                                        time() - stage_startup_time,
+                                        stage,
+                                        start_time=stage_startup_time,
+                                    )
+                                )
+                                bolt_metrics.extend(next_stage_metrics)
+
+                                stage_wait_time = time()
+
+                                await self._execute_event(
+                                    self.wait_stage_complete(
+                                        publisher_id=publisher_id,
+                                        partner_id=partner_id,
+                                        stage=stage,
+                                        poll_interval=job.poll_interval,
+                                        logger=logger,
+                                        stage_timeout_override=job.stage_timeout_override,
+                                        previous_attempt_cancelled=previous_attempt_cancelled,
+                                        previous_attempt_timeout=previous_attempt_timeout,
+                                    ),
+                                    job=job,
+                                    event=BoltHookEvent.STAGE_WAIT_FOR_COMPLETED,
+                                    stage=stage,
+                                    role=PrivateComputationRole.PARTNER,
+                                )
+                                stage_wait_duration = time() - stage_wait_time
+                                bolt_metrics.append(
+                                    BoltMetric(
+                                        BoltMetricType.STAGE_WAIT_FOR_COMPLETED,
+                                        stage_wait_duration,
+                                        stage,
+                                        start_time=stage_wait_time,
+                                    )
+                                )
+                                self.poll_policy.record_stage_duration(
+                                    stage, stage_wait_duration
+                                )
+                                self._record_journal(
+                                    job,
+                                    BoltRunJournalEvent.STAGE_COMPLETED,
+                                    bolt_metrics,
+                                )
+                                break
 
                         except Exception as e:
                             if tries >= max_tries:
@@ -217,6 +401,7 @@ class BoltRunner(Generic[T, U]):
                                         BoltMetricType.STAGE_TOTAL_RUNTIME,
                                         time() - stage_time,
                                         stage,
+                                        start_time=stage_time,
                                     )
                                 )
                                 return BoltJobSummary(
@@ -234,6 +419,15 @@ class BoltRunner(Generic[T, U]):
                             if isinstance(e, StageTimeoutException):
                                 previous_attempt_timeout = True
                                 previous_attempt_cancelled = e.stage_cancelled
+                            self._record_journal(
+                                job,
+                                BoltRunJournalEvent.STAGE_FAILED,
+                                bolt_metrics,
+                                stage=stage,
+                                tries=tries,
+                                previous_attempt_timeout=previous_attempt_timeout,
+                                previous_attempt_cancelled=previous_attempt_cancelled,
+                            )
 
                             await asyncio.sleep(RETRY_INTERVAL)
                     bolt_metrics.append(
@@ -241,6 +435,7 @@ class BoltRunner(Generic[T, U]):
                             BoltMetricType.STAGE_TOTAL_RUNTIME,
                             time() - stage_time,
                             stage,
+                            start_time=stage_time,
                         )
                     )
                     # update stage
@@ -263,6 +458,7 @@ class BoltRunner(Generic[T, U]):
                     BoltMetric(
                         BoltMetricType.JOB_RUN_TIME,
                         time() - job_start_time,
+                        start_time=job_start_time,
                     )
                 )
                 return BoltJobSummary(
@@ -282,6 +478,16 @@ class BoltRunner(Generic[T, U]):
                     bolt_metrics=bolt_metrics,
                 )
 
+    def _record_journal(
+        self,
+        job: BoltJob[T, U],
+        event: BoltRunJournalEvent,
+        bolt_metrics: List[BoltMetric],
+        **kwargs: Any,
+    ) -> None:
+        if self.run_journal:
+            self.run_journal.record(job.job_name, event, bolt_metrics, **kwargs)
+
     async def _execute_event(
         self,
         awaitable: Awaitable[A],
@@ -400,6 +606,7 @@ class BoltRunner(Generic[T, U]):
                     time() - publisher_time,
                     stage,
                     PrivateComputationRole.PUBLISHER,
+                    start_time=publisher_time,
                 )
             )
             partner_time = time()
@@ -417,6 +624,7 @@ class BoltRunner(Generic[T, U]):
                     time() - partner_time,
                     stage,
                     PrivateComputationRole.PARTNER,
+                    start_time=partner_time,
                 )
             )
         else:
@@ -426,6 +634,7 @@ class BoltRunner(Generic[T, U]):
                     time() - publisher_time,
                     stage,
                     PrivateComputationRole.PUBLISHER,
+                    start_time=publisher_time,
                 )
             )
         return bolt_metrics
@@ -503,7 +712,7 @@ class BoltRunner(Generic[T, U]):
         # Waits until stage has started status then updates stage and returns server ips
         start_time = time()
         while time() < start_time + timeout:
-            state = await self.publisher_client.update_instance(instance_id)
+            state = await self._poll_publisher_state(instance_id)
             status = state.pc_instance_status
             if status is stage.started_status:
                 ca_certificate, server_hostnames = self._get_tls_config(state)
@@ -517,7 +726,7 @@ class BoltRunner(Generic[T, U]):
             self.logger.info(
                 f"{instance_id} current status is {status}, waiting for {stage.started_status}."
             )
-            await asyncio.sleep(poll_interval)
+            await self._wait_next_poll([instance_id], poll_interval)
         raise StageTimeoutException(
             f"Poll {instance_id} status timed out after {timeout}s expecting status {stage.started_status}."
         )
@@ -562,8 +771,8 @@ class BoltRunner(Generic[T, U]):
         publisher_state, partner_state = None, None
         while time() < start_time + timeout:
             publisher_state, partner_state = await asyncio.gather(
-                self.publisher_client.update_instance(instance_id=publisher_id),
-                self.partner_client.update_instance(instance_id=partner_id),
+                self._poll_publisher_state(publisher_id),
+                self._poll_partner_state(partner_id),
             )
             if (
                 publisher_state.pc_instance_status is complete_status
@@ -622,7 +831,12 @@ class BoltRunner(Generic[T, U]):
                 f"Publisher {publisher_id} status is {publisher_state.pc_instance_status}, Partner {partner_id} status is {partner_state.pc_instance_status}. Waiting for status {complete_status}."
             )
             # keep polling
-            await asyncio.sleep(poll_interval)
+            await self._wait_next_poll(
+                [publisher_id, partner_id],
+                self.poll_policy.get_poll_interval(
+                    stage, time() - start_time, poll_interval
+                ),
+            )
 
         stage_cancelled = await self._handle_stage_timeout(
             stage=stage,
@@ -859,7 +1073,7 @@ class BoltRunner(Generic[T, U]):
             start_time = time()
             while time() < start_time + timeout:
                 status = (
-                    await self.publisher_client.update_instance(instance_id)
+                    await self._poll_publisher_state(instance_id)
                 ).pc_instance_status
                 if status not in INVALID_STATUS_LIST:
                     self.logger.info(f"Publisher instance has valid status: {status}.")
@@ -867,7 +1081,35 @@ class BoltRunner(Generic[T, U]):
                 self.logger.info(
                     f"Publisher instance status {status} invalid for calculation.\nPolling publisher instance expecting valid status."
                 )
-                await asyncio.sleep(poll_interval)
+                await self._wait_next_poll([instance_id], poll_interval)
             raise WaitValidStatusTimeout(
                 f"Timed out waiting for publisher {instance_id} valid status. Status: {status}"
             )
+
+    async def _poll_publisher_state(self, instance_id: str) -> BoltState:
+        if self.publisher_status_poller:
+            return await self.publisher_status_poller.update_instance(instance_id)
+        return await self.publisher_client.update_instance(instance_id=instance_id)
+
+    async def _poll_partner_state(self, instance_id: str) -> BoltState:
+        if self.partner_status_poller:
+            return await self.partner_status_poller.update_instance(instance_id)
+        return await self.partner_client.update_instance(instance_id=instance_id)
+
+    async def _wait_next_poll(
+        self, instance_ids: List[str], poll_interval: float
+    ) -> None:
+        if self.status_notifier:
+            await self.status_notifier.wait(instance_ids, poll_interval)
+        else:
+            await asyncio.sleep(poll_interval)
+
+    @contextlib.asynccontextmanager
+    async def _stage_slot(
+        self, stage: PrivateComputationBaseStageFlow
+    ) -> AsyncIterator[None]:
+        if self.stage_scheduler is None:
+            yield
+            return
+        async with self.stage_scheduler.stage_slot(stage):
+            yield
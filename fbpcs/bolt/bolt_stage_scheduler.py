@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import asyncio
+import contextlib
+from enum import Enum
+from typing import AsyncIterator, Dict, Mapping
+
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+
+
+class BoltStagePool(Enum):
+    PID = "PID"
+    DATA_PROCESSING = "DATA_PROCESSING"
+    COMPUTE = "COMPUTE"
+    AGGREGATION = "AGGREGATION"
+    OTHER = "OTHER"
+
+
+# The pool of each stage, by stage name, across the stage flows
+STAGE_POOLS: Dict[str, BoltStagePool] = {
+    "PID_SHARD": BoltStagePool.PID,
+    "PID_PREPARE": BoltStagePool.PID,
+    "ID_MATCH": BoltStagePool.PID,
+    "ID_MATCH_POST_PROCESS": BoltStagePool.PID,
+    "UNION_PID_MR_MULTIKEY": BoltStagePool.PID,
+    "ID_SPINE_COMBINER": BoltStagePool.DATA_PROCESSING,
+    "RESHARD": BoltStagePool.DATA_PROCESSING,
+    "SECURE_RANDOM_RESHARDER": BoltStagePool.DATA_PROCESSING,
+    "ANONYMIZATION_DATA_PREP": BoltStagePool.DATA_PROCESSING,
+    "COMPUTE": BoltStagePool.COMPUTE,
+    "PCF2_LIFT": BoltStagePool.COMPUTE,
+    "PCF2_LIFT_METADATA_COMPACTION": BoltStagePool.COMPUTE,
+    "PCF2_ATTRIBUTION": BoltStagePool.COMPUTE,
+    "ANONYMIZER": BoltStagePool.COMPUTE,
+    "AGGREGATE": BoltStagePool.AGGREGATION,
+    "PCF2_AGGREGATION": BoltStagePool.AGGREGATION,
+    "PRIVATE_ID_DFCA_AGGREGATE": BoltStagePool.AGGREGATION,
+}
+
+
+class BoltStageScheduler:
+    """Limits the number of stages of each pool that run at the same time
+
+    Instead of holding a slot for its whole run, a job only holds a slot of
+    the pool of its current stage, while the stage runs. A job in a long
+    stage of one pool doesn't keep the jobs with stages of other pools from
+    starting. The pools without a size don't limit their stages.
+    """
+
+    def __init__(self, pool_sizes: Mapping[BoltStagePool, int]) -> None:
+        """
+        Args:
+            - pool_sizes: the number of stages of each pool that can run at the same time
+        """
+        self.pool_sizes: Dict[BoltStagePool, int] = dict(pool_sizes)
+        # created on first use, in the event loop running the jobs
+        self._semaphores: Dict[BoltStagePool, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_config(cls, pool_sizes: Mapping[str, int]) -> "BoltStageScheduler":
+        """Creates a scheduler from pool sizes keyed by pool name, e.g. {"PID": 4}"""
+        return cls(
+            {BoltStagePool(name.upper()): size for name, size in pool_sizes.items()}
+        )
+
+    @staticmethod
+    def get_stage_pool(stage: PrivateComputationBaseStageFlow) -> BoltStagePool:
+        return STAGE_POOLS.get(stage.name, BoltStagePool.OTHER)
+
+    @contextlib.asynccontextmanager
+    async def stage_slot(
+        self, stage: PrivateComputationBaseStageFlow
+    ) -> AsyncIterator[None]:
+        """Holds a slot of the pool of the stage, waiting for one to be free"""
+        pool = self.get_stage_pool(stage)
+        if pool not in self.pool_sizes:
+            yield
+            return
+        if pool not in self._semaphores:
+            self._semaphores[pool] = asyncio.Semaphore(self.pool_sizes[pool])
+        async with self._semaphores[pool]:
+            yield
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import asyncio
+import os
+from collections import OrderedDict
+from time import time
+from typing import Dict, List
+
+from fbpcs.bolt.constants import (
+    FILE_NOTIFIER_CHECK_INTERVAL_SEC,
+    MAX_PENDING_STATUS_NOTIFICATIONS,
+)
+
+
+class BoltStatusNotifier:
+    """Wakes up the jobs waiting between two polls of an instance
+
+    Whatever learns of status changes first (e.g. a webhook handler) calls
+    notify, and the jobs waiting on the instance poll it right away instead of
+    waiting for the end of their poll interval. notify must be called from the
+    thread of the event loop, e.g. with loop.call_soon_threadsafe.
+
+    The events of the instances nobody waits on are dropped, except for the last
+    max_pending notifications, so that notifying instances that are done doesn't
+    grow the notifier.
+    """
+
+    def __init__(self, max_pending: int = MAX_PENDING_STATUS_NOTIFICATIONS) -> None:
+        self.max_pending = max_pending
+        self._events: "OrderedDict[str, asyncio.Event]" = OrderedDict()
+        self._num_waiters: Dict[str, int] = {}
+
+    def notify(self, instance_id: str) -> None:
+        """Signals that the status of an instance may have changed"""
+        # a notification that comes between two waits wakes up the next one
+        self._events.setdefault(instance_id, asyncio.Event()).set()
+        self._events.move_to_end(instance_id)
+        self._drop_pending()
+
+    async def wait(self, instance_ids: List[str], timeout: float) -> bool:
+        """Waits until one of the instances is notified, or the timeout
+
+        Args:
+            - instance_ids: the instances the caller polls
+            - timeout: the longest time to wait, in seconds
+
+        Returns:
+            True if one of the instances was notified, False on timeout
+        """
+        events = [
+            self._events.setdefault(instance_id, asyncio.Event())
+            for instance_id in instance_ids
+        ]
+        for instance_id in instance_ids:
+            self._num_waiters[instance_id] = self._num_waiters.get(instance_id, 0) + 1
+        waiters = [asyncio.ensure_future(event.wait()) for event in events]
+        try:
+            done, _ = await asyncio.wait(
+                waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            for instance_id in instance_ids:
+                self._num_waiters[instance_id] -= 1
+                if not self._num_waiters[instance_id]:
+                    del self._num_waiters[instance_id]
+                    # the notifications were consumed, the next wait creates a new event
+                    self._events.pop(instance_id, None)
+        for event in events:
+            event.clear()
+        return bool(done)
+
+    def _drop_pending(self) -> None:
+        num_pending = len(self._events) - len(self._num_waiters)
+        for instance_id in list(self._events):
+            if num_pending <= self.max_pending:
+                return
+            if instance_id not in self._num_waiters:
+                del self._events[instance_id]
+                num_pending -= 1
+
+
+class FileBoltStatusNotifier(BoltStatusNotifier):
+    """A BoltStatusNotifier that is also notified through files
+
+    An empty file named after an instance id, created in the notification
+    directory, notifies that instance. The file is removed once it was seen.
+    Checking the directory is local, it doesn't reach the instances' API.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        check_interval: float = FILE_NOTIFIER_CHECK_INTERVAL_SEC,
+        max_pending: int = MAX_PENDING_STATUS_NOTIFICATIONS,
+    ) -> None:
+        super().__init__(max_pending)
+        self.directory = directory
+        self.check_interval = check_interval
+        os.makedirs(directory, exist_ok=True)
+
+    async def wait(self, instance_ids: List[str], timeout: float) -> bool:
+        deadline = time() + timeout
+        while True:
+            if self._consume_notification_files(instance_ids):
+                return True
+            remaining = deadline - time()
+            if remaining <= 0:
+                return False
+            if await super().wait(instance_ids, min(self.check_interval, remaining)):
+                return True
+
+    def _consume_notification_files(self, instance_ids: List[str]) -> bool:
+        notified = False
+        for instance_id in instance_ids:
+            try:
+                os.remove(os.path.join(self.directory, instance_id))
+                notified = True
+            except FileNotFoundError:
+                pass
+        return notified
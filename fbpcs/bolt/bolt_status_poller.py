@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import asyncio
+import logging
+from typing import Dict, Generic, List, Optional, TypeVar, Union
+
+from fbpcs.bolt.bolt_client import BoltClient, BoltState
+from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs
+
+T = TypeVar("T", bound=BoltCreateInstanceArgs)
+
+
+class BoltStatusPoller(Generic[T]):
+    """Polls the states of the instances of a BoltClient in batches
+
+    The jobs waiting for the state of their instance subscribe to the poller,
+    which polls all of the instances waited on with a single update_instances
+    call, and hands each state to its waiters. A job that subscribes while the
+    poller is idle is polled right away, and the jobs that subscribe while a
+    poll is in flight share the next one, so no delay is added to the poll
+    intervals of the jobs. The number of requests grows with the number of
+    polls in flight rather than with the number of jobs.
+    """
+
+    def __init__(
+        self,
+        client: BoltClient[T],
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        """
+        Args:
+            - client: the client whose instances are polled
+            - logger: logger
+        """
+        self.client = client
+        self.logger: logging.Logger = (
+            logging.getLogger(__name__) if logger is None else logger
+        )
+        self._waiters: Dict[str, List["asyncio.Future[BoltState]"]] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    async def update_instance(self, instance_id: str) -> BoltState:
+        """Gets the state of an instance from the next batched poll, which starts
+        as soon as the poll in flight, if any, is done
+
+        Args:
+            - instance_id: the instance to poll
+
+        Returns:
+            The state of the instance, as returned by the client's update_instance
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(instance_id, []).append(future)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll())
+        return await future
+
+    async def _poll(self) -> None:
+        while self._waiters:
+            waiters, self._waiters = self._waiters, {}
+            try:
+                results = await self._get_states(list(waiters))
+                for instance_id, futures in waiters.items():
+                    result = results[instance_id]
+                    for future in futures:
+                        # the waiter may have been cancelled in the meantime
+                        if future.done():
+                            continue
+                        if isinstance(result, BaseException):
+                            future.set_exception(result)
+                        else:
+                            future.set_result(result)
+            finally:
+                # don't leave waiters hanging if the poller itself is cancelled
+                for futures in waiters.values():
+                    for future in futures:
+                        future.cancel()
+
+    async def _get_states(
+        self, instance_ids: List[str]
+    ) -> Dict[str, Union[BoltState, BaseException]]:
+        try:
+            states: Dict[
+                str, Union[BoltState, BaseException]
+            ] = await self.client.update_instances(instance_ids)
+        except Exception as e:
+            self.logger.warning(
+                f"Batched status poll of {len(instance_ids)} instances failed, polling them one by one. Error: {e}"
+            )
+            states = {}
+
+        # the instances missing from the batch are polled on their own, which raises their error
+        missing_ids = [
+            instance_id for instance_id in instance_ids if instance_id not in states
+        ]
+        missing_states = await asyncio.gather(
+            *(
+                self.client.update_instance(instance_id=instance_id)
+                for instance_id in missing_ids
+            ),
+            return_exceptions=True,
+        )
+        states.update(zip(missing_ids, missing_states))
+        return states
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fbpcs.bolt.bolt_job_summary import BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_summary import BoltSummary
+from fbpcs.private_computation.entity.infra_config import PrivateComputationRole
+
+# the metrics that are a length of time, as opposed to e.g. a queue depth
+DURATION_METRIC_TYPES: Tuple[BoltMetricType, ...] = tuple(
+    metric_type
+    for metric_type in BoltMetricType
+    if metric_type is not BoltMetricType.JOB_QUEUE_DEPTH
+)
+
+MetricKey = Tuple[BoltMetricType, Optional[str], Optional[PrivateComputationRole]]
+
+
+@dataclass
+class BoltMetricPercentiles:
+    """The distribution of a metric of a stage across jobs, in seconds"""
+
+    metric_type: BoltMetricType
+    stage_name: Optional[str]
+    role: Optional[PrivateComputationRole]
+    count: int
+    p50: float
+    p95: float
+    max: float
+
+
+def get_percentile(sorted_values: Sequence[float], percentile: float) -> float:
+    """Gets the nearest-rank percentile of values sorted in increasing order"""
+    rank = math.ceil(percentile / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def get_metric_percentiles(
+    summaries: Iterable[BoltSummary],
+) -> List[BoltMetricPercentiles]:
+    """Gets the p50, p95 and max of each duration metric of each stage across jobs
+
+    The tries of a stage that was retried add up, so that each job counts once
+    with the whole time it spent on the stage. Stages are matched by name
+    across stage flows. The rows are in the order the stages were first seen.
+    """
+    values: Dict[MetricKey, List[float]] = {}
+    for summary in summaries:
+        for job_summary in summary.job_summaries:
+            totals: Dict[MetricKey, float] = {}
+            for metric in job_summary.bolt_metrics:
+                if metric.metric_type not in DURATION_METRIC_TYPES:
+                    continue
+                key = _get_metric_key(metric)
+                totals[key] = totals.get(key, 0) + metric.value
+            for key, total in totals.items():
+                values.setdefault(key, []).append(total)
+
+    percentiles = []
+    for (metric_type, stage_name, role), metric_values in values.items():
+        metric_values.sort()
+        percentiles.append(
+            BoltMetricPercentiles(
+                metric_type=metric_type,
+                stage_name=stage_name,
+                role=role,
+                count=len(metric_values),
+                p50=get_percentile(metric_values, 50),
+                p95=get_percentile(metric_values, 95),
+                max=metric_values[-1],
+            )
+        )
+    return percentiles
+
+
+def format_metric_percentiles(percentiles: Iterable[BoltMetricPercentiles]) -> str:
+    """Formats percentiles as a plain text table, one row per stage metric"""
+    rows = [["stage", "metric", "role", "count", "p50", "p95", "max"]]
+    for row in percentiles:
+        rows.append(
+            [
+                row.stage_name or "-",
+                row.metric_type.value,
+                row.role.value if row.role else "-",
+                str(row.count),
+                f"{row.p50:.2f}",
+                f"{row.p95:.2f}",
+                f"{row.max:.2f}",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in rows
+    )
+
+
+def get_chrome_trace(summaries: Iterable[BoltSummary]) -> Dict[str, Any]:
+    """Gets a Chrome trace of the jobs, to open in Perfetto or chrome://tracing
+
+    Each summary is a process and each of its jobs is a thread, with a slice
+    per duration metric. Queue depths are counters. The metrics without a
+    start time, e.g. metrics of a Bolt version that didn't record it, are left
+    out.
+    """
+    events: List[Dict[str, Any]] = []
+    for pid, summary in enumerate(summaries, 1):
+        events.append(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"BoltSummary {pid}"},
+            }
+        )
+        for tid, job_summary in enumerate(summary.job_summaries, 1):
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": job_summary.job_name},
+                }
+            )
+            for metric in job_summary.bolt_metrics:
+                if metric.start_time is None:
+                    continue
+                if metric.metric_type in DURATION_METRIC_TYPES:
+                    events.append(_get_slice_event(metric, pid, tid))
+                else:
+                    events.append(
+                        {
+                            "name": metric.metric_type.value,
+                            "ph": "C",
+                            "ts": _to_microseconds(metric.start_time),
+                            "pid": pid,
+                            "args": {"value": metric.value},
+                        }
+                    )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(summaries: Iterable[BoltSummary], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(get_chrome_trace(summaries), f)
+
+
+def _get_metric_key(metric: BoltMetric) -> MetricKey:
+    return (
+        metric.metric_type,
+        metric.stage.name if metric.stage else None,
+        metric.role,
+    )
+
+
+def _get_slice_event(metric: BoltMetric, pid: int, tid: int) -> Dict[str, Any]:
+    name = metric.metric_type.value
+    if metric.stage:
+        name = f"{metric.stage.name} {name}"
+    if metric.role:
+        name = f"{name} ({metric.role.value})"
+    return {
+        "name": name,
+        "cat": "stage" if metric.stage else "job",
+        "ph": "X",
+        "ts": _to_microseconds(metric.start_time or 0),
+        "dur": _to_microseconds(metric.value),
+        "pid": pid,
+        "tid": tid,
+        "args": {
+            "stage": metric.stage.name if metric.stage else None,
+            "role": metric.role.value if metric.role else None,
+        },
+    }
+
+
+def _to_microseconds(seconds: float) -> float:
+    return seconds * 1e6
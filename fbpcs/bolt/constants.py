@@ -30,6 +30,15 @@ from fbpcs.private_computation.stage_flows.private_computation_stage_flow import
 )
 
 DEFAULT_POLL_INTERVAL_SEC = 5
+# the adaptive poll interval waits this share of the expected time left in the stage
+ADAPTIVE_POLL_BACKOFF_FACTOR = 0.5
+MAX_ADAPTIVE_POLL_INTERVAL_SEC = 300
+# the number of past durations of each stage the expected duration is learned from
+ADAPTIVE_POLL_HISTORY_SIZE = 20
+# seconds between two checks of the notification directory of FileBoltStatusNotifier
+FILE_NOTIFIER_CHECK_INTERVAL_SEC = 1
+# notifications of instances nobody waits on that BoltStatusNotifier keeps for the next wait
+MAX_PENDING_STATUS_NOTIFICATIONS = 1024
 DEFAULT_STAGE_FLOW: Dict[
     PrivateComputationGameType, Type[PrivateComputationBaseStageFlow]
 ] = {
@@ -50,3 +59,11 @@ INVALID_STATUS_LIST: List[PrivateComputationInstanceStatus] = [
 WAIT_VALID_STATUS_TIMEOUT = 600
 
 FBPCS_GRAPH_API_TOKEN = "FBPCS_GRAPH_API_TOKEN"
+
+# seconds the state of an instance read by a BoltClient is reused by the next reads
+BOLT_CLIENT_STATE_STALENESS_SEC = 1
+
+# threads of the executor BoltPCSClient runs its blocking PrivateComputationService calls on
+BOLT_PCS_CLIENT_MAX_WORKERS = 16
+# seconds an instance read by BoltPCSClient serves the checks that don't need its latest status
+BOLT_PCS_CLIENT_INSTANCE_CACHE_TTL_SEC = 10
@@ -30,3 +30,7 @@ class NoServerIpsException(ValueError):
 
 class IncompatibleStageError(RuntimeError):
     pass
+
+
+class RunJournalMismatchError(ValueError):
+    pass
@@ -7,17 +7,23 @@
 # pyre-strict
 
 import asyncio
+import functools
 import logging
+from concurrent.futures import Executor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from time import time
-from typing import Any, Dict, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
 from dataclasses_json import config, DataClassJsonMixin
 from fbpcs.bolt.bolt_checkpoint import bolt_checkpoint
 
-from fbpcs.bolt.bolt_client import BoltClient, BoltState
+from fbpcs.bolt.bolt_client import BoltClient, BoltState, single_flight
 from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs
-from fbpcs.bolt.constants import DEFAULT_STAGE_FLOW
+from fbpcs.bolt.constants import (
+    BOLT_PCS_CLIENT_INSTANCE_CACHE_TTL_SEC,
+    BOLT_PCS_CLIENT_MAX_WORKERS,
+    DEFAULT_STAGE_FLOW,
+)
 from fbpcs.private_computation.entity.breakdown_key import BreakdownKey
 from fbpcs.private_computation.entity.infra_config import (
     PrivateComputationGameType,
@@ -27,6 +33,10 @@ from fbpcs.private_computation.entity.pce_config import PCEConfig
 from fbpcs.private_computation.entity.pcs_feature import PCSFeature
 from fbpcs.private_computation.entity.post_processing_data import PostProcessingData
 
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationInstance,
+)
+
 from fbpcs.private_computation.entity.product_config import (
     AggregationType,
     AttributionRule,
@@ -44,6 +54,8 @@ from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow i
 )
 from fbpcs.utils.color import colored
 
+R = TypeVar("R")
+
 
 @dataclass
 class BoltPCSCreateInstanceArgs(BoltCreateInstanceArgs, DataClassJsonMixin):
@@ -110,16 +122,35 @@ class BoltPCSCreateInstanceArgs(BoltCreateInstanceArgs, DataClassJsonMixin):
 
 class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
     def __init__(
-        self, pcs: PrivateComputationService, logger: Optional[logging.Logger] = None
+        self,
+        pcs: PrivateComputationService,
+        logger: Optional[logging.Logger] = None,
+        executor: Optional[Executor] = None,
+        instance_cache_ttl: float = BOLT_PCS_CLIENT_INSTANCE_CACHE_TTL_SEC,
     ) -> None:
+        """Bolt PrivateComputationService Client
+
+        Args:
+            - pcs: the service the instances are run with
+            - logger: logger
+            - executor: runs the blocking calls to pcs, defaults to a dedicated thread pool
+            - instance_cache_ttl: seconds an instance that was read serves the checks
+                that don't need its latest status, such as has_feature
+        """
+        super().__init__(logger=logger)
         self.pcs = pcs
-        self.logger: logging.Logger = (
-            logging.getLogger(__name__) if logger is None else logger
+        self.executor: Executor = executor or ThreadPoolExecutor(
+            max_workers=BOLT_PCS_CLIENT_MAX_WORKERS,
+            thread_name_prefix="BoltPCSClient",
         )
+        self._owns_executor: bool = executor is None
+        self.instance_cache_ttl = instance_cache_ttl
+        self._instance_cache: Dict[str, Tuple[float, PrivateComputationInstance]] = {}
 
     @bolt_checkpoint()
     async def create_instance(self, instance_args: BoltPCSCreateInstanceArgs) -> str:
-        instance = self.pcs.create_instance(
+        instance = await self._run_in_executor(
+            self.pcs.create_instance,
             instance_id=instance_args.instance_id,
             role=instance_args.role,
             game_type=instance_args.game_type,
@@ -148,6 +179,7 @@ class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
             input_path_start_ts=instance_args.input_path_start_ts,
             input_path_end_ts=instance_args.input_path_end_ts,
         )
+        self._cache_instance(instance)
         return instance.infra_config.instance_id
 
     @bolt_checkpoint(
@@ -156,7 +188,7 @@ class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
     async def get_stage_flow(
         self, instance_id: str
     ) -> Optional[Type[PrivateComputationBaseStageFlow]]:
-        pc_instance = self.pcs.get_instance(instance_id)
+        pc_instance = await self._get_pc_instance(instance_id)
         return pc_instance.stage_flow
 
     @bolt_checkpoint(
@@ -197,22 +229,54 @@ class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
                 server_hostnames=server_hostnames,
             )
 
+        self.invalidate_state(instance_id)
+        self._cache_instance(pc_instance)
         # the following log is used by log_analyzer
         self.logger.info(f"[{instance_id}] {pc_instance}")
 
     @bolt_checkpoint(
         dump_return_val=True,
     )
+    @single_flight
     async def update_instance(self, instance_id: str) -> BoltState:
-        loop = asyncio.get_running_loop()
-        pc_instance = await loop.run_in_executor(
-            None, self.pcs.update_instance, instance_id
+        return await self._update_state(instance_id)
+
+    @bolt_checkpoint(
+        dump_return_val=True,
+    )
+    async def update_instances(self, instance_ids: List[str]) -> Dict[str, BoltState]:
+        # no more reads in flight than the executor has threads by default
+        semaphore = asyncio.Semaphore(BOLT_PCS_CLIENT_MAX_WORKERS)
+
+        async def update(instance_id: str) -> BoltState:
+            async with semaphore:
+                # shares the read of a concurrent update_instance of the instance
+                return await self._read_state(
+                    instance_id, lambda: self._update_state(instance_id)
+                )
+
+        results = await asyncio.gather(
+            *(update(instance_id) for instance_id in instance_ids),
+            return_exceptions=True,
         )
+        states = {}
+        for instance_id, result in zip(instance_ids, results):
+            if isinstance(result, BaseException):
+                # left out, update_instance raises the error to the caller
+                self.logger.debug(f"[{instance_id}] update failed: {result}")
+                continue
+            states[instance_id] = result
+        return states
+
+    async def _update_state(self, instance_id: str) -> BoltState:
+        pc_instance = await self._update_pc_instance(instance_id)
+        return self._get_bolt_state(pc_instance)
 
+    def _get_bolt_state(self, pc_instance: PrivateComputationInstance) -> BoltState:
         # if the status just changed...
         if time() - pc_instance.infra_config.status_update_ts < 2:
             # the following log is used by log_analyzer
-            self.logger.info(f"[{instance_id}] {pc_instance}")
+            self.logger.info(f"[{pc_instance.infra_config.instance_id}] {pc_instance}")
 
         issuer_certificate = None
         server_hostnames = None
@@ -230,10 +294,7 @@ class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
 
     @bolt_checkpoint(dump_params=True, dump_return_val=True)
     async def has_feature(self, instance_id: str, feature: PCSFeature) -> bool:
-        loop = asyncio.get_running_loop()
-        pc_instance = await loop.run_in_executor(
-            None, self.pcs.get_instance, instance_id
-        )
+        pc_instance = await self._get_pc_instance(instance_id)
         return pc_instance.has_feature(feature)
 
     @bolt_checkpoint(dump_params=True, dump_return_val=True)
@@ -248,8 +309,10 @@ class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
             return True
         else:
             try:
-                self.pcs.validate_metrics(
-                    instance_id=instance_id, expected_result_path=expected_result_path
+                await self._run_in_executor(
+                    self.pcs.validate_metrics,
+                    instance_id=instance_id,
+                    expected_result_path=expected_result_path,
                 )
             except PrivateComputationServiceValidationError:
                 self.logger.info(
@@ -270,18 +333,57 @@ class BoltPCSClient(BoltClient[BoltPCSCreateInstanceArgs]):
 
     @bolt_checkpoint()
     async def cancel_current_stage(self, instance_id: str) -> None:
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.pcs.cancel_current_stage, instance_id)
+        pc_instance = await self._run_in_executor(
+            self.pcs.cancel_current_stage, instance_id
+        )
+        self.invalidate_state(instance_id)
+        self._cache_instance(pc_instance)
 
     @bolt_checkpoint()
     async def get_or_create_instance(
         self, instance_args: BoltPCSCreateInstanceArgs
     ) -> str:
         instance_id = await super().get_or_create_instance(instance_args)
-        self.pcs.update_input_path(instance_id, instance_args.input_path)
+        await self._run_in_executor(
+            self.pcs.update_input_path, instance_id, instance_args.input_path
+        )
         return instance_id
 
     @bolt_checkpoint()
     async def log_failed_containers(self, instance_id: str) -> None:
+        await self._run_in_executor(self.pcs.log_failed_containers, instance_id)
+
+    def close(self) -> None:
+        """Shuts down the executor, if it was created by this client"""
+        if self._owns_executor:
+            self.executor.shutdown(wait=False)
+
+    async def _run_in_executor(
+        self, func: Callable[..., R], *args: Any, **kwargs: Any
+    ) -> R:
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.pcs.log_failed_containers, instance_id)
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _update_pc_instance(self, instance_id: str) -> PrivateComputationInstance:
+        # concurrent updates of an instance already share a read through single_flight.
+        # The whole update is a single trip to the executor, as its repository reads
+        # and container queries are blocking.
+        pc_instance = await self._run_in_executor(self.pcs.update_instance, instance_id)
+        self._cache_instance(pc_instance)
+        return pc_instance
+
+    async def _get_pc_instance(self, instance_id: str) -> PrivateComputationInstance:
+        cached = self._instance_cache.get(instance_id)
+        if cached and time() - cached[0] < self.instance_cache_ttl:
+            return cached[1]
+        pc_instance = await self._run_in_executor(self.pcs.get_instance, instance_id)
+        self._cache_instance(pc_instance)
+        return pc_instance
+
+    def _cache_instance(self, pc_instance: PrivateComputationInstance) -> None:
+        self._instance_cache[pc_instance.infra_config.instance_id] = (
+            time(),
+            pc_instance,
+        )
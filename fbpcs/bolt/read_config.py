@@ -6,12 +6,18 @@
 
 # pyre-strict
 
+import json
 import logging
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from fbpcs.bolt.bolt_job import BoltJob, BoltPlayerArgs
+from fbpcs.bolt.bolt_job_queue import BoltJobQueueOrder
+from fbpcs.bolt.bolt_poll_policy import AdaptiveBoltPollPolicy
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal
 from fbpcs.bolt.bolt_runner import BoltRunner
+from fbpcs.bolt.bolt_stage_scheduler import BoltStageScheduler
+from fbpcs.bolt.bolt_status_notifier import FileBoltStatusNotifier
 from fbpcs.bolt.constants import DEFAULT_POLL_INTERVAL_SEC
 from fbpcs.bolt.oss_bolt_pcs import BoltPCSClient, BoltPCSCreateInstanceArgs
 from fbpcs.private_computation_cli.private_computation_service_wrapper import (
@@ -29,16 +35,23 @@ def parse_bolt_config(
 
     # create runner
     runner_config = config["runner"]
-    runner = create_bolt_runner(runner_config=runner_config, logger=logger)
+    job_config_list = config["jobs"]
+    # the job configs are dumped before create_job_list adds to them
+    runner = create_bolt_runner(
+        runner_config=runner_config,
+        logger=logger,
+        run_identity=json.dumps(job_config_list, sort_keys=True, default=str),
+    )
 
     # create jobs
-    job_config_list = config["jobs"]
     bolt_job_list = create_job_list(job_config_list)
     return runner, bolt_job_list
 
 
 def create_bolt_runner(
-    runner_config: Dict[str, Any], logger: logging.Logger
+    runner_config: Dict[str, Any],
+    logger: logging.Logger,
+    run_identity: Optional[str] = None,
 ) -> BoltRunner[BoltPCSCreateInstanceArgs, BoltPCSCreateInstanceArgs]:
     publisher_client_config = ConfigYamlDict.from_file(
         runner_config["publisher_client_config"]
@@ -65,12 +78,33 @@ def create_bolt_runner(
         )
     )
 
+    stage_pool_sizes = runner_config.get("stage_pool_sizes")
+    poll_history_journal_paths = runner_config.get("poll_history_journal_paths")
     runner = BoltRunner(
         publisher_client=publisher_client,
         partner_client=partner_client,
         max_parallel_runs=runner_config.get("max_parallel_runs"),
         num_tries=runner_config.get("num_tries"),
         logger=logger,
+        stage_scheduler=BoltStageScheduler.from_config(stage_pool_sizes)
+        if stage_pool_sizes
+        else None,
+        job_queue_order=BoltJobQueueOrder(runner_config["job_queue_order"].upper())
+        if runner_config.get("job_queue_order")
+        else None,
+        run_journal=BoltRunJournal(
+            runner_config["run_journal_path"], logger, run_identity=run_identity
+        )
+        if runner_config.get("run_journal_path")
+        else None,
+        poll_policy=AdaptiveBoltPollPolicy.from_run_journals(
+            poll_history_journal_paths, logger
+        )
+        if poll_history_journal_paths
+        else None,
+        status_notifier=FileBoltStatusNotifier(runner_config["status_notification_dir"])
+        if runner_config.get("status_notification_dir")
+        else None,
     )
     return runner
 
@@ -119,6 +153,9 @@ def create_job_list(
             num_tries=job_specific_args.get("num_tries"),
             final_stage=final_stage,
             stage_timeout_override=job_specific_args.get("stage_timeout_override"),
+            priority=job_specific_args.get("priority", 0),
+            deadline=job_specific_args.get("deadline"),
+            expected_runtime=job_specific_args.get("expected_runtime"),
         )
         bolt_job_list.append(bolt_job)
 
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import asyncio
+import logging
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from time import time
+from typing import Counter as CounterType, Dict, List, Optional, Type
+
+from fbpcs.bolt.bolt_checkpoint import bolt_checkpoint
+from fbpcs.bolt.bolt_client import BoltClient, BoltState, single_flight
+from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs
+from fbpcs.bolt.constants import BOLT_CLIENT_STATE_STALENESS_SEC
+from fbpcs.private_computation.entity.pcs_feature import PCSFeature
+from fbpcs.private_computation.entity.private_computation_status import (
+    PrivateComputationInstanceStatus,
+)
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class SimulatedThrottlingError(RuntimeError):
+    pass
+
+
+@dataclass
+class SimulatedBoltCreateInstanceArgs(BoltCreateInstanceArgs):
+    stage_flow: Type[PrivateComputationBaseStageFlow] = PrivateComputationStageFlow
+
+
+@dataclass
+class SimulatedBoltClientConfig:
+    # the duration of each stage by stage name, in seconds
+    stage_durations: Dict[str, float] = field(default_factory=dict)
+    # the duration of the stages without one in stage_durations, in seconds
+    default_stage_duration: float = 1.0
+    # each stage run lasts its duration times a uniform factor in [1 - jitter, 1 + jitter]
+    stage_duration_jitter: float = 0.0
+    # the probability that a stage run fails
+    stage_failure_rate: float = 0.0
+    # the probability that a request is throttled
+    throttle_rate: float = 0.0
+    # the requests over this rate are throttled, as by a token bucket of a second of requests
+    max_requests_per_second: Optional[float] = None
+    # the request latency is log-normal with this median, in seconds, and sigma
+    latency_median: float = 0.0
+    latency_sigma: float = 0.0
+    # the state_staleness of the client, in seconds
+    state_staleness: float = BOLT_CLIENT_STATE_STALENESS_SEC
+    seed: Optional[int] = None
+
+
+@dataclass
+class _SimulatedInstance:
+    stage_flow: Type[PrivateComputationBaseStageFlow]
+    status: PrivateComputationInstanceStatus
+    stage: Optional[PrivateComputationBaseStageFlow] = None
+    stage_duration: float = 0.0
+    # None until the other player connected, for the publisher side of a joint stage
+    stage_end_time: Optional[float] = None
+    stage_fails: bool = False
+
+
+class SimulatedBoltClient(BoltClient[SimulatedBoltCreateInstanceArgs]):
+    """A BoltClient of simulated instances, to load test a BoltRunner
+
+    The instances live in memory. A stage that is run completes, or fails, once
+    its simulated duration has elapsed, as seen by the next update_instance. A
+    joint stage run without server ips, i.e. on the publisher side, waits for
+    its server ips to be read by the partner before its duration starts.
+    Every call is a simulated request that takes a random latency and can be
+    throttled. The requests are counted by method, so that the request rates of
+    a BoltRunner can be measured without reaching real infrastructure.
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulatedBoltClientConfig] = None,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        config = config or SimulatedBoltClientConfig()
+        super().__init__(logger=logger, state_staleness=config.state_staleness)
+        self.config = config
+        self.request_counts: CounterType[str] = Counter()
+        self.throttled_requests = 0
+        self._random = random.Random(self.config.seed)
+        self._instances: Dict[str, _SimulatedInstance] = {}
+        self._tokens: float = self.config.max_requests_per_second or 0
+        self._tokens_time: float = time()
+
+    @bolt_checkpoint()
+    async def create_instance(
+        self, instance_args: SimulatedBoltCreateInstanceArgs
+    ) -> str:
+        await self._request("create_instance")
+        self._instances[instance_args.instance_id] = _SimulatedInstance(
+            stage_flow=instance_args.stage_flow,
+            status=instance_args.stage_flow.get_first_stage().completed_status,
+        )
+        return instance_args.instance_id
+
+    async def get_stage_flow(
+        self, instance_id: str
+    ) -> Optional[Type[PrivateComputationBaseStageFlow]]:
+        await self._request("get_stage_flow")
+        return self._get_instance(instance_id).stage_flow
+
+    @bolt_checkpoint(dump_params=True, include=["instance_id", "stage"])
+    async def run_stage(
+        self,
+        instance_id: str,
+        stage: Optional[PrivateComputationBaseStageFlow] = None,
+        server_ips: Optional[List[str]] = None,
+        ca_certificate: Optional[str] = None,
+        server_hostnames: Optional[List[str]] = None,
+    ) -> None:
+        await self._request("run_stage")
+        instance = self._get_instance(instance_id)
+        stage = stage or instance.stage_flow.get_next_runnable_stage_from_status(
+            instance.status
+        )
+        if stage is None:
+            raise RuntimeError(
+                f"{instance_id} has no stage to run from {instance.status}"
+            )
+        duration = self.config.stage_durations.get(
+            stage.name, self.config.default_stage_duration
+        )
+        jitter = self.config.stage_duration_jitter
+        instance.stage = stage
+        instance.status = stage.started_status
+        instance.stage_duration = duration * self._random.uniform(
+            1 - jitter, 1 + jitter
+        )
+        # the publisher side of a joint stage waits for the partner to connect
+        instance.stage_end_time = (
+            None
+            if stage.is_joint_stage and server_ips is None
+            else time() + instance.stage_duration
+        )
+        instance.stage_fails = self._random.random() < self.config.stage_failure_rate
+        self.invalidate_state(instance_id)
+
+    @bolt_checkpoint(dump_return_val=True)
+    @single_flight
+    async def update_instance(self, instance_id: str) -> BoltState:
+        await self._request("update_instance")
+        return self._get_state(instance_id)
+
+    async def update_instances(self, instance_ids: List[str]) -> Dict[str, BoltState]:
+        await self._request("update_instances")
+        return {
+            instance_id: self._get_state(instance_id)
+            for instance_id in instance_ids
+            if instance_id in self._instances
+        }
+
+    async def has_feature(self, instance_id: str, feature: PCSFeature) -> bool:
+        await self._request("has_feature")
+        return False
+
+    async def validate_results(
+        self, instance_id: str, expected_result_path: Optional[str] = None
+    ) -> bool:
+        await self._request("validate_results")
+        return True
+
+    @bolt_checkpoint()
+    async def cancel_current_stage(self, instance_id: str) -> None:
+        await self._request("cancel_current_stage")
+        instance = self._get_instance(instance_id)
+        if instance.stage and instance.status is instance.stage.started_status:
+            instance.status = instance.stage.failed_status
+        self.invalidate_state(instance_id)
+
+    async def _request(self, method: str) -> None:
+        self.request_counts[method] += 1
+        throttled = self._is_throttled()
+        latency = (
+            self._random.lognormvariate(0, self.config.latency_sigma)
+            * self.config.latency_median
+        )
+        await asyncio.sleep(latency)
+        if throttled:
+            self.throttled_requests += 1
+            raise SimulatedThrottlingError(f"{method} was throttled")
+
+    def _is_throttled(self) -> bool:
+        max_requests_per_second = self.config.max_requests_per_second
+        if max_requests_per_second:
+            now = time()
+            self._tokens = min(
+                max_requests_per_second,
+                self._tokens + (now - self._tokens_time) * max_requests_per_second,
+            )
+            self._tokens_time = now
+            if self._tokens < 1:
+                return True
+            self._tokens -= 1
+        return self._random.random() < self.config.throttle_rate
+
+    def _get_instance(self, instance_id: str) -> _SimulatedInstance:
+        instance = self._instances.get(instance_id)
+        if instance is None:
+            raise RuntimeError(f"Instance {instance_id} not found")
+        return instance
+
+    def _get_state(self, instance_id: str) -> BoltState:
+        instance = self._get_instance(instance_id)
+        stage = instance.stage
+        if not stage or instance.status is not stage.started_status:
+            return BoltState(pc_instance_status=instance.status)
+        if instance.stage_end_time is not None and time() >= instance.stage_end_time:
+            instance.status = (
+                stage.failed_status if instance.stage_fails else stage.completed_status
+            )
+            return BoltState(pc_instance_status=instance.status)
+        if stage.is_joint_stage:
+            if instance.stage_end_time is None:
+                # the partner connects once it got the server ips
+                instance.stage_end_time = time() + instance.stage_duration
+            return BoltState(
+                pc_instance_status=instance.status,
+                server_ips=["127.0.0.1"],
+                server_hostnames=["localhost"],
+            )
+        return BoltState(pc_instance_status=instance.status)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+from fbpcs.bolt.bolt_client import BoltClient, BoltState, single_flight
+from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs
+from fbpcs.private_computation.entity.pcs_feature import PCSFeature
+from fbpcs.private_computation.entity.private_computation_status import (
+    PrivateComputationInstanceStatus,
+)
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class DummyBoltClient(BoltClient[BoltCreateInstanceArgs]):
+    def __init__(self) -> None:
+        super().__init__()
+        self.read = mock.AsyncMock(
+            return_value=BoltState(PrivateComputationInstanceStatus.CREATED)
+        )
+
+    async def create_instance(self, instance_args: BoltCreateInstanceArgs) -> str:
+        return instance_args.instance_id
+
+    async def get_stage_flow(self, instance_id: str) -> None:
+        return None
+
+    async def run_stage(
+        self,
+        instance_id: str,
+        stage: Optional[PrivateComputationBaseStageFlow] = None,
+        server_ips: Optional[List[str]] = None,
+        ca_certificate: Optional[str] = None,
+        server_hostnames: Optional[List[str]] = None,
+    ) -> None:
+        self.invalidate_state(instance_id)
+
+    @single_flight
+    async def update_instance(self, instance_id: str) -> BoltState:
+        await asyncio.sleep(0.01)
+        return await self.read(instance_id)
+
+    async def has_feature(self, instance_id: str, feature: PCSFeature) -> bool:
+        return False
+
+    async def validate_results(
+        self, instance_id: str, expected_result_path: Optional[str] = None
+    ) -> bool:
+        return True
+
+
+class TestBoltClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = DummyBoltClient()
+
+    async def test_concurrent_reads_share_one_request(self) -> None:
+        states = await asyncio.gather(
+            self.client.update_instance("id1"),
+            self.client.update_instance(instance_id="id1"),
+            self.client.get_valid_stage("id1", PrivateComputationStageFlow),
+            self.client.update_instance("id2"),
+        )
+
+        self.assertEqual(states[0], states[1])
+        self.assertEqual(states[2], PrivateComputationStageFlow.PC_PRE_VALIDATION)
+        self.assertEqual(
+            self.client.read.call_args_list, [mock.call("id1"), mock.call("id2")]
+        )
+
+    async def test_closely_spaced_reads_reuse_the_state(self) -> None:
+        await self.client.update_instance("id1")
+        await self.client.should_invoke_stage(
+            "id1", PrivateComputationStageFlow.PC_PRE_VALIDATION
+        )
+        await self.client.is_existing_instance(BoltCreateInstanceArgs("id1"))
+        self.client.read.assert_called_once_with("id1")
+
+        # past the staleness window
+        self.client.state_staleness = 0
+        await self.client.update_instance("id1")
+        self.assertEqual(self.client.read.call_count, 2)
+
+    async def test_invalidate_state(self) -> None:
+        await self.client.update_instance("id1")
+        await self.client.run_stage("id1")
+        await self.client.update_instance("id1")
+        self.assertEqual(self.client.read.call_count, 2)
+
+    async def test_read_in_flight_is_not_reused_once_invalidated(self) -> None:
+        in_flight = asyncio.ensure_future(self.client.update_instance("id1"))
+        await asyncio.sleep(0)
+        self.client.invalidate_state("id1")
+        await asyncio.gather(in_flight, self.client.update_instance("id1"))
+        await self.client.update_instance("id1")
+
+        # the read that was in flight was not cached
+        self.assertEqual(self.client.read.call_count, 2)
+
+    async def test_errors_are_not_reused(self) -> None:
+        self.client.read.side_effect = [RuntimeError("not found"), mock.DEFAULT]
+        with self.assertRaises(RuntimeError):
+            await self.client.update_instance("id1")
+        await self.client.update_instance("id1")
+        self.assertEqual(self.client.read.call_count, 2)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+from fbpcs.bolt.bolt_job import BoltJob
+from fbpcs.bolt.bolt_job_queue import BoltJobQueue, BoltJobQueueOrder
+
+
+class TestBoltJobQueue(unittest.IsolatedAsyncioTestCase):
+    def _get_job(
+        self,
+        job_name: str,
+        priority: int = 0,
+        deadline: Optional[float] = None,
+        expected_runtime: Optional[float] = None,
+    ) -> BoltJob:
+        return BoltJob(
+            job_name=job_name,
+            publisher_bolt_args=mock.MagicMock(),
+            partner_bolt_args=mock.MagicMock(),
+            priority=priority,
+            deadline=deadline,
+            expected_runtime=expected_runtime,
+        )
+
+    async def _run_jobs(self, queue: BoltJobQueue, jobs: List[BoltJob]) -> List[str]:
+        started = []
+
+        async def run(job: BoltJob) -> None:
+            async with queue.job_slot(job):
+                started.append(job.job_name)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(run(job) for job in jobs))
+        return started
+
+    def _get_jobs(self) -> List[BoltJob]:
+        return [
+            # holds the only slot while the others are queued
+            self._get_job("first"),
+            self._get_job("backfill", expected_runtime=100),
+            self._get_job("urgent_late", priority=1, deadline=2000),
+            self._get_job("short", expected_runtime=10),
+            self._get_job("urgent_early", priority=1, deadline=1000),
+            self._get_job("no_estimate"),
+        ]
+
+    async def test_priority_order(self) -> None:
+        queue = BoltJobQueue(1, BoltJobQueueOrder.PRIORITY)
+        started = await self._run_jobs(queue, self._get_jobs())
+
+        self.assertEqual(
+            started,
+            [
+                "first",
+                "urgent_early",
+                "urgent_late",
+                "short",
+                "backfill",
+                "no_estimate",
+            ],
+        )
+
+    async def test_shortest_job_first_order(self) -> None:
+        queue = BoltJobQueue(1, BoltJobQueueOrder.SHORTEST_JOB_FIRST)
+        started = await self._run_jobs(queue, self._get_jobs())
+
+        self.assertEqual(
+            started,
+            [
+                "first",
+                "short",
+                "backfill",
+                "urgent_early",
+                "urgent_late",
+                "no_estimate",
+            ],
+        )
+
+    async def test_fifo_order(self) -> None:
+        queue = BoltJobQueue(1, BoltJobQueueOrder.FIFO)
+        jobs = self._get_jobs()
+        started = await self._run_jobs(queue, jobs)
+
+        self.assertEqual(started, [job.job_name for job in jobs])
+
+    async def test_queue_metrics(self) -> None:
+        queue = BoltJobQueue(2)
+        await self._run_jobs(queue, self._get_jobs())
+
+        self.assertEqual(queue.max_depth, 4)
+        self.assertEqual(queue.depth, 0)
+        self.assertEqual(len(queue.wait_times), 6)
+        self.assertLess(max(queue.wait_times[:2]), 0.001)
+
+    async def test_cancelled_job_leaves_the_queue(self) -> None:
+        queue = BoltJobQueue(1)
+        release = asyncio.Event()
+
+        async def hold_slot(job: BoltJob) -> None:
+            async with queue.job_slot(job):
+                await release.wait()
+
+        holder = asyncio.create_task(hold_slot(self._get_job("first")))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(hold_slot(self._get_job("cancelled")))
+        await asyncio.sleep(0)
+        self.assertEqual(queue.depth, 1)
+
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        self.assertEqual(queue.depth, 0)
+        release.set()
+        await holder
+
+        # the slot of the first job was freed, not handed to the cancelled job
+        self.assertEqual(await self._run_jobs(queue, [self._get_job("next")]), ["next"])
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import tempfile
+import unittest
+
+from fbpcs.bolt.bolt_job_summary import BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_poll_policy import AdaptiveBoltPollPolicy, BoltPollPolicy
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal, BoltRunJournalEvent
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class TestBoltPollPolicy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stage = PrivateComputationStageFlow.COMPUTE
+        self.policy = AdaptiveBoltPollPolicy(
+            backoff_factor=0.5, max_poll_interval=300, history_size=3
+        )
+
+    def test_fixed_poll_interval(self) -> None:
+        self.assertEqual(BoltPollPolicy().get_poll_interval(self.stage, 100, 5), 5)
+
+    def test_unknown_stage_uses_job_poll_interval(self) -> None:
+        self.assertEqual(self.policy.get_poll_interval(self.stage, 0, 5), 5)
+
+    def test_backs_off_until_expected_completion(self) -> None:
+        self.policy.record_stage_duration(self.stage, 1000)
+        self.policy.record_stage_duration(self.stage, 400)
+
+        for elapsed, expected_interval in [
+            # capped far from the expected completion
+            (0, 200),
+            (100, 150),
+            (380, 10),
+            # never below the job's poll interval, nor once past the expected completion
+            (399, 5),
+            (500, 5),
+        ]:
+            with self.subTest(elapsed=elapsed):
+                self.assertEqual(
+                    self.policy.get_poll_interval(self.stage, elapsed, 5),
+                    expected_interval,
+                )
+        self.assertEqual(
+            self.policy.get_poll_interval(PrivateComputationStageFlow.AGGREGATE, 0, 5),
+            5,
+        )
+
+    def test_max_poll_interval(self) -> None:
+        self.policy.record_stage_duration(self.stage, 10000)
+        self.assertEqual(self.policy.get_poll_interval(self.stage, 0, 5), 300)
+
+    def test_history_size(self) -> None:
+        for duration in [100, 200, 300, 400]:
+            self.policy.record_stage_duration(self.stage, duration)
+        # the oldest duration was dropped
+        self.assertEqual(self.policy.get_expected_duration(self.stage), 200)
+
+    def test_record_metrics(self) -> None:
+        self.policy.record_metrics(
+            [
+                BoltMetric(BoltMetricType.STAGE_WAIT_FOR_COMPLETED, 100, self.stage),
+                BoltMetric(BoltMetricType.STAGE_START_UP_TIME, 1, self.stage),
+                BoltMetric(BoltMetricType.JOB_RUN_TIME, 1),
+            ]
+        )
+        self.assertEqual(self.policy.get_expected_duration(self.stage), 100)
+
+    def test_from_run_journals(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "journal.jsonl")
+            BoltRunJournal(path).record(
+                "job",
+                BoltRunJournalEvent.INSTANCES_READY,
+                [BoltMetric(BoltMetricType.STAGE_WAIT_FOR_COMPLETED, 100, self.stage)],
+                publisher_id="pub_id",
+                partner_id="part_id",
+                stage_flow=PrivateComputationStageFlow,
+            )
+
+            policy = AdaptiveBoltPollPolicy.from_run_journals(
+                [path, os.path.join(tmpdir, "missing.jsonl")]
+            )
+
+        self.assertEqual(policy.get_expected_duration(self.stage), 100)
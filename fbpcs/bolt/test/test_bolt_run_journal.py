@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import tempfile
+import unittest
+
+from fbpcs.bolt.bolt_job_summary import BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal, BoltRunJournalEvent
+from fbpcs.bolt.exceptions import RunJournalMismatchError
+from fbpcs.private_computation.entity.infra_config import PrivateComputationRole
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class TestBoltRunJournal(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "journal.jsonl")
+        self.journal = BoltRunJournal(self.path)
+        self.bolt_metrics = [BoltMetric(BoltMetricType.JOB_QUEUE_TIME, 1.0)]
+        self.journal.record(
+            "job",
+            BoltRunJournalEvent.INSTANCES_READY,
+            self.bolt_metrics,
+            publisher_id="pub_id",
+            partner_id="part_id",
+            stage_flow=PrivateComputationStageFlow,
+        )
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_replay(self) -> None:
+        stage = PrivateComputationStageFlow.ID_MATCH
+        self.bolt_metrics.append(
+            BoltMetric(
+                BoltMetricType.PLAYER_STAGE_START_UP_TIME,
+                2.0,
+                stage,
+                PrivateComputationRole.PARTNER,
+            )
+        )
+        self.journal.record(
+            "job",
+            BoltRunJournalEvent.STAGE_FAILED,
+            self.bolt_metrics,
+            stage=stage,
+            tries=1,
+            previous_attempt_timeout=True,
+        )
+
+        progress = BoltRunJournal(self.path).get_progress("job")
+
+        self.assertIsNotNone(progress)
+        self.assertEqual(progress.publisher_id, "pub_id")
+        self.assertEqual(progress.partner_id, "part_id")
+        self.assertIs(progress.stage_flow, PrivateComputationStageFlow)
+        self.assertIs(progress.stage, stage)
+        self.assertEqual(progress.tries, 1)
+        self.assertTrue(progress.previous_attempt_timeout)
+        self.assertFalse(progress.previous_attempt_cancelled)
+        self.assertIsNone(progress.is_success)
+        # each metric is journaled once
+        self.assertEqual(progress.bolt_metrics, self.bolt_metrics)
+
+    def test_stage_completed(self) -> None:
+        self.journal.record(
+            "job",
+            BoltRunJournalEvent.STAGE_STARTED,
+            stage=PrivateComputationStageFlow.ID_MATCH,
+        )
+        self.journal.record("job", BoltRunJournalEvent.STAGE_COMPLETED)
+
+        progress = BoltRunJournal(self.path).get_progress("job")
+
+        self.assertIsNone(progress.stage)
+        self.assertEqual(progress.tries, 0)
+
+    def test_job_finished(self) -> None:
+        self.journal.record(
+            "other_job", BoltRunJournalEvent.JOB_FINISHED, is_success=True
+        )
+        self.journal.record("job", BoltRunJournalEvent.JOB_FINISHED, is_success=False)
+
+        journal = BoltRunJournal(self.path)
+
+        self.assertTrue(journal.get_progress("other_job").is_success)
+        # a failed job starts over
+        self.assertIsNone(journal.get_progress("job"))
+
+    def test_partial_entry_is_skipped(self) -> None:
+        with open(self.path, "a") as f:
+            f.write('{"job_name": "job", "event": "STAGE_')
+
+        progress = BoltRunJournal(self.path).get_progress("job")
+
+        self.assertEqual(progress.publisher_id, "pub_id")
+        self.assertIsNone(progress.stage)
+
+        # the partial entry is dropped rather than extended by the next one
+        BoltRunJournal(self.path).record("job", BoltRunJournalEvent.STAGE_COMPLETED)
+        self.assertIsNotNone(BoltRunJournal(self.path).get_progress("job"))
+
+    def test_run_identity(self) -> None:
+        path = os.path.join(self.tmpdir.name, "identity_journal.jsonl")
+        BoltRunJournal(path, run_identity="study_1").record(
+            "job", BoltRunJournalEvent.JOB_FINISHED, is_success=True
+        )
+
+        # the same run resumes, and a run without an identity doesn't check it
+        for run_identity in ("study_1", None):
+            with self.subTest(run_identity=run_identity):
+                journal = BoltRunJournal(path, run_identity=run_identity)
+                self.assertTrue(journal.get_progress("job").is_success)
+
+        with self.assertRaises(RunJournalMismatchError):
+            BoltRunJournal(path, run_identity="study_2")
@@ -4,6 +4,9 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 
+import asyncio
+import os
+import tempfile
 import time
 import unittest
 from enum import Enum
@@ -15,6 +18,9 @@ from fbpcs.bolt.bolt_client import BoltState
 
 from fbpcs.bolt.bolt_hook import BoltHookEvent, BoltHookKey, BoltHookTiming
 from fbpcs.bolt.bolt_job import BoltJob
+from fbpcs.bolt.bolt_job_queue import BoltJobQueue
+from fbpcs.bolt.bolt_job_summary import BoltJobSummary, BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal, BoltRunJournalEvent
 from fbpcs.bolt.bolt_runner import BoltRunner
 from fbpcs.bolt.constants import DEFAULT_NUM_TRIES
 from fbpcs.bolt.exceptions import (
@@ -60,6 +66,41 @@ class TestBoltRunner(unittest.IsolatedAsyncioTestCase):
         self.server_cert_base_domain = "test_domain"
         self.default_server_hostnames = [f"node0.{self.server_cert_base_domain}"]
 
+    async def test_urgent_jobs_start_first(self) -> None:
+        self.test_runner.job_queue = BoltJobQueue(max_parallel_runs=2)
+        started_jobs = []
+
+        async def run_one(job: BoltJob) -> BoltJobSummary:
+            async with self.test_runner.job_queue.job_slot(job):
+                started_jobs.append(job.job_name)
+                await asyncio.sleep(0)
+            return BoltJobSummary(
+                job_name=job.job_name,
+                publisher_instance_id="test_pub_id",
+                partner_instance_id="test_part_id",
+                is_success=True,
+            )
+
+        self.test_runner._run_one = run_one
+        jobs = [
+            BoltJob(
+                job_name=f"test{i}",
+                publisher_bolt_args=mock.MagicMock(),
+                partner_bolt_args=mock.MagicMock(),
+            )
+            for i in range(4)
+        ]
+        # the urgent job is the last of the list
+        jobs[-1].priority = 1
+
+        summary = await self.test_runner.run_async(jobs)
+
+        self.assertEqual(started_jobs, ["test3", "test0", "test1", "test2"])
+        self.assertEqual(
+            [job_summary.job_name for job_summary in summary.job_summaries],
+            ["test0", "test1", "test2", "test3"],
+        )
+
     @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
     @mock.patch("fbpcs.bolt.bolt_job.BoltPlayerArgs")
     @mock.patch("fbpcs.bolt.bolt_job.BoltPlayerArgs")
@@ -158,6 +199,128 @@ class TestBoltRunner(unittest.IsolatedAsyncioTestCase):
             server_hostnames=None,
         )
 
+    @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
+    @mock.patch("fbpcs.bolt.bolt_job.BoltPlayerArgs")
+    @mock.patch("fbpcs.bolt.bolt_job.BoltPlayerArgs")
+    @mock.patch("fbpcs.bolt.bolt_runner.BoltRunner.get_next_valid_stage")
+    @mock.patch("fbpcs.bolt.bolt_runner.BoltRunner.get_stage_flow")
+    async def test_stage_scheduler(
+        self,
+        mock_get_stage_flow,
+        mock_next_stage,
+        mock_publisher_args,
+        mock_partner_args,
+        mock_sleep,
+    ) -> None:
+        mock_get_stage_flow.return_value = DummyNonJointStageFlow
+        self.test_runner.publisher_client.get_or_create_instance = mock.AsyncMock(
+            return_value="test_pub_id"
+        )
+        self.test_runner.partner_client.get_or_create_instance = mock.AsyncMock(
+            return_value="test_part_id"
+        )
+        mock_partner_run_stage = self._prepare_mock_client_functions(
+            "test_pub_id", "test_part_id", PrivateComputationStageFlow.PID_SHARD
+        )
+        mock_next_stage.return_value = DummyNonJointStageFlow.NON_JOINT_STAGE
+        self.test_runner.stage_scheduler = mock.MagicMock()
+        self.test_runner.job_queue = BoltJobQueue(max_parallel_runs=1)
+        jobs_holding_slot = []
+
+        def stage_slot(stage: PrivateComputationStageFlow) -> mock.MagicMock:
+            jobs_holding_slot.append(self.test_runner.job_queue._running)
+            return mock.MagicMock()
+
+        self.test_runner.stage_scheduler.stage_slot.side_effect = stage_slot
+
+        summary = await self.test_runner.run_async(
+            [
+                BoltJob(
+                    job_name="test",
+                    publisher_bolt_args=mock_publisher_args,
+                    partner_bolt_args=mock_partner_args,
+                )
+            ]
+        )
+
+        self.test_runner.stage_scheduler.stage_slot.assert_called_with(
+            DummyNonJointStageFlow.NON_JOINT_STAGE
+        )
+        # the job slot only bounds the creation of the instances, not the stages
+        self.assertTrue(jobs_holding_slot)
+        self.assertEqual(set(jobs_holding_slot), {0})
+        self.assertEqual(len(self.test_runner.job_queue.wait_times), 1)
+        mock_partner_run_stage.assert_called()
+        self.assertIn(
+            BoltMetricType.STAGE_QUEUE_TIME,
+            [metric.metric_type for metric in summary.job_summaries[0].bolt_metrics],
+        )
+
+    @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
+    @mock.patch("fbpcs.bolt.bolt_job.BoltPlayerArgs")
+    @mock.patch("fbpcs.bolt.bolt_job.BoltPlayerArgs")
+    @mock.patch("fbpcs.bolt.bolt_runner.BoltRunner.get_next_valid_stage")
+    @mock.patch("fbpcs.bolt.bolt_runner.BoltRunner.get_stage_flow")
+    async def test_resume_from_run_journal(
+        self,
+        mock_get_stage_flow,
+        mock_next_stage,
+        mock_publisher_args,
+        mock_partner_args,
+        mock_sleep,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal_path = os.path.join(tmpdir, "journal.jsonl")
+            # the runner died while waiting on the second try of the stage
+            journal = BoltRunJournal(journal_path)
+            journal.record(
+                "test",
+                BoltRunJournalEvent.INSTANCES_READY,
+                publisher_id="test_pub_id",
+                partner_id="test_part_id",
+                stage_flow=DummyNonJointStageFlow,
+            )
+            journal.record(
+                "test",
+                BoltRunJournalEvent.STAGE_STARTED,
+                stage=DummyNonJointStageFlow.NON_JOINT_STAGE,
+                tries=1,
+            )
+            self.test_runner.run_journal = BoltRunJournal(journal_path)
+            self.test_runner.publisher_client.get_or_create_instance = AsyncMock()
+            self.test_runner.partner_client.get_or_create_instance = AsyncMock()
+            mock_partner_run_stage = self._prepare_mock_client_functions(
+                "test_pub_id", "test_part_id", PrivateComputationStageFlow.PID_SHARD
+            )
+            mock_next_stage.return_value = None
+            test_job = BoltJob(
+                job_name="test",
+                publisher_bolt_args=mock_publisher_args,
+                partner_bolt_args=mock_partner_args,
+                num_tries=2,
+            )
+
+            summary = await self.test_runner.run_async([test_job])
+
+            self.assertTrue(summary.is_success)
+            # the instances and stage flow come from the journal
+            self.test_runner.publisher_client.get_or_create_instance.assert_not_called()
+            self.test_runner.partner_client.get_or_create_instance.assert_not_called()
+            mock_get_stage_flow.assert_not_called()
+            # the stage is resumed instead of looked up, then the next one is
+            mock_next_stage.assert_called_once()
+            mock_partner_run_stage.assert_called_once()
+            self.assertTrue(
+                BoltRunJournal(journal_path).get_progress("test").is_success
+            )
+
+            # a job that completed is not run again
+            mock_partner_run_stage.reset_mock()
+            self.test_runner.run_journal = BoltRunJournal(journal_path)
+            summary = await self.test_runner.run_async([test_job])
+            self.assertTrue(summary.is_success)
+            mock_partner_run_stage.assert_not_called()
+
     @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
     async def test_get_server_ips_after_start(self, mock_sleep) -> None:
         mock_server_ips = ["1.1.1.1"]
@@ -398,6 +561,115 @@ class TestBoltRunner(unittest.IsolatedAsyncioTestCase):
                     mock_publisher_run_stage.assert_not_called()
                     mock_partner_run_stage.assert_called_once()
 
+    @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
+    async def test_wait_stage_complete_with_status_poller(self, mock_sleep) -> None:
+        stage = PrivateComputationStageFlow.ID_MATCH
+        publisher_client = mock.MagicMock()
+        partner_client = mock.MagicMock()
+        for client in (publisher_client, partner_client):
+            client.update_instances = mock.AsyncMock(
+                side_effect=[
+                    {instance_id: BoltState(status) for instance_id in ("id1", "id2")}
+                    for status in (stage.started_status, stage.completed_status)
+                ]
+            )
+            client.update_instance = mock.AsyncMock()
+        test_runner = BoltRunner(
+            publisher_client=publisher_client,
+            partner_client=partner_client,
+            batch_status_polls=True,
+        )
+
+        await asyncio.gather(
+            *(
+                test_runner.wait_stage_complete(
+                    publisher_id=instance_id,
+                    partner_id=instance_id,
+                    stage=stage,
+                    poll_interval=5,
+                )
+                for instance_id in ("id1", "id2")
+            )
+        )
+
+        # the two jobs are polled together on each tick
+        for client in (publisher_client, partner_client):
+            self.assertEqual(
+                [sorted(c.args[0]) for c in client.update_instances.call_args_list],
+                [["id1", "id2"], ["id1", "id2"]],
+            )
+            client.update_instance.assert_not_called()
+
+    def test_poll_policy_learns_from_run_journal(self) -> None:
+        stage = PrivateComputationStageFlow.COMPUTE
+        run_journal = mock.MagicMock()
+        run_journal.get_bolt_metrics.return_value = [
+            BoltMetric(BoltMetricType.STAGE_WAIT_FOR_COMPLETED, 1000, stage)
+        ]
+
+        test_runner = BoltRunner(
+            publisher_client=self.test_runner.publisher_client,
+            partner_client=self.test_runner.partner_client,
+            run_journal=run_journal,
+        )
+
+        self.assertEqual(test_runner.poll_policy.get_expected_duration(stage), 1000)
+
+    @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
+    async def test_wait_stage_complete_adaptive_poll_interval(self, mock_sleep) -> None:
+        stage = PrivateComputationStageFlow.COMPUTE
+        self.test_runner.poll_policy.record_stage_duration(stage, 1000)
+        self.test_runner.publisher_client.update_instance = mock.AsyncMock(
+            side_effect=[
+                BoltState(stage.started_status),
+                BoltState(stage.completed_status),
+            ]
+        )
+        self.test_runner.partner_client.update_instance = mock.AsyncMock(
+            side_effect=[
+                BoltState(stage.started_status),
+                BoltState(stage.completed_status),
+            ]
+        )
+
+        await self.test_runner.wait_stage_complete(
+            publisher_id="test_pub_id",
+            partner_id="test_part_id",
+            stage=stage,
+            poll_interval=5,
+        )
+
+        # backed off from the job's poll interval, the stage is expected to run for a while
+        mock_sleep.assert_called_once()
+        self.assertGreater(mock_sleep.call_args.args[0], 100)
+
+    @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
+    async def test_wait_stage_complete_status_notifier(self, mock_sleep) -> None:
+        stage = PrivateComputationStageFlow.COMPUTE
+        self.test_runner.status_notifier = mock.MagicMock()
+        self.test_runner.status_notifier.wait = mock.AsyncMock(return_value=True)
+        self.test_runner.publisher_client.update_instance = mock.AsyncMock(
+            side_effect=[
+                BoltState(stage.started_status),
+                BoltState(stage.completed_status),
+            ]
+        )
+        self.test_runner.partner_client.update_instance = mock.AsyncMock(
+            return_value=BoltState(stage.completed_status)
+        )
+
+        await self.test_runner.wait_stage_complete(
+            publisher_id="test_pub_id",
+            partner_id="test_part_id",
+            stage=stage,
+            poll_interval=5,
+        )
+
+        self.test_runner.status_notifier.wait.assert_called_once_with(
+            ["test_pub_id", "test_part_id"], 5
+        )
+        mock_sleep.assert_not_called()
+
     @mock.patch("fbpcs.bolt.bolt_runner.asyncio.sleep")
     @mock.patch("fbpcs.bolt.bolt_client.BoltClient.has_feature")
     async def test_wait_stage_complete(self, mock_has_feature, mock_sleep) -> None:
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import unittest
+from collections import Counter
+
+from fbpcs.bolt.bolt_stage_scheduler import BoltStagePool, BoltStageScheduler
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+from fbpcs.private_computation.stage_flows.private_computation_pcf2_stage_flow import (
+    PrivateComputationPCF2StageFlow,
+)
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class TestBoltStageScheduler(unittest.IsolatedAsyncioTestCase):
+    def test_get_stage_pool(self) -> None:
+        for stage, expected_pool in [
+            (PrivateComputationStageFlow.ID_MATCH, BoltStagePool.PID),
+            (PrivateComputationStageFlow.RESHARD, BoltStagePool.DATA_PROCESSING),
+            (PrivateComputationStageFlow.COMPUTE, BoltStagePool.COMPUTE),
+            (PrivateComputationPCF2StageFlow.PCF2_ATTRIBUTION, BoltStagePool.COMPUTE),
+            (
+                PrivateComputationPCF2StageFlow.PCF2_AGGREGATION,
+                BoltStagePool.AGGREGATION,
+            ),
+            (PrivateComputationStageFlow.CREATED, BoltStagePool.OTHER),
+        ]:
+            with self.subTest(stage=stage):
+                self.assertEqual(
+                    BoltStageScheduler.get_stage_pool(stage), expected_pool
+                )
+
+    def test_from_config(self) -> None:
+        scheduler = BoltStageScheduler.from_config({"pid": 4, "COMPUTE": 2})
+        self.assertEqual(
+            scheduler.pool_sizes, {BoltStagePool.PID: 4, BoltStagePool.COMPUTE: 2}
+        )
+
+    async def test_stage_slots_are_limited_by_pool(self) -> None:
+        scheduler = BoltStageScheduler({BoltStagePool.PID: 2, BoltStagePool.COMPUTE: 1})
+        running = Counter()
+        max_running = Counter()
+
+        async def run_stage(stage: PrivateComputationBaseStageFlow) -> None:
+            pool = scheduler.get_stage_pool(stage)
+            async with scheduler.stage_slot(stage):
+                running[pool] += 1
+                max_running[pool] = max(max_running[pool], running[pool])
+                await asyncio.sleep(0.01)
+                running[pool] -= 1
+
+        await asyncio.gather(
+            *(run_stage(PrivateComputationStageFlow.ID_MATCH) for _ in range(5)),
+            *(run_stage(PrivateComputationStageFlow.COMPUTE) for _ in range(5)),
+            *(run_stage(PrivateComputationStageFlow.AGGREGATE) for _ in range(5)),
+        )
+
+        self.assertEqual(
+            max_running,
+            {
+                BoltStagePool.PID: 2,
+                BoltStagePool.COMPUTE: 1,
+                # pools without a size are not limited
+                BoltStagePool.AGGREGATION: 5,
+            },
+        )
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from fbpcs.bolt.bolt_status_notifier import BoltStatusNotifier, FileBoltStatusNotifier
+
+
+class TestBoltStatusNotifier(unittest.IsolatedAsyncioTestCase):
+    async def test_notify_wakes_up_waiter(self) -> None:
+        notifier = BoltStatusNotifier()
+        asyncio.get_running_loop().call_later(0.01, notifier.notify, "id2")
+
+        start = time.time()
+        notified = await notifier.wait(["id1", "id2"], timeout=10)
+
+        self.assertTrue(notified)
+        self.assertLess(time.time() - start, 5)
+
+    async def test_wait_timeout(self) -> None:
+        notifier = BoltStatusNotifier()
+        notifier.notify("other_id")
+
+        self.assertFalse(await notifier.wait(["id1"], timeout=0.01))
+
+    async def test_notification_between_waits(self) -> None:
+        notifier = BoltStatusNotifier()
+        notifier.notify("id1")
+
+        self.assertTrue(await notifier.wait(["id1"], timeout=10))
+        # the notification was consumed
+        self.assertFalse(await notifier.wait(["id1"], timeout=0.01))
+
+    async def test_notifications_are_bounded(self) -> None:
+        notifier = BoltStatusNotifier(max_pending=2)
+        for instance_id in ("id1", "id2", "id3"):
+            notifier.notify(instance_id)
+
+        # the oldest notification nobody waited on was dropped
+        self.assertFalse(await notifier.wait(["id1"], timeout=0.01))
+        self.assertTrue(await notifier.wait(["id2", "id3"], timeout=10))
+        # the events are dropped once their waiters are done
+        self.assertEqual(len(notifier._events), 0)
+
+    async def test_file_notification(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            notifier = FileBoltStatusNotifier(directory, check_interval=0.01)
+
+            def touch() -> None:
+                open(os.path.join(directory, "id1"), "w").close()
+
+            asyncio.get_running_loop().call_later(0.02, touch)
+
+            self.assertTrue(await notifier.wait(["id1"], timeout=10))
+            self.assertFalse(os.path.exists(os.path.join(directory, "id1")))
+            self.assertFalse(await notifier.wait(["id1"], timeout=0.02))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import unittest
+from typing import Dict, List
+from unittest import mock
+
+from fbpcs.bolt.bolt_client import BoltState
+from fbpcs.bolt.bolt_status_poller import BoltStatusPoller
+from fbpcs.private_computation.entity.private_computation_status import (
+    PrivateComputationInstanceStatus,
+)
+
+
+class TestBoltStatusPoller(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.batches: List[List[str]] = []
+
+        async def update_instances(instance_ids: List[str]) -> Dict[str, BoltState]:
+            self.batches.append(instance_ids)
+            return {
+                instance_id: BoltState(PrivateComputationInstanceStatus.CREATED)
+                for instance_id in instance_ids
+                if instance_id != "missing_id"
+            }
+
+        self.mock_client = mock.MagicMock()
+        self.mock_client.update_instances = mock.AsyncMock(side_effect=update_instances)
+        self.mock_client.update_instance = mock.AsyncMock(
+            side_effect=RuntimeError("not found")
+        )
+        self.poller = BoltStatusPoller(self.mock_client)
+
+    async def test_waiters_share_a_batched_poll(self) -> None:
+        states = await asyncio.gather(
+            *(self.poller.update_instance(f"id{i}") for i in range(10)),
+            self.poller.update_instance("id0"),
+        )
+
+        self.assertEqual(len(states), 11)
+        self.assertTrue(
+            all(
+                state.pc_instance_status is PrivateComputationInstanceStatus.CREATED
+                for state in states
+            )
+        )
+        # one request for all of the waiters, each instance polled once
+        self.assertEqual(self.batches, [[f"id{i}" for i in range(10)]])
+        self.mock_client.update_instance.assert_not_called()
+
+    async def test_polls_once_per_tick(self) -> None:
+        async def wait(instance_id: str) -> None:
+            for _ in range(3):
+                await self.poller.update_instance(instance_id)
+
+        await asyncio.gather(wait("id0"), wait("id1"), wait("id2"))
+
+        self.assertEqual(len(self.batches), 3)
+        self.assertTrue(
+            all(sorted(batch) == ["id0", "id1", "id2"] for batch in self.batches)
+        )
+
+    async def test_waiter_during_a_poll_gets_the_next_poll(self) -> None:
+        first_poll_started = asyncio.Event()
+        finish_first_poll = asyncio.Event()
+        update_instances = self.mock_client.update_instances.side_effect
+
+        async def slow_update_instances(
+            instance_ids: List[str],
+        ) -> Dict[str, BoltState]:
+            if not first_poll_started.is_set():
+                first_poll_started.set()
+                await finish_first_poll.wait()
+            return await update_instances(instance_ids)
+
+        self.mock_client.update_instances.side_effect = slow_update_instances
+        first_waiter = asyncio.create_task(self.poller.update_instance("id0"))
+        await first_poll_started.wait()
+        second_waiter = asyncio.create_task(self.poller.update_instance("id1"))
+        finish_first_poll.set()
+
+        # the second poll starts as soon as the first one is done
+        await asyncio.wait_for(asyncio.gather(first_waiter, second_waiter), 1)
+        self.assertEqual(self.batches, [["id0"], ["id1"]])
+
+    async def test_missing_instance_raises_its_error(self) -> None:
+        state, error = await asyncio.gather(
+            self.poller.update_instance("id0"),
+            self.poller.update_instance("missing_id"),
+            return_exceptions=True,
+        )
+
+        self.assertIsInstance(state, BoltState)
+        self.assertIsInstance(error, RuntimeError)
+        self.mock_client.update_instance.assert_called_once_with(
+            instance_id="missing_id"
+        )
+
+    async def test_failed_batch_falls_back_to_update_instance(self) -> None:
+        self.mock_client.update_instances.side_effect = RuntimeError("bad request")
+        self.mock_client.update_instance.side_effect = None
+        self.mock_client.update_instance.return_value = BoltState(
+            PrivateComputationInstanceStatus.CREATED
+        )
+
+        states = await asyncio.gather(
+            self.poller.update_instance("id0"), self.poller.update_instance("id1")
+        )
+
+        self.assertEqual(len(states), 2)
+        self.assertEqual(self.mock_client.update_instance.call_count, 2)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from fbpcs.bolt.bolt_job_summary import BoltJobSummary, BoltMetric, BoltMetricType
+from fbpcs.bolt.bolt_summary import BoltSummary
+from fbpcs.bolt.bolt_summary_exporter import (
+    format_metric_percentiles,
+    get_chrome_trace,
+    get_metric_percentiles,
+    get_percentile,
+    write_chrome_trace,
+)
+from fbpcs.private_computation.entity.infra_config import PrivateComputationRole
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class TestBoltSummaryExporter(TestCase):
+    def setUp(self) -> None:
+        self.stage = PrivateComputationStageFlow.ID_MATCH
+        self.summary = BoltSummary(
+            job_summaries=[
+                BoltJobSummary(
+                    job_name=f"job{i}",
+                    publisher_instance_id=f"publisher{i}",
+                    partner_instance_id=f"partner{i}",
+                    is_success=True,
+                    bolt_metrics=[
+                        BoltMetric(BoltMetricType.JOB_QUEUE_DEPTH, i, start_time=100),
+                        BoltMetric(
+                            BoltMetricType.STAGE_WAIT_FOR_COMPLETED,
+                            i,
+                            self.stage,
+                            start_time=100,
+                        ),
+                        BoltMetric(
+                            BoltMetricType.PLAYER_STAGE_START_UP_TIME,
+                            1,
+                            self.stage,
+                            PrivateComputationRole.PARTNER,
+                            start_time=101,
+                        ),
+                        BoltMetric(BoltMetricType.JOB_RUN_TIME, 10),
+                    ],
+                )
+                for i in range(1, 101)
+            ]
+        )
+
+    def test_get_percentile(self) -> None:
+        values = list(range(1, 11))
+        self.assertEqual(get_percentile(values, 50), 5)
+        self.assertEqual(get_percentile(values, 95), 10)
+        self.assertEqual(get_percentile(values, 0), 1)
+
+    def test_get_metric_percentiles(self) -> None:
+        # a retry adds up with the first try
+        self.summary.job_summaries[0].bolt_metrics.append(
+            BoltMetric(BoltMetricType.STAGE_WAIT_FOR_COMPLETED, 1, self.stage)
+        )
+
+        percentiles = get_metric_percentiles([self.summary])
+
+        # the queue depth is not a duration
+        self.assertEqual(
+            [row.metric_type for row in percentiles],
+            [
+                BoltMetricType.STAGE_WAIT_FOR_COMPLETED,
+                BoltMetricType.PLAYER_STAGE_START_UP_TIME,
+                BoltMetricType.JOB_RUN_TIME,
+            ],
+        )
+        wait = percentiles[0]
+        self.assertEqual(wait.stage_name, "ID_MATCH")
+        self.assertIsNone(wait.role)
+        self.assertEqual(wait.count, 100)
+        self.assertEqual(wait.p50, 50)
+        self.assertEqual(wait.p95, 95)
+        self.assertEqual(wait.max, 100)
+        self.assertIs(percentiles[1].role, PrivateComputationRole.PARTNER)
+        self.assertIsNone(percentiles[2].stage_name)
+
+        table = format_metric_percentiles(percentiles).splitlines()
+        self.assertEqual(len(table), 4)
+        self.assertEqual(
+            table[0].split(), ["stage", "metric", "role", "count", "p50", "p95", "max"]
+        )
+        self.assertEqual(
+            table[1].split(),
+            [
+                "ID_MATCH",
+                "STAGE_WAIT_FOR_COMPLETED",
+                "-",
+                "100",
+                "50.00",
+                "95.00",
+                "100.00",
+            ],
+        )
+
+    def test_get_chrome_trace(self) -> None:
+        trace = get_chrome_trace([self.summary, self.summary])
+
+        events = trace["traceEvents"]
+        metadata = [event for event in events if event["ph"] == "M"]
+        self.assertEqual(len(metadata), 2 + 2 * 100)
+        self.assertEqual(metadata[1]["args"], {"name": "job1"})
+        # JOB_RUN_TIME has no start time
+        slices = [event for event in events if event["ph"] == "X"]
+        self.assertEqual(len(slices), 2 * 2 * 100)
+        self.assertEqual(
+            slices[0],
+            {
+                "name": "ID_MATCH STAGE_WAIT_FOR_COMPLETED",
+                "cat": "stage",
+                "ph": "X",
+                "ts": 100e6,
+                "dur": 1e6,
+                "pid": 1,
+                "tid": 1,
+                "args": {"stage": "ID_MATCH", "role": None},
+            },
+        )
+        self.assertEqual(
+            slices[1]["name"], "ID_MATCH PLAYER_STAGE_START_UP_TIME (PARTNER)"
+        )
+        counters = [event for event in events if event["ph"] == "C"]
+        self.assertEqual(len(counters), 2 * 100)
+        self.assertEqual(counters[0]["args"], {"value": 1})
+
+    def test_write_chrome_trace(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "trace.json")
+            write_chrome_trace([self.summary], path)
+            with open(path) as f:
+                self.assertEqual(json.load(f), get_chrome_trace([self.summary]))
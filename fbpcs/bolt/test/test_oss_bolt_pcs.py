@@ -5,6 +5,8 @@
 # LICENSE file in the root directory of this source tree.
 
 
+import asyncio
+import time
 import unittest
 from collections import defaultdict
 from typing import Optional, Set
@@ -206,6 +208,104 @@ class TestBoltPCSClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual("test_cert", return_state.issuer_certificate)
         self.assertEqual(["domain.test"], return_state.server_hostnames)
 
+    @mock.patch(
+        "fbpcs.private_computation.service.private_computation.PrivateComputationService.update_instance"
+    )
+    async def test_update_instances(self, mock_update) -> None:
+        test_instance = self._get_test_instance()
+
+        def update_instance(instance_id: str) -> PrivateComputationInstance:
+            if instance_id == "missing_id":
+                raise RuntimeError("not found")
+            return test_instance
+
+        mock_update.side_effect = update_instance
+        states = await self.bolt_pcs_client.update_instances(
+            [self.test_instance_id, "missing_id"]
+        )
+
+        # the instance that failed to update is left out
+        self.assertEqual(list(states), [self.test_instance_id])
+        self.assertEqual(
+            states[self.test_instance_id].pc_instance_status,
+            PrivateComputationInstanceStatus.CREATED,
+        )
+        self.assertEqual(["10.0.10.242"], states[self.test_instance_id].server_ips)
+
+    @mock.patch(
+        "fbpcs.private_computation.service.private_computation.PrivateComputationService.update_instance"
+    )
+    async def test_update_instances_shares_reads(self, mock_update) -> None:
+        test_instance = self._get_test_instance()
+
+        def update_instance(instance_id: str) -> PrivateComputationInstance:
+            time.sleep(0.05)
+            return test_instance
+
+        mock_update.side_effect = update_instance
+        state, states = await asyncio.gather(
+            self.bolt_pcs_client.update_instance(instance_id=self.test_instance_id),
+            self.bolt_pcs_client.update_instances([self.test_instance_id]),
+        )
+
+        self.assertEqual(states, {self.test_instance_id: state})
+        mock_update.assert_called_once_with(self.test_instance_id)
+
+    @mock.patch(
+        "fbpcs.private_computation.service.private_computation.PrivateComputationService.update_instance"
+    )
+    async def test_update_instance_coalesces_concurrent_updates(
+        self, mock_update
+    ) -> None:
+        test_instance = self._get_test_instance()
+
+        def update_instance(instance_id: str) -> PrivateComputationInstance:
+            time.sleep(0.05)
+            return test_instance
+
+        mock_update.side_effect = update_instance
+        states = await asyncio.gather(
+            *(
+                self.bolt_pcs_client.update_instance(instance_id=self.test_instance_id)
+                for _ in range(5)
+            )
+        )
+
+        self.assertEqual(len(states), 5)
+        mock_update.assert_called_once_with(self.test_instance_id)
+
+        # a poll past the staleness window reads the instance again
+        self.bolt_pcs_client.state_staleness = 0
+        await self.bolt_pcs_client.update_instance(instance_id=self.test_instance_id)
+        self.assertEqual(mock_update.call_count, 2)
+
+    @mock.patch(
+        "fbpcs.private_computation.service.private_computation.PrivateComputationService.get_instance"
+    )
+    @mock.patch(
+        "fbpcs.private_computation.service.private_computation.PrivateComputationService.update_instance"
+    )
+    async def test_instance_cache(self, mock_update, mock_get_instance) -> None:
+        test_instance = self._get_test_instance()
+        mock_update.return_value = test_instance
+        mock_get_instance.return_value = test_instance
+
+        await self.bolt_pcs_client.update_instance(instance_id=self.test_instance_id)
+        self.assertTrue(
+            await self.bolt_pcs_client.has_feature(
+                self.test_instance_id, PCSFeature.PCS_DUMMY
+            )
+        )
+        await self.bolt_pcs_client.get_stage_flow(self.test_instance_id)
+        # served from the instance read by update_instance
+        mock_get_instance.assert_not_called()
+
+        self.bolt_pcs_client.instance_cache_ttl = 0
+        await self.bolt_pcs_client.has_feature(
+            self.test_instance_id, PCSFeature.PCS_DUMMY
+        )
+        mock_get_instance.assert_called_once_with(self.test_instance_id)
+
     @mock.patch(
         "fbpcs.private_computation.service.private_computation.PrivateComputationService.validate_metrics"
     )
@@ -270,6 +370,18 @@ class TestBoltPCSClient(unittest.IsolatedAsyncioTestCase):
                 )
                 self.assertEqual(expected_result, actual_result)
 
+    async def test_close(self) -> None:
+        await self.bolt_pcs_client.create_instance(self.bolt_instance_args)
+        self.bolt_pcs_client.close()
+
+        with self.assertRaises(RuntimeError):
+            self.bolt_pcs_client.executor.submit(time.time)
+
+        # a given executor is left to its owner
+        executor = mock.MagicMock()
+        BoltPCSClient(self.bolt_pcs_client.pcs, executor=executor).close()
+        executor.shutdown.assert_not_called()
+
     def _get_test_instance(
         self, features: Optional[Set[PCSFeature]] = None
     ) -> PrivateComputationInstance:
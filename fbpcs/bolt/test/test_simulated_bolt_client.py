@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import unittest
+
+from fbpcs.bolt.simulated_bolt_client import (
+    SimulatedBoltClient,
+    SimulatedBoltClientConfig,
+    SimulatedBoltCreateInstanceArgs,
+    SimulatedThrottlingError,
+)
+from fbpcs.private_computation.entity.private_computation_status import (
+    PrivateComputationInstanceStatus,
+)
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+
+class TestSimulatedBoltClient(unittest.IsolatedAsyncioTestCase):
+    async def test_stage_completes_after_its_duration(self) -> None:
+        client = SimulatedBoltClient(
+            SimulatedBoltClientConfig(
+                stage_durations={"PC_PRE_VALIDATION": 0.05}, state_staleness=0
+            )
+        )
+        instance_id = await client.create_instance(
+            SimulatedBoltCreateInstanceArgs(instance_id="id")
+        )
+        self.assertIs(
+            await client.get_stage_flow(instance_id), PrivateComputationStageFlow
+        )
+        self.assertIs(
+            (await client.update_instance(instance_id)).pc_instance_status,
+            PrivateComputationInstanceStatus.CREATED,
+        )
+
+        await client.run_stage(instance_id)
+
+        self.assertIs(
+            (await client.update_instance(instance_id)).pc_instance_status,
+            PrivateComputationInstanceStatus.PC_PRE_VALIDATION_STARTED,
+        )
+        await asyncio.sleep(0.05)
+        self.assertIs(
+            (await client.update_instances([instance_id]))[
+                instance_id
+            ].pc_instance_status,
+            PrivateComputationInstanceStatus.PC_PRE_VALIDATION_COMPLETED,
+        )
+        self.assertEqual(client.request_counts["update_instance"], 2)
+        self.assertEqual(client.request_counts["update_instances"], 1)
+
+    async def test_stage_failure(self) -> None:
+        client = SimulatedBoltClient(
+            SimulatedBoltClientConfig(default_stage_duration=0, stage_failure_rate=1)
+        )
+        await client.create_instance(SimulatedBoltCreateInstanceArgs(instance_id="id"))
+
+        await client.run_stage("id", PrivateComputationStageFlow.PC_PRE_VALIDATION)
+
+        self.assertIs(
+            (await client.update_instance("id")).pc_instance_status,
+            PrivateComputationInstanceStatus.PC_PRE_VALIDATION_FAILED,
+        )
+
+    async def test_joint_stage_has_server_ips_while_started(self) -> None:
+        client = SimulatedBoltClient(SimulatedBoltClientConfig(state_staleness=0))
+        await client.create_instance(SimulatedBoltCreateInstanceArgs(instance_id="id"))
+
+        await client.run_stage("id", PrivateComputationStageFlow.ID_MATCH)
+
+        self.assertIsNotNone((await client.update_instance("id")).server_ips)
+        await client.cancel_current_stage("id")
+        state = await client.update_instance("id")
+        self.assertIs(
+            state.pc_instance_status,
+            PrivateComputationInstanceStatus.ID_MATCHING_FAILED,
+        )
+        self.assertIsNone(state.server_ips)
+
+    async def test_missing_instance(self) -> None:
+        client = SimulatedBoltClient()
+
+        self.assertFalse(
+            await client.is_existing_instance(
+                SimulatedBoltCreateInstanceArgs(instance_id="id")
+            )
+        )
+        self.assertEqual(await client.update_instances(["id"]), {})
+
+    async def test_throttling(self) -> None:
+        client = SimulatedBoltClient(SimulatedBoltClientConfig(throttle_rate=1))
+
+        with self.assertRaises(SimulatedThrottlingError):
+            await client.has_feature("id", None)
+        self.assertEqual(client.throttled_requests, 1)
+
+    async def test_rate_limit(self) -> None:
+        client = SimulatedBoltClient(
+            SimulatedBoltClientConfig(max_requests_per_second=2)
+        )
+
+        results = await asyncio.gather(
+            *(client.validate_results("id") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(results[:2], [True, True])
+        self.assertIsInstance(results[2], SimulatedThrottlingError)
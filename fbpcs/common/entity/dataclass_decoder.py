@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+from dataclasses import fields, is_dataclass, MISSING
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, get_type_hints, List, Tuple, Type, Union
+
+Decoder = Callable[[Any], Any]
+
+# the key dataclasses_json adds to a dataclass serialized as a member of a Union
+UNION_TYPE_KEY = "__type"
+
+
+@lru_cache(maxsize=None)
+def get_dataclass_decoder(cls: Type[Any]) -> Decoder:
+    """Gets a decoder of the dicts that the dataclasses_json schema of cls dumps
+
+    The decoder is built once per class from its type hints, and builds the
+    dataclass in a single pass over the dict, without validating it like the
+    marshmallow schema does. The keys that are not fields of the dataclasses are
+    ignored, as the schema does for the keys it prunes. Decoding malformed data
+    raises, but is not guaranteed to, so that the decoder is meant for data
+    that the schema dumped, with the schema as the fallback.
+
+    Raises:
+        TypeError: a field of cls has a type the decoder doesn't support
+    """
+    return _get_decoder(cls)
+
+
+def _get_decoder(tp: Any) -> Decoder:
+    if tp is Any or tp in (str, bool):
+        return _identity
+    if tp in (int, float):
+        return tp
+    if isinstance(tp, type) and issubclass(tp, Enum):
+        return tp
+    if is_dataclass(tp):
+        return _get_dataclass_fields_decoder(tp)
+
+    origin = getattr(tp, "__origin__", None)
+    args = getattr(tp, "__args__", ())
+    if origin is Union:
+        return _get_union_decoder(args)
+    if origin in (list, set):
+        item_decoder = _get_decoder(args[0])
+        if item_decoder is _identity:
+            return origin
+        return lambda value: origin(item_decoder(item) for item in value)
+    if origin is dict and args[0] is str:
+        value_decoder = _get_decoder(args[1])
+        return lambda value: {k: value_decoder(v) for k, v in value.items()}
+    raise TypeError(f"{tp} is not supported")
+
+
+def _get_union_decoder(args: Tuple[Any, ...]) -> Decoder:
+    is_optional = type(None) in args
+    members = [arg for arg in args if arg is not type(None)]
+    if len(members) == 1:
+        member_decoder = _get_decoder(members[0])
+    elif all(is_dataclass(member) for member in members):
+        decoders = {member.__name__: _get_decoder(member) for member in members}
+
+        def member_decoder(value: Dict[str, Any]) -> Any:
+            return decoders[value[UNION_TYPE_KEY]](value)
+
+    else:
+        raise TypeError(f"Union of {args} is not supported")
+
+    if not is_optional:
+        return member_decoder
+    return lambda value: None if value is None else member_decoder(value)
+
+
+def _get_dataclass_fields_decoder(cls: Type[Any]) -> Decoder:
+    types = get_type_hints(cls)
+    init_fields: List[Tuple[str, Decoder, bool]] = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        overrides = f.metadata.get("dataclasses_json", {})
+        if "letter_case" in overrides:
+            raise TypeError(f"{cls.__name__}.{f.name} has a letter case override")
+        decoder = overrides.get("decoder") or _get_decoder(types[f.name])
+        has_default = f.default is not MISSING or f.default_factory is not MISSING
+        init_fields.append((f.name, decoder, has_default))
+
+    def decode(value: Dict[str, Any]) -> Any:
+        kwargs = {}
+        for name, decoder, has_default in init_fields:
+            if name in value:
+                field_value = value[name]
+                kwargs[name] = None if field_value is None else decoder(field_value)
+            elif not has_default:
+                raise KeyError(f"{cls.__name__}.{name} is missing")
+        return cls(**kwargs)
+
+    return decode
+
+
+def _identity(value: Any) -> Any:
+    return value
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from fbpcs.common.entity.instance_base import InstanceBase
+
+# Number of deltas appended to an instance before they are compacted into its snapshot
+DEFAULT_COMPACTION_THRESHOLD = 100
+# Number of instances whose last written state is kept in memory to compute deltas
+DEFAULT_CACHE_SIZE = 128
+DELTAS_SUFFIX = ".deltas"
+
+
+@dataclass
+class _InstanceState:
+    value: Dict[str, Any]
+    num_deltas: int
+    # the (snapshot inode, snapshot mtime, snapshot size, deltas size) the value was read or written at
+    version: Tuple[int, int, int, int]
+
+
+class LocalDeltaInstanceRepository:
+    """Stores each instance as a snapshot and an append-only log of deltas
+
+    An update appends the difference between the instance and its last written
+    state to <instance_id>.deltas, instead of rewriting the whole instance. A
+    list that only grew, e.g. status_updates, is written from its first changed
+    item. Once there are compaction_threshold deltas, or more bytes of deltas
+    than of snapshot, they are compacted into a new snapshot. A read rebuilds
+    the instance from its snapshot and the deltas after it.
+
+    The snapshot has the format of LocalInstanceRepository, so that instances
+    it created can be read and updated. Each delta records the snapshot it
+    applies to, so that the deltas left by a compaction interrupted before
+    removing them are ignored. A partial last delta, left by an interrupted
+    write, is skipped on read and truncated before the next delta is appended.
+    """
+
+    def __init__(
+        self,
+        base_dir: str,
+        compaction_threshold: int = DEFAULT_COMPACTION_THRESHOLD,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.base_dir = Path(base_dir)
+        self.compaction_threshold = compaction_threshold
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, _InstanceState]" = OrderedDict()
+        # the cache is shared by the threads using the repository
+        self._cache_lock = threading.Lock()
+
+    def create(self, instance: InstanceBase) -> None:
+        instance_id = instance.get_instance_id()
+        if self._exist(instance_id):
+            raise RuntimeError(f"{instance_id} already exists")
+
+        self._write_snapshot(instance_id, json.loads(instance.dumps_schema()))
+
+    def read(self, instance_id: str) -> str:
+        if not self._exist(instance_id):
+            raise RuntimeError(f"{instance_id} does not exist")
+
+        return json.dumps(self._get_state(instance_id).value)
+
+    def update(self, instance: InstanceBase) -> None:
+        instance_id = instance.get_instance_id()
+        if not self._exist(instance_id):
+            raise RuntimeError(f"{instance_id} does not exist")
+
+        state = self._get_state(instance_id)
+        new_value = json.loads(instance.dumps_schema())
+        delta = _get_delta(state.value, new_value)
+        if delta is None:
+            return
+
+        _, _, snapshot_size, deltas_size = state.version
+        if (
+            state.num_deltas + 1 >= self.compaction_threshold
+            or deltas_size > snapshot_size
+        ):
+            self._write_snapshot(instance_id, new_value)
+            return
+
+        entry = {"snapshot": list(state.version[:3]), "delta": delta}
+        deltas_path = self._get_deltas_path(instance_id)
+        _truncate_partial_line(deltas_path)
+        with open(deltas_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._set_state(
+            instance_id,
+            _InstanceState(
+                new_value, state.num_deltas + 1, self._get_version(instance_id)
+            ),
+        )
+
+    def delete(self, instance_id: str) -> None:
+        if not self._exist(instance_id):
+            raise RuntimeError(f"{instance_id} does not exist")
+
+        with self._cache_lock:
+            self._cache.pop(instance_id, None)
+        self._get_deltas_path(instance_id).unlink(missing_ok=True)
+        self.base_dir.joinpath(instance_id).unlink()
+
+    def get_version(self, instance_id: str) -> str:
+        if not self._exist(instance_id):
+            raise RuntimeError(f"{instance_id} does not exist")
+
+        return "-".join(str(n) for n in self._get_version(instance_id))
+
+    def _exist(self, instance_id: str) -> bool:
+        return self.base_dir.joinpath(instance_id).exists()
+
+    def _get_deltas_path(self, instance_id: str) -> Path:
+        return self.base_dir.joinpath(instance_id + DELTAS_SUFFIX)
+
+    def _get_version(self, instance_id: str) -> Tuple[int, int, int, int]:
+        snapshot_stat = self.base_dir.joinpath(instance_id).stat()
+        try:
+            deltas_size = self._get_deltas_path(instance_id).stat().st_size
+        except FileNotFoundError:
+            deltas_size = 0
+        return (
+            snapshot_stat.st_ino,
+            snapshot_stat.st_mtime_ns,
+            snapshot_stat.st_size,
+            deltas_size,
+        )
+
+    def _get_state(self, instance_id: str) -> _InstanceState:
+        version = self._get_version(instance_id)
+        with self._cache_lock:
+            state = self._cache.get(instance_id)
+        # another writer may have updated the instance since it was cached
+        if state is None or state.version != version:
+            state = self._load_state(instance_id, version)
+        self._set_state(instance_id, state)
+        return state
+
+    def _load_state(
+        self, instance_id: str, version: Tuple[int, int, int, int]
+    ) -> _InstanceState:
+        with open(self.base_dir.joinpath(instance_id), "r") as f:
+            value = json.loads(f.read())
+        num_deltas = 0
+        try:
+            with open(self._get_deltas_path(instance_id), "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the last delta of an interrupted write
+                        continue
+                    if tuple(entry["snapshot"]) != version[:3]:
+                        continue
+                    value = _apply_delta(value, entry["delta"])
+                    num_deltas += 1
+        except FileNotFoundError:
+            pass
+        return _InstanceState(value, num_deltas, version)
+
+    def _set_state(self, instance_id: str, state: _InstanceState) -> None:
+        with self._cache_lock:
+            self._cache[instance_id] = state
+            self._cache.move_to_end(instance_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _write_snapshot(self, instance_id: str, value: Dict[str, Any]) -> None:
+        path = self.base_dir.joinpath(instance_id)
+        tmp_path = self.base_dir.joinpath(f".{instance_id}.tmp")
+        with open(tmp_path, "w") as f:
+            f.write(json.dumps(value))
+        # readers see either the old or the new snapshot, never a partial one
+        os.replace(tmp_path, path)
+        self._get_deltas_path(instance_id).unlink(missing_ok=True)
+        self._set_state(
+            instance_id, _InstanceState(value, 0, self._get_version(instance_id))
+        )
+
+
+def _truncate_partial_line(path: Path) -> None:
+    """Removes the partial last line of an interrupted write, if there is one
+
+    Otherwise the next line would be appended to it, and both would be lost.
+    """
+    try:
+        with open(path, "rb+") as f:
+            content = f.read()
+            if content and not content.endswith(b"\n"):
+                f.truncate(content.rfind(b"\n") + 1)
+    except FileNotFoundError:
+        pass
+
+
+def _get_delta(old: Any, new: Any) -> Optional[Dict[str, Any]]:
+    """Gets the delta that turns old into new, or None if they are equal
+
+    A delta is one of:
+        - {"set": value}: the value is replaced
+        - {"fields": {key: delta}, "unset": [key]}: the keys of a dict are updated
+        - {"keep": n, "extend": [item]}: a list keeps its first n items, followed by the new items
+    """
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        fields = {}
+        for key, value in new.items():
+            field_delta = _get_delta(old[key], value) if key in old else {"set": value}
+            if field_delta is not None:
+                fields[key] = field_delta
+        delta: Dict[str, Any] = {"fields": fields}
+        unset = [key for key in old if key not in new]
+        if unset:
+            delta["unset"] = unset
+        return delta
+    if isinstance(old, list) and isinstance(new, list):
+        keep = 0
+        for old_item, new_item in zip(old, new):
+            if old_item != new_item:
+                break
+            keep += 1
+        return {"keep": keep, "extend": new[keep:]}
+    return {"set": new}
+
+
+def _apply_delta(value: Any, delta: Dict[str, Any]) -> Any:
+    if "set" in delta:
+        return delta["set"]
+    if "fields" in delta:
+        new_value = dict(value)
+        for key, field_delta in delta["fields"].items():
+            new_value[key] = _apply_delta(new_value.get(key), field_delta)
+        for key in delta.get("unset", []):
+            new_value.pop(key, None)
+        return new_value
+    items: List[Any] = value[: delta["keep"]]
+    return items + delta["extend"]
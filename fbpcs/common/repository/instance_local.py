@@ -45,5 +45,12 @@ class LocalInstanceRepository:
 
         self.base_dir.joinpath(instance_id).unlink()
 
+    def get_version(self, instance_id: str) -> str:
+        if not self._exist(instance_id):
+            raise RuntimeError(f"{instance_id} does not exist")
+
+        stat = self.base_dir.joinpath(instance_id).stat()
+        return f"{stat.st_ino}-{stat.st_mtime_ns}-{stat.st_size}"
+
     def _exist(self, instance_id: str) -> bool:
         return self.base_dir.joinpath(instance_id).exists()
@@ -0,0 +1,90 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import unittest
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Dict, List, Optional, Set, Union
+
+from dataclasses_json import dataclass_json
+from fbpcs.common.entity.dataclass_decoder import get_dataclass_decoder
+
+
+class DummyStatus(Enum):
+    STARTED = "STARTED"
+    COMPLETED = "COMPLETED"
+
+
+@dataclass_json
+@dataclass
+class DummyContainer:
+    instance_id: str
+    status: DummyStatus = DummyStatus.STARTED
+
+
+@dataclass_json
+@dataclass
+class DummyPCSContainer(DummyContainer):
+    log_url: Optional[str] = None
+
+
+@dataclass_json
+@dataclass
+class DummyInstance:
+    instance_id: str
+    containers: List[Union[DummyPCSContainer, DummyContainer]]
+    statuses: Set[DummyStatus] = field(default_factory=set)
+    counts: Dict[str, int] = field(default_factory=dict)
+    server_uris: Optional[List[str]] = None
+    ratio: float = 0.5
+
+
+@dataclass_json
+@dataclass
+class DummyTimedInstance:
+    start_time: datetime
+
+
+class TestDataclassDecoder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.instance = DummyInstance(
+            instance_id="id",
+            containers=[
+                DummyContainer("c1"),
+                DummyPCSContainer("c2", DummyStatus.COMPLETED, log_url="url"),
+            ],
+            statuses={DummyStatus.STARTED},
+            counts={"a": 1},
+            server_uris=["uri"],
+            ratio=1,
+        )
+
+    def test_decode(self) -> None:
+        # pyre-ignore[16] Undefined attribute
+        value = DummyInstance.schema().dump(self.instance)
+
+        decoded = get_dataclass_decoder(DummyInstance)(value)
+
+        self.assertEqual(decoded, self.instance)
+        self.assertEqual(type(decoded.containers[1]), DummyPCSContainer)
+        self.assertEqual(type(decoded.ratio), float)
+
+    def test_defaults_and_unknown_keys(self) -> None:
+        decoded = get_dataclass_decoder(DummyInstance)(
+            {"instance_id": "id", "containers": [], "deleted_field": 1}
+        )
+
+        self.assertEqual(decoded, DummyInstance(instance_id="id", containers=[]))
+
+    def test_missing_field(self) -> None:
+        with self.assertRaises(KeyError):
+            get_dataclass_decoder(DummyInstance)({"instance_id": "id"})
+
+    def test_unsupported_type(self) -> None:
+        with self.assertRaises(TypeError):
+            get_dataclass_decoder(DummyTimedInstance)
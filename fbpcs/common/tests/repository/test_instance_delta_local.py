@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import json
+import os
+import tempfile
+import unittest
+
+from fbpcp.entity.container_instance import ContainerInstance, ContainerInstanceStatus
+from fbpcs.common.entity.stage_state_instance import (
+    StageStateInstance,
+    StageStateInstanceStatus,
+)
+from fbpcs.common.repository.instance_delta_local import LocalDeltaInstanceRepository
+from fbpcs.common.repository.instance_local import LocalInstanceRepository
+
+TEST_INSTANCE_ID = "test-instance-id"
+
+
+class TestLocalDeltaInstanceRepository(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmpdir.name
+        self.snapshot_path = os.path.join(self.base_dir, TEST_INSTANCE_ID)
+        self.deltas_path = self.snapshot_path + ".deltas"
+        self.repo = LocalDeltaInstanceRepository(self.base_dir)
+        self.instance = StageStateInstance(
+            instance_id=TEST_INSTANCE_ID,
+            stage_name="compute",
+            containers=[
+                ContainerInstance(
+                    f"arn{i}", "10.0.0.1", ContainerInstanceStatus.STARTED
+                )
+                for i in range(10)
+            ],
+        )
+        self.repo.create(self.instance)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_create_read_delete(self) -> None:
+        self.assertEqual(self._read(self.repo), self.instance)
+        with self.assertRaisesRegex(RuntimeError, "already exists"):
+            self.repo.create(self.instance)
+
+        self.repo.delete(TEST_INSTANCE_ID)
+
+        with self.assertRaisesRegex(RuntimeError, "does not exist"):
+            self.repo.read(TEST_INSTANCE_ID)
+        with self.assertRaisesRegex(RuntimeError, "does not exist"):
+            self.repo.update(self.instance)
+        with self.assertRaisesRegex(RuntimeError, "does not exist"):
+            self.repo.delete(TEST_INSTANCE_ID)
+
+    def test_update_appends_delta(self) -> None:
+        with open(self.snapshot_path) as f:
+            snapshot = f.read()
+
+        version = self.repo.get_version(TEST_INSTANCE_ID)
+        self.instance.containers[-1].status = ContainerInstanceStatus.COMPLETED
+        self.repo.update(self.instance)
+        self.assertNotEqual(self.repo.get_version(TEST_INSTANCE_ID), version)
+        # an unchanged instance has no delta
+        self.repo.update(self.instance)
+        self.instance.status = StageStateInstanceStatus.COMPLETED
+        self.repo.update(self.instance)
+
+        with open(self.snapshot_path) as f:
+            self.assertEqual(f.read(), snapshot)
+        with open(self.deltas_path) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 2)
+        # only the changed container is written
+        self.assertEqual(
+            entries[0]["delta"]["fields"]["containers"]["keep"],
+            len(self.instance.containers) - 1,
+        )
+        self.assertEqual(
+            entries[1]["delta"], {"fields": {"status": {"set": "COMPLETED"}}}
+        )
+        # a new repository rebuilds the instance from the snapshot and the deltas
+        self.assertEqual(
+            self._read(LocalDeltaInstanceRepository(self.base_dir)), self.instance
+        )
+
+    def test_compaction(self) -> None:
+        repo = LocalDeltaInstanceRepository(self.base_dir, compaction_threshold=3)
+        for i in range(3):
+            self.instance.containers[i].status = ContainerInstanceStatus.COMPLETED
+            repo.update(self.instance)
+
+        self.assertFalse(os.path.exists(self.deltas_path))
+        self.assertEqual(
+            self._read(LocalInstanceRepository(self.base_dir)), self.instance
+        )
+
+    def test_stale_and_partial_deltas_are_skipped(self) -> None:
+        self.instance.containers[0].status = ContainerInstanceStatus.COMPLETED
+        self.repo.update(self.instance)
+        with open(self.deltas_path) as f:
+            stale_delta = f.read()
+        # a compaction interrupted before the deltas are removed
+        LocalInstanceRepository(self.base_dir).update(self.instance)
+        with open(self.deltas_path, "w") as f:
+            f.write(stale_delta)
+        self.instance.containers[0].status = ContainerInstanceStatus.FAILED
+        LocalInstanceRepository(self.base_dir).update(self.instance)
+        with open(self.deltas_path, "a") as f:
+            f.write('{"snapshot": [1, 2, ')
+
+        self.assertEqual(
+            self._read(LocalDeltaInstanceRepository(self.base_dir)), self.instance
+        )
+
+    def test_update_after_a_partial_delta(self) -> None:
+        self.instance.containers[-1].status = ContainerInstanceStatus.COMPLETED
+        self.repo.update(self.instance)
+        # a write interrupted before its newline
+        with open(self.deltas_path, "a") as f:
+            f.write('{"snapshot": [1, 2, ')
+
+        self.instance.containers[-2].status = ContainerInstanceStatus.COMPLETED
+        self.repo.update(self.instance)
+        self.instance.containers[-3].status = ContainerInstanceStatus.COMPLETED
+        self.repo.update(self.instance)
+
+        with open(self.deltas_path) as f:
+            self.assertEqual(len([json.loads(line) for line in f]), 3)
+        self.assertEqual(
+            self._read(LocalDeltaInstanceRepository(self.base_dir)), self.instance
+        )
+
+    def _read(self, repo) -> StageStateInstance:
+        return StageStateInstance.loads_schema(repo.read(TEST_INSTANCE_ID))
@@ -5,6 +5,7 @@
 
 # pyre-strict
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 from fbpcp.error.pcp import PcpError
@@ -19,6 +20,7 @@ from fbpcs.pc_pre_validation.binary_path import (
     S3BinaryPath,
 )
 from fbpcs.pc_pre_validation.constants import (
+    BINARY_FILE_VALIDATOR_MAX_CONCURRENT_CHECKS,
     BINARY_FILE_VALIDATOR_NAME,
     BINARY_INFOS,
     DEFAULT_BINARY_VERSION,
@@ -97,24 +99,39 @@ class BinaryFileValidator(Validator):
         Returns:
             A dictionary, representing the names of inaccessible binaries and the error reasons.
         """
-        details: Dict[str, str] = {}
+        s3_binary_paths = [
+            str(S3BinaryPath(self._repo_path, binary_info, self._binary_version))
+            for binary_info in self._binary_infos
+        ]
+        with ThreadPoolExecutor(
+            max_workers=BINARY_FILE_VALIDATOR_MAX_CONCURRENT_CHECKS
+        ) as executor:
+            # an unexpected error is raised here
+            errors = list(executor.map(self._check_s3_binary, s3_binary_paths))
+
+        return {
+            s3_binary_path: error
+            for s3_binary_path, error in zip(s3_binary_paths, errors)
+            if error
+        }
+
+    def _check_s3_binary(self, s3_binary_path: str) -> Optional[str]:
+        """Check the existence of a s3 binary
 
-        for binary_info in self._binary_infos:
-            s3_binary_path: str = str(
-                S3BinaryPath(self._repo_path, binary_info, self._binary_version)
-            )
-            try:
-                if not self._storage_service.file_exists(s3_binary_path):
-                    details[s3_binary_path] = "binary does not exist"
-            except PcpError as pcp_error:
-                # s3 throws the following error when an access is denied,
-                #    An error occurred (403) when calling the HeadObject operation: Forbidden
-                if "Forbidden" in str(pcp_error):
-                    details[s3_binary_path] = str(pcp_error)
-                else:
-                    # rethrow unexpected error so validation runner will skip this validation with a WARNING message
-                    raise pcp_error
-        return details
+        Returns:
+            The reason the binary is inaccessible, None if it is accessible.
+        """
+        try:
+            if not self._storage_service.file_exists(s3_binary_path):
+                return "binary does not exist"
+        except PcpError as pcp_error:
+            # s3 throws the following error when an access is denied,
+            #    An error occurred (403) when calling the HeadObject operation: Forbidden
+            if "Forbidden" in str(pcp_error):
+                return str(pcp_error)
+            # rethrow unexpected error so validation runner will skip this validation with a WARNING message
+            raise pcp_error
+        return None
 
     def _format_validation_report(self, details: Dict[str, str]) -> ValidationReport:
         """Create a validation report.
@@ -32,6 +32,50 @@ MAX_PARALLELISM: int = 16
 # Smallest chunk size before another worker is added
 MIN_CHUNK_SIZE: int = 10 * 1024 * 1024
 
+# 8 MB
+# Size of the ranged GET requests a streaming worker splits its byte range into
+STREAMING_PART_SIZE_IN_BYTES: int = 8 * 1024 * 1024
+# Number of ranged GET requests each streaming worker keeps in flight
+STREAMING_MAX_CONCURRENT_PARTS: int = 4
+# 64 KB
+# Size of the ranged GET requests reading the line that straddles the end of a byte range
+STREAMING_LINE_TAIL_SIZE_IN_BYTES: int = 64 * 1024
+
+# Suffix of the sidecar object that persists the progress of a streaming validation
+VALIDATION_CHECKPOINT_FILE_SUFFIX = ".pre_validation_checkpoint.json"
+# 64 KB
+# Size of the end of the file that must be unchanged to resume from a checkpoint
+VALIDATION_CHECKPOINT_FINGERPRINT_SIZE_IN_BYTES: int = 64 * 1024
+
+# Suffix of the sidecar object that caches the validation reports of the input file
+VALIDATION_REPORT_CACHE_FILE_SUFFIX = ".pre_validation_report_cache.json"
+# 7 days
+VALIDATION_REPORT_CACHE_TTL_IN_SECONDS: int = 7 * 24 * 60 * 60
+# Reports for different roles and timestamp ranges, beyond which the least recently used is evicted
+VALIDATION_REPORT_CACHE_MAX_ENTRIES: int = 32
+
+# Number of random byte ranges that a sampled validation validates, one in each stratum of the file
+SAMPLING_NUM_SAMPLES: int = 32
+# 1 MB
+SAMPLING_SAMPLE_SIZE_IN_BYTES: int = 1024 * 1024
+# The confidence intervals of the sampled issue rates
+SAMPLING_CONFIDENCE_LEVEL: float = 0.95
+SAMPLING_CONFIDENCE_Z_SCORE: float = 1.96
+
+# Number of input files that the CLI batch mode validates concurrently.
+# Their workers share a single pool of MAX_PARALLELISM processes
+MAX_CONCURRENT_INPUT_FILES: int = 4
+
+# Number of binary existence checks that the binary file validator sends concurrently
+BINARY_FILE_VALIDATOR_MAX_CONCURRENT_CHECKS: int = 8
+
+# How often (in rows) a streaming worker checks STREAMING_DURATION_LIMIT_IN_SECONDS
+STREAMING_DURATION_CHECK_INTERVAL_IN_ROWS: int = 100000
+
+# Number of rows that are parsed into columns and validated together.
+# It must evenly divide STREAMING_DURATION_CHECK_INTERVAL_IN_ROWS
+VALIDATION_BATCH_SIZE_IN_ROWS: int = 10000
+
 ID_FIELD_PREFIX = "id_"
 COHORT_ID_FIELD = "cohort_id"
 CONVERSION_VALUE_FIELD = "conversion_value"
@@ -8,7 +8,3 @@
 
 class InputDataValidationException(Exception):
     pass
-
-
-class TimeoutException(Exception):
-    pass
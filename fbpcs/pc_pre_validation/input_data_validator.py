@@ -19,10 +19,28 @@ Error handling:
 """
 
 import csv
-import sys
+import hashlib
+import json
+import mmap
+import re
+import shutil
 import time
-from multiprocessing import Process, Queue
-from typing import List, Optional, Sequence, Set
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice, repeat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import boto3
 from botocore.client import BaseClient
@@ -31,6 +49,7 @@ from botocore.exceptions import ClientError
 from fbpcp.service.storage_s3 import S3StorageService
 from fbpcp.util.s3path import S3Path
 from fbpcs.pc_pre_validation.constants import (
+    ALL_FIELDS,
     COHORT_ID_FIELD,
     CONVERSION_TIMESTAMP_FIELD,
     ERROR_MESSAGES,
@@ -40,36 +59,128 @@ from fbpcs.pc_pre_validation.constants import (
     INPUT_DATA_TMP_FILE_PATH,
     INPUT_DATA_VALIDATOR_NAME,
     INTEGER_MAX_VALUE,
+    INTEGER_REGEX,
     MAX_PARALLELISM,
     MIN_CHUNK_SIZE,
+    OUT_OF_RANGE_COUNT,
     PA_FIELDS,
     PA_PUBLISHER_FIELDS,
     PL_FIELDS,
     PL_PUBLISHER_FIELDS,
     PRIVATE_ID_DFCA_FIELDS,
+    SAMPLING_CONFIDENCE_LEVEL,
+    SAMPLING_NUM_SAMPLES,
+    SAMPLING_SAMPLE_SIZE_IN_BYTES,
+    STREAMING_DURATION_CHECK_INTERVAL_IN_ROWS,
     STREAMING_DURATION_LIMIT_IN_SECONDS,
+    STREAMING_LINE_TAIL_SIZE_IN_BYTES,
+    STREAMING_MAX_CONCURRENT_PARTS,
+    STREAMING_PART_SIZE_IN_BYTES,
     TIMESTAMP,
     TIMESTAMP_OUT_OF_RANGE_MAX_THRESHOLD,
     TIMESTAMP_REGEX,
     VALID_LINE_ENDING_REGEX,
+    VALIDATION_BATCH_SIZE_IN_ROWS,
+    VALIDATION_CHECKPOINT_FILE_SUFFIX,
+    VALIDATION_CHECKPOINT_FINGERPRINT_SIZE_IN_BYTES,
     VALIDATION_REGEXES,
+    VALIDATION_REPORT_CACHE_FILE_SUFFIX,
     VALUE_FIELDS,
 )
 from fbpcs.pc_pre_validation.enums import ValidationResult
-from fbpcs.pc_pre_validation.exceptions import (
-    InputDataValidationException,
-    TimeoutException,
-)
+from fbpcs.pc_pre_validation.exceptions import InputDataValidationException
 from fbpcs.pc_pre_validation.input_data_validation_issues import (
     InputDataValidationIssues,
 )
+from fbpcs.pc_pre_validation.validation_checkpoint import (
+    VALIDATION_CHECKPOINT_VERSION,
+    ValidationCheckpoint,
+)
 from fbpcs.pc_pre_validation.validation_report import ValidationReport
+from fbpcs.pc_pre_validation.validation_report_cache import (
+    VALIDATION_REPORT_CACHE_VERSION,
+    ValidationReportCache,
+)
+from fbpcs.pc_pre_validation.validation_sampling import (
+    estimate_issue_rate,
+    get_sample_byte_ranges,
+)
 from fbpcs.pc_pre_validation.validator import Validator
 from fbpcs.private_computation.entity.cloud_provider import CloudProvider
 from fbpcs.private_computation.entity.private_computation_instance import (
     PrivateComputationRole,
 )
 
+# A line that VALID_LINE_ENDING_REGEX would reject, in a block of lines
+_UNEXPECTED_LINE_ENDING_REGEX: Pattern[str] = re.compile(r"\s\n")
+_ASCII_WHITESPACES_BUT_NEWLINE: List[str] = [
+    c for c in map(chr, range(128)) if c.isspace() and c != "\n"
+]
+# VALIDATION_REGEXES fully matching all the values of a column joined by newlines
+_COLUMN_VALIDATION_REGEXES: Dict[str, Pattern[str]] = {
+    field: re.compile(f"(?:{regex.pattern}\n)*{regex.pattern}", re.MULTILINE)
+    for field, regex in VALIDATION_REGEXES.items()
+}
+
+
+@dataclass
+class ValidationWorkerResult:
+    """What a worker sends back, in place of its InputDataValidationIssues"""
+
+    rows_processed_count: int
+    # Indexed like ALL_FIELDS, the only fields that are reported
+    empty_counts: List[int]
+    format_error_counts: List[int]
+    range_error_counts: List[int]
+    cohort_id_aggregates: Dict[int, int]
+    cohort_ids: Set[int]
+    # The [start, end) byte range a timed out streaming worker did not get to validate
+    remaining_byte_range: Optional[Tuple[int, int]] = None
+    # Raised by the worker, after it counted the issues above
+    exception: Optional[Exception] = None
+
+    @classmethod
+    def from_validation_issues(
+        cls,
+        validation_issues: InputDataValidationIssues,
+        cohort_ids: Set[int],
+        remaining_byte_range: Optional[Tuple[int, int]] = None,
+        exception: Optional[Exception] = None,
+    ) -> "ValidationWorkerResult":
+        return cls(
+            rows_processed_count=validation_issues.rows_processed_count,
+            empty_counts=[validation_issues.empty_counter[f] for f in ALL_FIELDS],
+            format_error_counts=[
+                validation_issues.format_error_counter[f] for f in ALL_FIELDS
+            ],
+            range_error_counts=[
+                validation_issues.range_error_counter[f] for f in ALL_FIELDS
+            ],
+            cohort_id_aggregates=dict(validation_issues.cohort_id_aggregates),
+            cohort_ids=cohort_ids,
+            remaining_byte_range=remaining_byte_range,
+            exception=exception,
+        )
+
+    def merge_into(self, validation_issues: InputDataValidationIssues) -> None:
+        for field, empty_count, format_error_count, range_error_count in zip(
+            ALL_FIELDS,
+            self.empty_counts,
+            self.format_error_counts,
+            self.range_error_counts,
+        ):
+            if empty_count:
+                validation_issues.count_empty_field(field, empty_count)
+            if format_error_count:
+                validation_issues.count_format_error_field(field, format_error_count)
+            if range_error_count:
+                validation_issues.count_format_out_of_range_field(
+                    field, range_error_count
+                )
+        validation_issues.cohort_id_aggregates.update(self.cohort_id_aggregates)
+        validation_issues.rows_processed_count += self.rows_processed_count
+        validation_issues.cohort_id_set |= self.cohort_ids
+
 
 class InputDataValidator(Validator):
     def __init__(
@@ -85,14 +196,37 @@ class InputDataValidator(Validator):
         access_key_data: Optional[str] = None,
         start_timestamp: Optional[str] = None,
         end_timestamp: Optional[str] = None,
+        mmap_file: bool = False,
+        checkpoint: bool = False,
+        report_cache: bool = False,
+        process_pool: Optional[ProcessPoolExecutor] = None,
+        sampling: bool = False,
     ) -> None:
         self._input_file_path = input_file_path
         self._local_file_path: str = self._get_local_filepath()
         self._cloud_provider = cloud_provider
         self._storage_service = S3StorageService(region, access_key_id, access_key_data)
+        self._report_cache: Optional[ValidationReportCache] = (
+            ValidationReportCache(
+                self._storage_service,
+                f"{input_file_path}{VALIDATION_REPORT_CACHE_FILE_SUFFIX}",
+            )
+            if report_cache
+            else None
+        )
+        # Whether the report covers every row of the file, and can be cached
+        self._validated_all_rows = False
         self._name: str = INPUT_DATA_VALIDATOR_NAME
         self._num_id_columns = 0
-        self._stream_file = stream_file
+        # The samples are streamed with ranged GETs
+        self._stream_file: bool = stream_file or sampling
+        self._mmap_file = mmap_file
+        self._sampling = sampling
+        # Whether this validation only validated samples of the file
+        self._sampled = False
+        self._checkpoint = checkpoint
+        # Runs the workers, a pool is created for each validation when not given
+        self._process_pool = process_pool
         self._publisher_pc_pre_validation = publisher_pc_pre_validation
         self._partner_pc_pre_validation = partner_pc_pre_validation
         self._private_computation_role: PrivateComputationRole = (
@@ -100,20 +234,17 @@ class InputDataValidator(Validator):
         )
         self._parallelism: int = MAX_PARALLELISM
         self._file_size: int = 0
+        # [start, end) byte offsets of the lines each worker streams or maps
+        self._byte_ranges: List[Tuple[int, int]] = []
 
         s3_path = S3Path(input_file_path)
         self._bucket: str = s3_path.bucket
         self._key: str = s3_path.key
 
-        if access_key_id and access_key_data:
-            self._s3_client: BaseClient = boto3.client(
-                "s3",
-                region_name=region,
-                aws_access_key_id=access_key_id,
-                aws_secret_access_key=access_key_data,
-            )
-        else:
-            self._s3_client = boto3.client("s3")
+        self._region = region
+        self._access_key_id = access_key_id
+        self._access_key_data = access_key_data
+        self._s3_client: BaseClient = self._create_s3_client()
 
         self._start_timestamp_not_valid: bool = False
         self._end_timestamp_not_valid: bool = False
@@ -146,6 +277,33 @@ class InputDataValidator(Validator):
     def name(self) -> str:
         return self._name
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The workers run in a process pool, where the validator is pickled.
+        # They only need the S3 client to stream, which is created again on unpickling.
+        state = self.__dict__.copy()
+        for unpicklable_attribute in (
+            "_s3_client",
+            "_storage_service",
+            "_report_cache",
+            "_process_pool",
+        ):
+            del state[unpicklable_attribute]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._s3_client = self._create_s3_client()
+
+    def _create_s3_client(self) -> BaseClient:
+        if self._access_key_id and self._access_key_data:
+            return boto3.client(
+                "s3",
+                region_name=self._region,
+                aws_access_key_id=self._access_key_id,
+                aws_secret_access_key=self._access_key_data,
+            )
+        return boto3.client("s3")
+
     def _get_local_filepath(self) -> str:
         now = time.time()
         filename = self._input_file_path.split("/")[-1]
@@ -178,11 +336,214 @@ class InputDataValidator(Validator):
             # if cohort_id is not None:
             # validation_issues.update_cohort_aggregate(cohort_id, value_int)
 
+    def _validate_lines(
+        self,
+        header_row: str,
+        lines: Sequence[str],
+        validation_issues: InputDataValidationIssues,
+        cohort_id_set: Set[int],
+    ) -> None:
+        """Validate a batch of lines, one column at a time.
+
+        Lines that can't be split on commas alone (quoted values, unexpected
+        line endings, a wrong number of values, ...) are validated one by one
+        with _validate_line, so the errors are the same as when validating row
+        by row. The rows_processed_count is incremented for each validated line.
+        """
+        if not lines:
+            return
+
+        field_names = next(csv.reader([header_row]))
+        num_fields = len(field_names)
+        values = self._split_plain_lines(lines, num_fields)
+        if values is not None:
+            self._validate_columns(
+                header_row,
+                field_names,
+                lines,
+                values,
+                validation_issues,
+                cohort_id_set,
+            )
+            return
+
+        plain_lines = []
+        values = []
+        for line in lines:
+            row = self._split_plain_lines([line], num_fields)
+            if row is not None:
+                plain_lines.append(line)
+                values.extend(row)
+                continue
+
+            self._validate_columns(
+                header_row,
+                field_names,
+                plain_lines,
+                values,
+                validation_issues,
+                cohort_id_set,
+            )
+            plain_lines = []
+            values = []
+            self._validate_line(header_row, line, validation_issues, cohort_id_set)
+            validation_issues.rows_processed_count += 1
+
+        self._validate_columns(
+            header_row,
+            field_names,
+            plain_lines,
+            values,
+            validation_issues,
+            cohort_id_set,
+        )
+
+    def _split_plain_lines(
+        self, lines: Sequence[str], num_fields: int
+    ) -> Optional[List[str]]:
+        """Split the lines on commas and newlines.
+
+        Returns:
+            All the values, row after row, or None when at least one of the lines
+            has to go through the csv module to be parsed like _validate_line does.
+        """
+        text = "".join(lines)
+        field_size_limit = csv.field_size_limit()
+        ends_with_newline = text.endswith("\n")
+        last_character = text[-2:-1] if ends_with_newline else text[-1:]
+        # Single character searches are much faster than the regex engine,
+        # and only a whitespace can make a line ending unexpected
+        has_whitespaces = not text.isascii() or any(
+            c in text for c in _ASCII_WHITESPACES_BUT_NEWLINE
+        )
+        if (
+            '"' in text
+            or "\r" in text
+            or "\0" in text
+            or (
+                len(text) > field_size_limit and max(map(len, lines)) > field_size_limit
+            )
+            or text.count("\n") != len(lines) - (0 if ends_with_newline else 1)
+            or text.startswith("\n")
+            or "\n\n" in text
+            or not last_character
+            or last_character.isspace()
+            or (has_whitespaces and _UNEXPECTED_LINE_ENDING_REGEX.search(text))
+            or set(map(str.count, lines, repeat(","))) != {num_fields - 1}
+        ):
+            return None
+
+        if ends_with_newline:
+            text = text[:-1]
+        return text.replace("\n", ",").split(",")
+
+    def _validate_columns(
+        self,
+        header_row: str,
+        field_names: Sequence[str],
+        lines: Sequence[str],
+        values: Sequence[str],
+        validation_issues: InputDataValidationIssues,
+        cohort_id_set: Set[int],
+    ) -> None:
+        if not lines:
+            return
+
+        num_fields = len(field_names)
+        batch_validation_issues = InputDataValidationIssues()
+        batch_cohort_id_set = set()
+        try:
+            # Like csv.DictReader, only the last column of a duplicated field name is kept
+            field_indexes = {field: i for i, field in enumerate(field_names)}
+            for field, i in field_indexes.items():
+                self._validate_column(
+                    batch_validation_issues,
+                    field,
+                    values[i::num_fields],
+                    batch_cohort_id_set,
+                )
+        except Exception:
+            # Validate row by row so the same error is raised for the same row
+            for line in lines:
+                self._validate_line(header_row, line, validation_issues, cohort_id_set)
+                validation_issues.rows_processed_count += 1
+            return
+
+        validation_issues.merge(batch_validation_issues)
+        cohort_id_set |= batch_cohort_id_set
+        validation_issues.rows_processed_count += len(lines)
+
+    def _validate_column(
+        self,
+        validation_issues: InputDataValidationIssues,
+        field: str,
+        values: Sequence[str],
+        cohort_id_set: Set[int],
+    ) -> None:
+        """Run the _validate_row checks over all the values of a column"""
+        issue_field = ID_FIELD_PREFIX if field.startswith(ID_FIELD_PREFIX) else field
+
+        non_empty_values = values
+        if not all(values) or any(map(str.isspace, values)):
+            non_empty_values = [value for value in values if value.strip()]
+            validation_issues.count_empty_field(
+                issue_field, len(values) - len(non_empty_values)
+            )
+
+        well_formatted_values = non_empty_values
+        if issue_field in VALIDATION_REGEXES and non_empty_values:
+            if VALIDATION_REGEXES[issue_field] is INTEGER_REGEX:
+                # Same as matching each value with INTEGER_REGEX, without the regex engine
+                joined_values = "".join(non_empty_values)
+                all_well_formatted = joined_values.isascii() and joined_values.isdigit()
+            else:
+                all_well_formatted = bool(
+                    _COLUMN_VALIDATION_REGEXES[issue_field].fullmatch(
+                        "\n".join(non_empty_values)
+                    )
+                )
+            if not all_well_formatted:
+                match = VALIDATION_REGEXES[issue_field].match
+                well_formatted_values = [
+                    value for value in non_empty_values if match(value)
+                ]
+                validation_issues.count_format_error_field(
+                    issue_field, len(non_empty_values) - len(well_formatted_values)
+                )
+
+        if issue_field.endswith(TIMESTAMP):
+            self._validate_timestamps(
+                validation_issues, issue_field, well_formatted_values
+            )
+        elif issue_field in VALUE_FIELDS:
+            self._validate_purchase_values(
+                validation_issues, issue_field, well_formatted_values
+            )
+
+        if field.startswith(COHORT_ID_FIELD):
+            cohort_id_set.update(map(int, set(values)))
+
     def _download_locally(
         self, validation_issues: InputDataValidationIssues, rows_processed_count: int
     ) -> Optional[ValidationReport]:
         file_size = self._get_file_size()
-        if file_size > INPUT_DATA_MAX_FILE_SIZE_IN_BYTES:
+        if self._mmap_file:
+            free_disk_space = shutil.disk_usage(INPUT_DATA_TMP_FILE_PATH).free
+            if file_size > free_disk_space:
+                free_disk_space_mb = int(free_disk_space / (1024 * 1024))
+                warning_message = " ".join(
+                    [
+                        f"WARNING: File: {self._input_file_path} is too large to download.",
+                        f"The available disk space is {free_disk_space_mb} MB.",
+                        "Skipped input_data validation.",
+                    ]
+                )
+                return self._format_validation_report(
+                    warning_message,
+                    rows_processed_count,
+                    validation_issues,
+                )
+        elif file_size > INPUT_DATA_MAX_FILE_SIZE_IN_BYTES:
             max_size_mb = int(INPUT_DATA_MAX_FILE_SIZE_IN_BYTES / (1024 * 1024))
             warning_message = " ".join(
                 [
@@ -223,92 +584,206 @@ class InputDataValidator(Validator):
         for i in range(self._parallelism):
             shards[i].close()
 
-    # worker process when reading from the local file
-    def _validation_worker_local_download(
+    # split the file into line aligned byte ranges, one for each worker
+    def _create_byte_ranges(self) -> None:
+        with open(self._local_file_path, "rb") as local_file:
+            header_line = local_file.readline()
+            self._validate_line_ending(header_line.decode("utf-8"))
+            file_size = local_file.seek(0, 2)
+            if file_size == len(header_line):
+                self._byte_ranges = [(file_size, file_size)] * self._parallelism
+                return
+
+            with mmap.mmap(
+                local_file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped_file:
+                data_start = len(header_line)
+                num_bytes_per_worker = int((file_size - data_start) / self._parallelism)
+                boundaries = [data_start]
+                for i in range(1, self._parallelism):
+                    # a worker starts at the first line starting from its share of the bytes
+                    offset = max(data_start + i * num_bytes_per_worker, boundaries[-1])
+                    newline_offset = mapped_file.find(b"\n", offset - 1)
+                    boundaries.append(
+                        file_size if newline_offset == -1 else newline_offset + 1
+                    )
+                boundaries.append(file_size)
+
+        self._byte_ranges = list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _iter_mapped_lines(
+        self, mapped_file: mmap.mmap, start: int, end: int
+    ) -> Iterator[bytes]:
+        mapped_file.seek(start)
+        while mapped_file.tell() < end:
+            yield mapped_file.readline()
+
+    # worker process when reading the local file from memory mapped byte ranges
+    def _validation_worker_mmap(
         self,
         s: int,
         header_row: str,
         validation_issues: InputDataValidationIssues,
-        validation_issues_queue: Queue,
-        cohort_id_set_queue: Queue,
-        rows_processed_queue: Queue,
-        exception_queue: Queue,
-    ) -> None:
-        rows_processed = 0
-        cohort_id_set = set()
-        try:
-            with open(self._get_chunk_path(self._local_file_path, s), "rb") as f:
-                while line := f.readline():
-                    line = line.decode("utf-8")
-                    self._validate_line(
-                        header_row, line, validation_issues, cohort_id_set
+        cohort_id_set: Set[int],
+    ) -> Optional[Tuple[int, int]]:
+        start, end = self._byte_ranges[s]
+        if start < end:
+            with open(self._local_file_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mapped_file:
+                mapped_lines = self._iter_mapped_lines(mapped_file, start, end)
+                while lines := [
+                    line.decode("utf-8")
+                    for line in islice(mapped_lines, VALIDATION_BATCH_SIZE_IN_ROWS)
+                ]:
+                    self._validate_lines(
+                        header_row, lines, validation_issues, cohort_id_set
                     )
-                    rows_processed += 1
-        except Exception as e:
-            exception_queue.put(e)
-            sys.exit(0)
-        finally:
-            validation_issues_queue.put(validation_issues)
-            cohort_id_set_queue.put(cohort_id_set)
-            rows_processed_queue.put(rows_processed)
-
-    def _get_byte_range(self, s: int) -> str:
-        file_size = self._file_size
-        # num_bytes_per_worker is calculated by dividing the file size by the number of workers
-        num_bytes_per_worker = int(file_size / self._parallelism)
-        start = s * num_bytes_per_worker
-        end = (s + 1) * num_bytes_per_worker - 1
-        return "bytes={}-{}".format(start, end)
+        return None
 
-    # worker process when streaming
-    def _validation_worker_streaming(
+    # worker process when reading from the local file
+    def _validation_worker_local_download(
         self,
         s: int,
         header_row: str,
         validation_issues: InputDataValidationIssues,
-        validation_issues_queue: Queue,
-        cohort_id_set_queue: Queue,
-        rows_processed_queue: Queue,
-        exception_queue: Queue,
-    ) -> None:
-        range_header = self._get_byte_range(s)
-        # Create client to read from S3 bucket with those ranges.
-        response = self._s3_client.get_object(
-            Bucket=self._bucket, Key=self._key, Range=range_header
-        )
-        start = time.time()
-        rows_processed = 0
-        cohort_id_set = set()
-        stream = response["Body"]
-        lines = stream.iter_lines(keepends=True)
+        cohort_id_set: Set[int],
+    ) -> Optional[Tuple[int, int]]:
+        with open(self._get_chunk_path(self._local_file_path, s), "rb") as f:
+            while lines := [
+                line.decode("utf-8")
+                for line in islice(f, VALIDATION_BATCH_SIZE_IN_ROWS)
+            ]:
+                self._validate_lines(
+                    header_row, lines, validation_issues, cohort_id_set
+                )
+        return None
 
-        # Skip the first row
-        line = next(lines, None)
-        line = next(lines, None)
-        next_line = next(lines, None)
+    def _split_byte_ranges(
+        self, byte_ranges: Sequence[Tuple[int, int]]
+    ) -> List[Tuple[int, int]]:
+        """Splits the byte ranges evenly between the workers.
+
+        The number of workers is computed from the total size of the ranges.
+        Adjacent ranges are merged, each range gets one worker, and the workers
+        left are shared in proportion to the size of the ranges, so there are
+        never more splits than workers or ranges to validate.
+        """
+        merged_byte_ranges: List[Tuple[int, int]] = []
+        for start, end in byte_ranges:
+            if start >= end:
+                continue
+            if merged_byte_ranges and merged_byte_ranges[-1][1] == start:
+                merged_byte_ranges[-1] = (merged_byte_ranges[-1][0], end)
+            else:
+                merged_byte_ranges.append((start, end))
+        total_size = sum(end - start for start, end in merged_byte_ranges)
+        if not total_size:
+            return []
+        # Add a worker only if each one is alredy going to process MIN_CHUNK_SIZE
+        # but capped at MAX_PARALLELISM
+        parallelism = min(int(total_size / MIN_CHUNK_SIZE) + 1, MAX_PARALLELISM)
+        extra_splits = max(parallelism - len(merged_byte_ranges), 0)
+        split_byte_ranges = []
+        for start, end in merged_byte_ranges:
+            num_splits = 1 + int((end - start) * extra_splits / total_size)
+            boundaries = [
+                start + int(i * (end - start) / num_splits)
+                for i in range(num_splits + 1)
+            ]
+            split_byte_ranges.extend(zip(boundaries[:-1], boundaries[1:]))
+        return split_byte_ranges
 
-        try:
-            while line is not None:
-                # Since we read byte ranges, it may not align with line endings. So skip the last row
-                if next_line is None:
-                    break
-                line = line.decode("utf-8")
-                self._validate_line(header_row, line, validation_issues, cohort_id_set)
-                rows_processed += 1
-                line = next_line
-                next_line = next(lines, None)
-                if not self._keep_streaming_check(start, rows_processed):
-                    raise TimeoutException
+    def _get_object_bytes(self, start: int, end: int) -> bytes:
+        response = self._s3_client.get_object(
+            Bucket=self._bucket, Key=self._key, Range=f"bytes={start}-{end - 1}"
+        )
+        return response["Body"].read()
+
+    def _iter_object_parts(self, start: int, end: int) -> Iterator[bytes]:
+        """Yields the bytes in [start, end) in order, from concurrent ranged GETs"""
+        with ThreadPoolExecutor(max_workers=STREAMING_MAX_CONCURRENT_PARTS) as executor:
+            parts = deque()
+            for part_start in range(start, end, STREAMING_PART_SIZE_IN_BYTES):
+                part_end = min(part_start + STREAMING_PART_SIZE_IN_BYTES, end)
+                parts.append(
+                    executor.submit(self._get_object_bytes, part_start, part_end)
+                )
+                if len(parts) == STREAMING_MAX_CONCURRENT_PARTS:
+                    yield parts.popleft().result()
+            while parts:
+                yield parts.popleft().result()
+
+    def _iter_streamed_lines(self, start: int, end: int) -> Iterator[Tuple[str, int]]:
+        """Yields the lines starting in [start, end), with the byte offset of their end.
+
+        The range is read from the byte before its start, and everything up to
+        the first line ending is skipped: the header row when the range starts
+        the file, and the line owned by the previous range otherwise. The line
+        that straddles the end of the range is read to its end.
+        """
+        if start >= end:
+            return
+        skip_first_line = True
+        pending = b""
+        offset = max(start - 1, 0)
+        for part in self._iter_object_parts(offset, end):
+            data = pending + part
+            if skip_first_line:
+                first_line_end = data.find(b"\n")
+                if first_line_end == -1:
+                    offset += len(data)
+                    continue
+                skip_first_line = False
+                offset += first_line_end + 1
+                data = data[first_line_end + 1 :]
+            lines = data.split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                offset += len(line) + 1
+                yield line.decode("utf-8") + "\n", offset
+
+        tail_offset = end
+        while pending and not skip_first_line and tail_offset < self._file_size:
+            tail = self._get_object_bytes(
+                tail_offset,
+                min(tail_offset + STREAMING_LINE_TAIL_SIZE_IN_BYTES, self._file_size),
+            )
+            line_end = tail.find(b"\n")
+            if line_end != -1:
+                pending += tail[: line_end + 1]
+                break
+            pending += tail
+            tail_offset += len(tail)
+        if pending and not skip_first_line:
+            yield pending.decode("utf-8"), offset + len(pending)
 
-        except Exception as e:
-            exception_queue.put(e)
-            sys.exit(0)
-        finally:
-            validation_issues_queue.put(validation_issues)
-            cohort_id_set_queue.put(cohort_id_set)
-            rows_processed_queue.put(rows_processed)
+    # worker process when streaming
+    def _validation_worker_streaming(
+        self,
+        s: int,
+        header_row: str,
+        validation_issues: InputDataValidationIssues,
+        cohort_id_set: Set[int],
+    ) -> Optional[Tuple[int, int]]:
+        start_time = time.time()
+        start, end = self._byte_ranges[s]
+
+        lines = self._iter_streamed_lines(start, end)
+        while batch := list(islice(lines, VALIDATION_BATCH_SIZE_IN_ROWS)):
+            self._validate_lines(
+                header_row,
+                [line for line, _ in batch],
+                validation_issues,
+                cohort_id_set,
+            )
+            if not self._keep_streaming_check(
+                start_time, validation_issues.rows_processed_count
+            ):
+                _, validated_end = batch[-1]
+                return validated_end, end
 
-        return
+        return None
 
     def _get_and_validate_header(
         self, validation_issues: InputDataValidationIssues
@@ -328,7 +803,37 @@ class InputDataValidator(Validator):
         return ",".join(field_names)
 
     def __validate__(self) -> ValidationReport:
+        if not self._report_cache:
+            return self._validate_input_data()
+
+        try:
+            cache_key = self._get_report_cache_key()
+        except ClientError:
+            return self._validate_input_data()
+        cached_report = self._report_cache.get(cache_key)
+        if cached_report:
+            return cached_report
+
+        report = self._validate_input_data()
+        if self._validated_all_rows:
+            self._report_cache.put(cache_key, report)
+        return report
+
+    def _get_report_cache_key(self) -> str:
+        # The ETag changes with the content of the file, header row included
+        response = self._s3_client.head_object(Bucket=self._bucket, Key=self._key)
+        return json.dumps(
+            [
+                VALIDATION_REPORT_CACHE_VERSION,
+                response["ETag"],
+                response["ContentLength"],
+                self._get_validation_settings(),
+            ]
+        )
+
+    def _validate_input_data(self) -> ValidationReport:
         validation_issues = InputDataValidationIssues()
+        worker_results: List[ValidationWorkerResult] = []
 
         try:
             self._file_size = self._get_file_size()
@@ -346,12 +851,54 @@ class InputDataValidator(Validator):
 
             header_row = self._get_and_validate_header(validation_issues)
 
-            if not self._stream_file:
+            # A file that is not larger than its samples is validated entirely
+            self._sampled = (
+                self._sampling
+                and self._file_size
+                > SAMPLING_NUM_SAMPLES * SAMPLING_SAMPLE_SIZE_IN_BYTES
+            )
+            checkpoint = None
+            if self._stream_file and self._checkpoint and not self._sampled:
+                checkpoint = self._read_checkpoint(header_row)
+
+            if self._sampled:
+                self._byte_ranges = get_sample_byte_ranges(
+                    0,
+                    self._file_size,
+                    SAMPLING_NUM_SAMPLES,
+                    SAMPLING_SAMPLE_SIZE_IN_BYTES,
+                )
+                self._parallelism = len(self._byte_ranges)
+            elif self._stream_file and checkpoint:
+                checkpoint.restore_validation_issues(validation_issues)
+                self._byte_ranges = self._split_byte_ranges(
+                    self._get_remaining_byte_ranges(checkpoint)
+                )
+                self._parallelism = len(self._byte_ranges)
+            elif self._stream_file:
+                self._byte_ranges = self._split_byte_ranges([(0, self._file_size)])
+                self._parallelism = len(self._byte_ranges)
+            elif self._mmap_file:
+                self._create_byte_ranges()
+            else:
                 self._create_shards()
 
-            self._run_workers(validation_issues, header_row)
+            worker_results = self._run_workers(validation_issues, header_row)
 
-            self._validate_cohort_ids(validation_issues.cohort_id_set)
+            if self._stream_file and self._checkpoint and not self._sampled:
+                self._write_checkpoint(
+                    header_row,
+                    [
+                        result.remaining_byte_range
+                        for result in worker_results
+                        if result.remaining_byte_range
+                    ],
+                    validation_issues,
+                )
+
+            # Samples may miss the rows of some cohorts
+            if not self._sampled:
+                self._validate_cohort_ids(validation_issues.cohort_id_set)
 
         except InputDataValidationException as e:
             return self._format_validation_report(
@@ -362,78 +909,249 @@ class InputDataValidator(Validator):
             )
 
         rows_processed_count = validation_issues.rows_processed_count
+        self._validated_all_rows = (
+            not validation_issues.streaming_timed_out and not self._sampled
+        )
+        message = f"File: {self._input_file_path}"
+        # The thresholds apply to the whole file, and so do the sampled issue counts
+        rows_count = rows_processed_count
+        sampling_details = None
+        if self._sampled:
+            rows_count, sampling_details = self._extrapolate_sampled_issues(
+                worker_results, validation_issues
+            )
+            message += (
+                f" (sampled {rows_processed_count} of an estimated {rows_count} rows)"
+            )
         validation_issues.set_max_issue_count_til_error(
             {
                 ID_FIELD_PREFIX: {
-                    "empty_count": self._num_id_columns * rows_processed_count - 1,
+                    "empty_count": self._num_id_columns * rows_count - 1,
                 },
                 EVENT_TIMESTAMP_FIELD: {
                     "out_of_range_count": int(
-                        rows_processed_count * TIMESTAMP_OUT_OF_RANGE_MAX_THRESHOLD
+                        rows_count * TIMESTAMP_OUT_OF_RANGE_MAX_THRESHOLD
                     ),
                 },
                 CONVERSION_TIMESTAMP_FIELD: {
                     "out_of_range_count": int(
-                        rows_processed_count * TIMESTAMP_OUT_OF_RANGE_MAX_THRESHOLD
+                        rows_count * TIMESTAMP_OUT_OF_RANGE_MAX_THRESHOLD
                     ),
                 },
             }
         )
         return self._format_validation_report(
-            f"File: {self._input_file_path}",
+            message,
             rows_processed_count,
             validation_issues,
             streaming_timed_out=(validation_issues.streaming_timed_out),
+            sampling_details=sampling_details,
         )
 
+    def _extrapolate_sampled_issues(
+        self,
+        worker_results: Sequence[ValidationWorkerResult],
+        validation_issues: InputDataValidationIssues,
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Replace the issue counts of the samples with estimates for the whole file.
+
+        Returns:
+            The estimated number of rows in the file, and the details of the estimates.
+        """
+        rows_counts = [result.rows_processed_count for result in worker_results]
+        sampled_size = sum(end - start for start, end in self._byte_ranges)
+        sampling_fraction = sampled_size / self._file_size
+        estimated_rows_count = round(sum(rows_counts) / sampling_fraction)
+
+        issue_rates = {}
+        for issue_name, counter, samples_issue_counts in (
+            (
+                "empty_count",
+                validation_issues.empty_counter,
+                [result.empty_counts for result in worker_results],
+            ),
+            (
+                "bad_format_count",
+                validation_issues.format_error_counter,
+                [result.format_error_counts for result in worker_results],
+            ),
+            (
+                OUT_OF_RANGE_COUNT,
+                validation_issues.range_error_counter,
+                [result.range_error_counts for result in worker_results],
+            ),
+        ):
+            for i, field in enumerate(ALL_FIELDS):
+                issue_counts = [counts[i] for counts in samples_issue_counts]
+                if not any(issue_counts):
+                    continue
+                estimate = estimate_issue_rate(
+                    issue_counts,
+                    rows_counts,
+                    sampling_fraction,
+                    estimated_rows_count,
+                )
+                counter[field] = estimate.count
+                issue_rates.setdefault(field, {})[issue_name] = estimate.to_dict()
+
+        return estimated_rows_count, {
+            "samples_count": len(worker_results),
+            "estimated_rows_count": estimated_rows_count,
+            "confidence_level": SAMPLING_CONFIDENCE_LEVEL,
+            "issue_rates": issue_rates,
+        }
+
     def _run_workers(
         self, validation_issues: InputDataValidationIssues, header_row: str
-    ) -> None:
-        seed_validation_issues = InputDataValidationIssues()
-        validation_issues_queue = Queue(self._parallelism)
-        cohort_id_set_queue = Queue(self._parallelism)
-        rows_processed_queue = Queue(self._parallelism)
-        exception_queue = Queue(self._parallelism)
+    ) -> List[ValidationWorkerResult]:
+        """Merges the results of the workers into validation_issues, and returns them"""
+        if not self._parallelism:
+            return []
+        if self._process_pool:
+            results = self._map_workers(self._process_pool, header_row)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self._parallelism, MAX_PARALLELISM)
+            ) as process_pool:
+                results = self._map_workers(process_pool, header_row)
+
+        for result in results:
+            result.merge_into(validation_issues)
+            if result.remaining_byte_range:
+                validation_issues.streaming_timed_out = True
+        for result in results:
+            if result.exception:
+                raise result.exception
+        return results
+
+    def _map_workers(
+        self, process_pool: ProcessPoolExecutor, header_row: str
+    ) -> List[ValidationWorkerResult]:
+        return list(
+            process_pool.map(
+                self._run_validation_worker,
+                range(self._parallelism),
+                repeat(header_row),
+            )
+        )
 
-        workers = []
-        for i in range(self._parallelism):
-            w = Process(
-                target=self._validation_worker_streaming
-                if self._stream_file
-                else self._validation_worker_local_download,
-                args=(
-                    i,
-                    header_row,
-                    seed_validation_issues,
-                    validation_issues_queue,
-                    cohort_id_set_queue,
-                    rows_processed_queue,
-                    exception_queue,
-                ),
-            )
-            workers.append(w)
-            w.start()
-
-        for _, w in enumerate(workers):
-            w.join()
-            if not validation_issues_queue.empty():
-                validation_issues.merge(validation_issues_queue.get())
-            if not cohort_id_set_queue.empty():
-                validation_issues.cohort_id_set |= cohort_id_set_queue.get()
-            if not rows_processed_queue.empty():
-                validation_issues.rows_processed_count += rows_processed_queue.get()
-
-        for i, _ in enumerate(workers):
-            if not exception_queue.empty():
-                e = exception_queue.get()
-                if type(e) == TimeoutException:
-                    validation_issues.streaming_timed_out = True
-                else:
-                    raise e
-            if w.exitcode != 0:
-                raise InputDataValidationException(
-                    f"Worker {i} failed with exit code {w.exitcode}"
-                )
+    def _run_validation_worker(self, s: int, header_row: str) -> ValidationWorkerResult:
+        validation_issues = InputDataValidationIssues()
+        cohort_id_set = set()
+        try:
+            remaining_byte_range = self._get_validation_worker()(
+                s, header_row, validation_issues, cohort_id_set
+            )
+        except Exception as e:
+            return ValidationWorkerResult.from_validation_issues(
+                validation_issues, cohort_id_set, exception=e
+            )
+        return ValidationWorkerResult.from_validation_issues(
+            validation_issues, cohort_id_set, remaining_byte_range
+        )
+
+    def _get_validation_worker(
+        self,
+    ) -> Callable[
+        [int, str, InputDataValidationIssues, Set[int]], Optional[Tuple[int, int]]
+    ]:
+        if self._stream_file:
+            return self._validation_worker_streaming
+        if self._mmap_file:
+            return self._validation_worker_mmap
+        return self._validation_worker_local_download
+
+    def _get_checkpoint_path(self) -> str:
+        return f"{self._input_file_path}{VALIDATION_CHECKPOINT_FILE_SUFFIX}"
+
+    def _get_validation_settings(self) -> str:
+        return json.dumps(
+            [
+                str(self._private_computation_role),
+                self._publisher_pc_pre_validation,
+                self._partner_pc_pre_validation,
+                self._start_timestamp,
+                self._end_timestamp,
+            ]
+        )
+
+    def _get_fingerprint(self, file_size: int) -> Tuple[str, bool]:
+        """Returns the sha256 of the end of the file, and whether it ends with a newline"""
+        if not file_size:
+            return hashlib.sha256().hexdigest(), False
+        data = self._get_object_bytes(
+            max(file_size - VALIDATION_CHECKPOINT_FINGERPRINT_SIZE_IN_BYTES, 0),
+            file_size,
+        )
+        return hashlib.sha256(data).hexdigest(), data.endswith(b"\n")
+
+    def _read_checkpoint(self, header_row: str) -> Optional[ValidationCheckpoint]:
+        """Returns the checkpoint of a previous run that this run can resume from"""
+        checkpoint_path = self._get_checkpoint_path()
+        try:
+            if not self._storage_service.file_exists(checkpoint_path):
+                return None
+            checkpoint = ValidationCheckpoint.from_json(
+                self._storage_service.read(checkpoint_path)
+            )
+        except (ClientError, KeyError, TypeError, ValueError):
+            return None
+
+        if (
+            checkpoint.version != VALIDATION_CHECKPOINT_VERSION
+            or checkpoint.settings != self._get_validation_settings()
+            or checkpoint.header_row != header_row
+            or checkpoint.file_size > self._file_size
+            # The last line of the previous run may have been completed by the new rows
+            or (
+                checkpoint.file_size < self._file_size
+                and not checkpoint.ends_with_newline
+            )
+        ):
+            return None
+        fingerprint, _ = self._get_fingerprint(checkpoint.file_size)
+        if checkpoint.fingerprint != fingerprint:
+            return None
+        return checkpoint
+
+    def _get_remaining_byte_ranges(
+        self, checkpoint: ValidationCheckpoint
+    ) -> List[Tuple[int, int]]:
+        remaining_byte_ranges = [
+            (start, end)
+            for start, end in checkpoint.remaining_byte_ranges
+            if start < end
+        ]
+        # Rows appended since the checkpoint was written
+        if checkpoint.file_size < self._file_size:
+            remaining_byte_ranges.append((checkpoint.file_size, self._file_size))
+        return remaining_byte_ranges
+
+    def _write_checkpoint(
+        self,
+        header_row: str,
+        remaining_byte_ranges: Sequence[Tuple[int, int]],
+        validation_issues: InputDataValidationIssues,
+    ) -> None:
+        fingerprint, ends_with_newline = self._get_fingerprint(self._file_size)
+        checkpoint = ValidationCheckpoint.from_validation_issues(
+            settings=self._get_validation_settings(),
+            header_row=header_row,
+            file_size=self._file_size,
+            fingerprint=fingerprint,
+            ends_with_newline=ends_with_newline,
+            remaining_byte_ranges=[
+                (start, end) for start, end in remaining_byte_ranges if start < end
+            ],
+            validation_issues=validation_issues,
+        )
+        try:
+            self._storage_service.write(
+                self._get_checkpoint_path(), checkpoint.to_json()
+            )
+        except ClientError:
+            # The checkpoint only saves time on the next run, it does not affect this one
+            pass
 
     def _stream_field_names(self) -> Sequence[str]:
         try:
@@ -465,7 +1183,7 @@ class InputDataValidator(Validator):
     def _keep_streaming_check(
         self, start_time: float, rows_processed_count: int
     ) -> bool:
-        if rows_processed_count % 100000 == 0:
+        if rows_processed_count % STREAMING_DURATION_CHECK_INTERVAL_IN_ROWS == 0:
             current_time = time.time()
             return (current_time - start_time) < STREAMING_DURATION_LIMIT_IN_SECONDS
 
@@ -615,6 +1333,27 @@ class InputDataValidator(Validator):
         if end and timestamp_int > end:
             validation_issues.count_format_out_of_range_field(field)
 
+    def _validate_timestamps(
+        self,
+        validation_issues: InputDataValidationIssues,
+        field: str,
+        timestamps: Sequence[str],
+    ) -> None:
+        if not (self._start_timestamp or self._end_timestamp) or not timestamps:
+            return
+        timestamps_int = list(map(int, timestamps))
+        start = self._start_timestamp
+        end = self._end_timestamp
+
+        out_of_range_count = 0
+        if start and min(timestamps_int) < start:
+            out_of_range_count += sum(1 for t in timestamps_int if t < start)
+        if end and max(timestamps_int) > end:
+            out_of_range_count += sum(1 for t in timestamps_int if t > end)
+
+        if out_of_range_count:
+            validation_issues.count_format_out_of_range_field(field, out_of_range_count)
+
     # This is the purchase value range that gets validated:
     # * purchase_value < INTEGER_MAX_VALUE
     def _validate_purchase_value(
@@ -626,6 +1365,21 @@ class InputDataValidator(Validator):
         if value_int >= INTEGER_MAX_VALUE:
             validation_issues.count_format_out_of_range_field(field)
 
+    def _validate_purchase_values(
+        self,
+        validation_issues: InputDataValidationIssues,
+        field: str,
+        values: Sequence[str],
+    ) -> None:
+        # An integer written with fewer characters than INTEGER_MAX_VALUE is smaller
+        if max(map(len, values), default=0) < len(str(INTEGER_MAX_VALUE)):
+            return
+        out_of_range_count = sum(
+            1 for value in values if int(value) >= INTEGER_MAX_VALUE
+        )
+        if out_of_range_count:
+            validation_issues.count_format_out_of_range_field(field, out_of_range_count)
+
     def _format_validation_report(
         self,
         message: str,
@@ -633,9 +1387,11 @@ class InputDataValidator(Validator):
         validation_issues: InputDataValidationIssues,
         had_exception: bool = False,
         streaming_timed_out: bool = False,
+        sampling_details: Optional[Dict[str, Any]] = None,
     ) -> ValidationReport:
         validation_errors = validation_issues.get_errors()
         validation_warnings = validation_issues.get_warnings()
+        extra_details = {"sampling": sampling_details} if sampling_details else {}
 
         if had_exception:
             return ValidationReport(
@@ -673,6 +1429,7 @@ class InputDataValidator(Validator):
             details = {
                 "rows_processed_count": rows_processed_count,
                 "validation_errors": validation_errors,
+                **extra_details,
             }
             if validation_warnings:
                 details["validation_warnings"] = validation_warnings
@@ -692,6 +1449,7 @@ class InputDataValidator(Validator):
                 details={
                     "rows_processed_count": rows_processed_count,
                     "validation_warnings": validation_warnings,
+                    **extra_details,
                 },
             )
         else:
@@ -701,6 +1459,7 @@ class InputDataValidator(Validator):
                 message=f"{message} completed validation successfully{timed_out_warning_message}{timed_out_message}{timestamp_warnings}",
                 details={
                     "rows_processed_count": rows_processed_count,
+                    **extra_details,
                 },
             )
 
@@ -13,7 +13,7 @@ CLI for running validations on the input data for private computations
 
 Usage:
     pc_pre_validation_cli
-        --input-file-path=<input-file-path>
+        (--input-file-path=<input-file-path> | --input-file-paths=<input-file-paths> | --input-file-prefix=<input-file-prefix>)
         --cloud-provider=<cloud-provider>
         --region=<region>
         [--access-key-id=<access-key-id>]
@@ -23,23 +23,52 @@ Usage:
         [--binary-version=<binary-version>]
         [--private-computation-role=<private-computation-role>]
         [--pre-validation-file-stream=<pre-validation-file-stream>]
+        [--pre-validation-file-mmap=<pre-validation-file-mmap>]
+        [--pre-validation-checkpoint=<pre-validation-checkpoint>]
+        [--pre-validation-report-cache=<pre-validation-report-cache>]
+        [--pre-validation-sampling=<pre-validation-sampling>]
         [--publisher-pc-pre-validation=<publisher-pc-pre-validation>]
         [--partner-pc-pre-validation=<partner-pc-pre-validation>]
+
+Batch mode:
+    --input-file-paths takes a comma separated list of input files, and
+    --input-file-prefix validates all the files under an S3 prefix.
+    The input files are validated concurrently and the binary files once,
+    in a single report with a section for each input file.
+
+Sampling mode:
+    --pre-validation-sampling=enabled validates random samples of the rows of the
+    input files, and reports the issue counts extrapolated to the whole files
+    with confidence intervals of their rates.
 """
 
 
-from typing import cast, List, Optional as OptionalType
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, cast, Dict, List, Optional as OptionalType
 
 from docopt import docopt
+from fbpcp.service.storage_s3 import S3StorageService
+from fbpcp.util.s3path import S3Path
 from fbpcs.pc_pre_validation.binary_file_validator import BinaryFileValidator
+from fbpcs.pc_pre_validation.constants import (
+    MAX_CONCURRENT_INPUT_FILES,
+    MAX_PARALLELISM,
+    VALIDATION_CHECKPOINT_FILE_SUFFIX,
+    VALIDATION_REPORT_CACHE_FILE_SUFFIX,
+)
 from fbpcs.pc_pre_validation.enums import ValidationResult
 from fbpcs.pc_pre_validation.input_data_validator import InputDataValidator
 from fbpcs.pc_pre_validation.validator import Validator
-from fbpcs.pc_pre_validation.validators_runner import run_validators
+from fbpcs.pc_pre_validation.validators_runner import (
+    run_batch_validators,
+    run_validators,
+)
 from fbpcs.private_computation.entity.cloud_provider import CloudProvider
 from schema import Optional, Or, Schema, Use
 
 INPUT_FILE_PATH = "--input-file-path"
+INPUT_FILE_PATHS = "--input-file-paths"
+INPUT_FILE_PREFIX = "--input-file-prefix"
 CLOUD_PROVIDER = "--cloud-provider"
 REGION = "--region"
 ACCESS_KEY_ID = "--access-key-id"
@@ -49,6 +78,14 @@ END_TIMESTAMP = "--end-timestamp"
 BINARY_VERSION = "--binary-version"
 PRE_VALIDATION_FILE_STREAM_FLAG = "--pre-validation-file-stream"
 PRE_VALIDATION_FILE_STREAM_ENABLED = "enabled"
+PRE_VALIDATION_FILE_MMAP_FLAG = "--pre-validation-file-mmap"
+PRE_VALIDATION_FILE_MMAP_ENABLED = "enabled"
+PRE_VALIDATION_CHECKPOINT_FLAG = "--pre-validation-checkpoint"
+PRE_VALIDATION_CHECKPOINT_ENABLED = "enabled"
+PRE_VALIDATION_REPORT_CACHE_FLAG = "--pre-validation-report-cache"
+PRE_VALIDATION_REPORT_CACHE_ENABLED = "enabled"
+PRE_VALIDATION_SAMPLING_FLAG = "--pre-validation-sampling"
+PRE_VALIDATION_SAMPLING_ENABLED = "enabled"
 PUBLISHER_PC_PRE_VALIDATION_FLAG = "--publisher-pc-pre-validation"
 PUBLISHER_PC_PRE_VALIDATION_ENABLED = "enabled"
 PRIVATE_COMPUTATION_ROLE = "--private-computation-role"
@@ -62,7 +99,9 @@ def main(argv: OptionalType[List[str]] = None) -> None:
 
     s = Schema(
         {
-            INPUT_FILE_PATH: str,
+            Optional(INPUT_FILE_PATH): optional_string,
+            Optional(INPUT_FILE_PATHS): optional_string,
+            Optional(INPUT_FILE_PREFIX): optional_string,
             CLOUD_PROVIDER: cloud_provider_from_string,
             REGION: str,
             Optional(ACCESS_KEY_ID): optional_string,
@@ -71,6 +110,10 @@ def main(argv: OptionalType[List[str]] = None) -> None:
             Optional(END_TIMESTAMP): optional_string,
             Optional(BINARY_VERSION): optional_string,
             Optional(PRE_VALIDATION_FILE_STREAM_FLAG): optional_string,
+            Optional(PRE_VALIDATION_FILE_MMAP_FLAG): optional_string,
+            Optional(PRE_VALIDATION_CHECKPOINT_FLAG): optional_string,
+            Optional(PRE_VALIDATION_REPORT_CACHE_FLAG): optional_string,
+            Optional(PRE_VALIDATION_SAMPLING_FLAG): optional_string,
             Optional(PUBLISHER_PC_PRE_VALIDATION_FLAG): optional_string,
             Optional(PARTNER_PC_PRE_VALIDATION_FLAG): optional_string,
             Optional(PRIVATE_COMPUTATION_ROLE): optional_string,
@@ -82,6 +125,19 @@ def main(argv: OptionalType[List[str]] = None) -> None:
     stream_file = (
         arguments[PRE_VALIDATION_FILE_STREAM_FLAG] == PRE_VALIDATION_FILE_STREAM_ENABLED
     )
+    mmap_file = (
+        arguments[PRE_VALIDATION_FILE_MMAP_FLAG] == PRE_VALIDATION_FILE_MMAP_ENABLED
+    )
+    checkpoint = (
+        arguments[PRE_VALIDATION_CHECKPOINT_FLAG] == PRE_VALIDATION_CHECKPOINT_ENABLED
+    )
+    report_cache = (
+        arguments[PRE_VALIDATION_REPORT_CACHE_FLAG]
+        == PRE_VALIDATION_REPORT_CACHE_ENABLED
+    )
+    sampling = (
+        arguments[PRE_VALIDATION_SAMPLING_FLAG] == PRE_VALIDATION_SAMPLING_ENABLED
+    )
     publisher_pc_pre_validation = (
         arguments[PUBLISHER_PC_PRE_VALIDATION_FLAG]
         == PUBLISHER_PC_PRE_VALIDATION_ENABLED
@@ -90,24 +146,33 @@ def main(argv: OptionalType[List[str]] = None) -> None:
         arguments[PARTNER_PC_PRE_VALIDATION_FLAG] == PARTNER_PC_PRE_VALIDATION_ENABLED
     )
 
-    validators = [
-        cast(
-            Validator,
-            InputDataValidator(
-                input_file_path=arguments[INPUT_FILE_PATH],
-                cloud_provider=arguments[CLOUD_PROVIDER],
-                region=arguments[REGION],
-                stream_file=stream_file,
-                publisher_pc_pre_validation=publisher_pc_pre_validation,
-                partner_pc_pre_validation=partner_pc_pre_validation,
-                private_computation_role=arguments[PRIVATE_COMPUTATION_ROLE],
-                start_timestamp=arguments[START_TIMESTAMP],
-                end_timestamp=arguments[END_TIMESTAMP],
-                access_key_id=arguments[ACCESS_KEY_ID],
-                access_key_data=arguments[ACCESS_KEY_DATA],
-            ),
-        ),
-        cast(
+    # The input data validators share the worker processes
+    with ProcessPoolExecutor(max_workers=MAX_PARALLELISM) as process_pool:
+
+        def create_input_data_validator(input_file_path: str) -> Validator:
+            return cast(
+                Validator,
+                InputDataValidator(
+                    input_file_path=input_file_path,
+                    cloud_provider=arguments[CLOUD_PROVIDER],
+                    region=arguments[REGION],
+                    stream_file=stream_file,
+                    publisher_pc_pre_validation=publisher_pc_pre_validation,
+                    partner_pc_pre_validation=partner_pc_pre_validation,
+                    private_computation_role=arguments[PRIVATE_COMPUTATION_ROLE],
+                    start_timestamp=arguments[START_TIMESTAMP],
+                    end_timestamp=arguments[END_TIMESTAMP],
+                    access_key_id=arguments[ACCESS_KEY_ID],
+                    access_key_data=arguments[ACCESS_KEY_DATA],
+                    mmap_file=mmap_file,
+                    checkpoint=checkpoint,
+                    report_cache=report_cache,
+                    process_pool=process_pool,
+                    sampling=sampling,
+                ),
+            )
+
+        binary_file_validator = cast(
             Validator,
             BinaryFileValidator(
                 region=arguments[REGION],
@@ -115,10 +180,25 @@ def main(argv: OptionalType[List[str]] = None) -> None:
                 access_key_data=arguments[ACCESS_KEY_DATA],
                 binary_version=arguments[BINARY_VERSION],
             ),
-        ),
-    ]
+        )
+
+        if arguments[INPUT_FILE_PATH]:
+            validators = [
+                create_input_data_validator(arguments[INPUT_FILE_PATH]),
+                binary_file_validator,
+            ]
+            (aggregated_result, aggregated_report) = run_validators(validators)
+        else:
+            input_file_validators = {
+                input_file_path: [create_input_data_validator(input_file_path)]
+                for input_file_path in get_input_file_paths(arguments)
+            }
+            (aggregated_result, aggregated_report) = run_batch_validators(
+                input_file_validators,
+                [binary_file_validator],
+                MAX_CONCURRENT_INPUT_FILES,
+            )
 
-    (aggregated_result, aggregated_report) = run_validators(validators)
     overall_result_str = f"Overall Validation Result: {aggregated_result.value}"
 
     if aggregated_result == ValidationResult.FAILED:
@@ -132,5 +212,44 @@ def main(argv: OptionalType[List[str]] = None) -> None:
         )
 
 
+def get_input_file_paths(arguments: Dict[str, Any]) -> List[str]:
+    if arguments[INPUT_FILE_PATHS]:
+        input_file_paths = [
+            input_file_path.strip()
+            for input_file_path in arguments[INPUT_FILE_PATHS].split(",")
+            if input_file_path.strip()
+        ]
+    else:
+        input_file_prefix = arguments[INPUT_FILE_PREFIX]
+        s3_path = S3Path(input_file_prefix)
+        storage_service = S3StorageService(
+            arguments[REGION], arguments[ACCESS_KEY_ID], arguments[ACCESS_KEY_DATA]
+        )
+        try:
+            keys = storage_service.list_files(input_file_prefix)
+        except KeyError:
+            # list_files reads the "Contents" of the listing, which is missing
+            # when there is no object under the prefix
+            keys = []
+        input_file_paths = [
+            f"https://{s3_path.bucket}.s3.{s3_path.region}.amazonaws.com/{key}"
+            for key in sorted(keys)
+            # Skip the folders and the objects written by the input data validator
+            if not key.endswith(
+                (
+                    "/",
+                    VALIDATION_CHECKPOINT_FILE_SUFFIX,
+                    VALIDATION_REPORT_CACHE_FILE_SUFFIX,
+                )
+            )
+        ]
+
+    if not input_file_paths:
+        raise Exception(
+            f"No input files found in {arguments[INPUT_FILE_PATHS] or arguments[INPUT_FILE_PREFIX]}"
+        )
+    return input_file_paths
+
+
 if __name__ == "__main__":
     main()
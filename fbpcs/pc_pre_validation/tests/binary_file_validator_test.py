@@ -55,7 +55,8 @@ class TestBinaryFileValidator(TestCase):
                 call(f"{DEFAULT_BINARY_REPOSITORY}package/1/latest/1"),
                 call(f"{DEFAULT_BINARY_REPOSITORY}package/2/latest/2"),
                 call(f"{DEFAULT_BINARY_REPOSITORY}package/3/latest/binary"),
-            ]
+            ],
+            any_order=True,
         )
 
     @patch("fbpcs.pc_pre_validation.binary_file_validator.S3StorageService")
@@ -71,7 +72,9 @@ class TestBinaryFileValidator(TestCase):
             },
         )
         storage_service_mock.__init__(return_value=storage_service_mock)
-        storage_service_mock.file_exists.side_effect = [False, True, True]
+        storage_service_mock.file_exists.side_effect = (
+            lambda path: path != f"{DEFAULT_BINARY_REPOSITORY}package/1/latest/1"
+        )
 
         validator = BinaryFileValidator(TEST_REGION, TEST_BINARY_INFOS)
         report = validator.validate()
@@ -94,15 +97,17 @@ class TestBinaryFileValidator(TestCase):
             },
         )
         storage_service_mock.__init__(return_value=storage_service_mock)
-        storage_service_mock.file_exists.side_effect = [
-            True,
-            True,
-            PcpError(
-                Exception(
-                    "An error occurred (403) when calling the HeadObject operation: Forbidden"
+
+        def file_exists(path: str) -> bool:
+            if path == f"{DEFAULT_BINARY_REPOSITORY}package/3/latest/binary":
+                raise PcpError(
+                    Exception(
+                        "An error occurred (403) when calling the HeadObject operation: Forbidden"
+                    )
                 )
-            ),
-        ]
+            return True
+
+        storage_service_mock.file_exists.side_effect = file_exists
         validator = BinaryFileValidator(TEST_REGION, TEST_BINARY_INFOS)
         report = validator.validate()
 
@@ -128,7 +133,9 @@ class TestBinaryFileValidator(TestCase):
         report = validator.validate()
 
         self.assertEqual(report, expected_report)
-        self.assertEqual(storage_service_mock.file_exists.call_count, 1)
+        self.assertEqual(
+            storage_service_mock.file_exists.call_count, len(TEST_BINARY_INFOS)
+        )
 
     @patch("os.path.exists")
     @patch("fbpcs.pc_pre_validation.binary_file_validator.S3StorageService")
@@ -196,7 +203,8 @@ class TestBinaryFileValidator(TestCase):
                 call("https://test-repo.com/package/1/latest/1"),
                 call("https://test-repo.com/package/2/latest/2"),
                 call("https://test-repo.com/package/3/latest/binary"),
-            ]
+            ],
+            any_order=True,
         )
 
     @patch("fbpcs.pc_pre_validation.binary_file_validator.S3StorageService")
@@ -224,7 +232,8 @@ class TestBinaryFileValidator(TestCase):
                 call(f"{DEFAULT_BINARY_REPOSITORY}package/1/canary/1"),
                 call(f"{DEFAULT_BINARY_REPOSITORY}package/2/canary/2"),
                 call(f"{DEFAULT_BINARY_REPOSITORY}package/3/canary/binary"),
-            ]
+            ],
+            any_order=True,
         )
 
     @patch("fbpcs.pc_pre_validation.binary_file_validator.S3StorageService")
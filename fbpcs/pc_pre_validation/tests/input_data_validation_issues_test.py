@@ -27,6 +27,17 @@ class InputDataValidationIssuesTest(TestCase):
         self.assertEqual(dict(issues.range_error_counter), {"field1": 2, "field2": 1})
         self.assertEqual(dict(issues.cohort_id_aggregates), {1: 2, 2: 1})
 
+    def test_count_multiple_issues(self) -> None:
+        issues = self._create_item()
+
+        issues.count_empty_field("field1", 3)
+        issues.count_format_error_field("field2", 2)
+        issues.count_format_out_of_range_field("field1", 4)
+
+        self.assertEqual(dict(issues.empty_counter), {"field1": 4})
+        self.assertEqual(dict(issues.format_error_counter), {"field1": 1, "field2": 2})
+        self.assertEqual(dict(issues.range_error_counter), {"field1": 5})
+
     def _create_item(self) -> InputDataValidationIssues:
         issues = InputDataValidationIssues()
         issues.empty_counter["field1"] += 1
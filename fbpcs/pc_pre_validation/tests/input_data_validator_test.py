@@ -4,9 +4,12 @@
 # LICENSE file in the root directory of this source tree.
 
 # pyre-strict
+import hashlib
+import json
 import os
 import random
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, Dict, Iterable
 from unittest import TestCase
 from unittest.mock import MagicMock, Mock, patch
@@ -18,6 +21,8 @@ from fbpcs.pc_pre_validation.constants import (
     INPUT_DATA_MAX_FILE_SIZE_IN_BYTES,
     INPUT_DATA_TMP_FILE_PATH,
     INPUT_DATA_VALIDATOR_NAME,
+    MAX_PARALLELISM,
+    MIN_CHUNK_SIZE,
     PA_FIELDS,
     PA_PUBLISHER_FIELDS,
     PL_FIELDS,
@@ -25,7 +30,12 @@ from fbpcs.pc_pre_validation.constants import (
     PRIVATE_ID_DFCA_FIELDS,
 )
 from fbpcs.pc_pre_validation.enums import ValidationResult
+from fbpcs.pc_pre_validation.exceptions import InputDataValidationException
+from fbpcs.pc_pre_validation.input_data_validation_issues import (
+    InputDataValidationIssues,
+)
 from fbpcs.pc_pre_validation.input_data_validator import InputDataValidator
+from fbpcs.pc_pre_validation.validation_checkpoint import ValidationCheckpoint
 from fbpcs.pc_pre_validation.validation_report import ValidationReport
 from fbpcs.private_computation.entity.cloud_provider import CloudProvider
 from fbpcs.private_computation.entity.private_computation_instance import (
@@ -77,6 +87,20 @@ class TestInputDataValidator(TestCase):
         with open(TEST_TEMP_FILEPATH, "wb") as tmp_csv_file:
             tmp_csv_file.writelines(lines)
 
+    def mock_s3_object(self, content: bytes) -> None:
+        def mock_get_object(Bucket: str, Key: str, Range: str) -> Dict[str, Any]:
+            stream_mock = MagicMock(name="stream_mock_obj")
+            if Range == "":
+                stream_mock.iter_lines.return_value = iter(
+                    content.splitlines(keepends=True)
+                )
+            else:
+                start, end = Range[len("bytes=") :].split("-")
+                stream_mock.read.return_value = content[int(start) : int(end) + 1]
+            return {"Body": stream_mock}
+
+        self._boto3_client_mock.get_object.side_effect = mock_get_object
+
     def test_initializing_the_validation_runner_fields(self) -> None:
         access_key_id = "id1"
         access_key_data = "data2"
@@ -1422,71 +1446,41 @@ class TestInputDataValidator(TestCase):
 
         self.assertEqual(report, expected_report)
 
+    @patch(
+        "fbpcs.pc_pre_validation.input_data_validator.STREAMING_LINE_TAIL_SIZE_IN_BYTES",
+        16,
+    )
+    @patch(
+        "fbpcs.pc_pre_validation.input_data_validator.STREAMING_PART_SIZE_IN_BYTES",
+        64,
+    )
+    @patch("fbpcs.pc_pre_validation.input_data_validator.MIN_CHUNK_SIZE", 100)
     def test_it_streams_the_file_when_streaming_is_enabled(self) -> None:
-        def mock_iter_lines(Bucket: str, Key: str, Range: str) -> Dict[str, Any]:
-            start_lines = [
-                b"id_,value,event_timestamp\n",
-            ]
-            start_lines.extend(
-                [
-                    b"abcd/1234+WXYZ=,25,1645157987\n",
-                    b"abcd/1234+WXYZ=,25,1645157987\n",
-                ]
-                * 5
-            )
-            start_lines.extend([b"end incomplete\n"])
-            mid_lines = [
-                b"start incomplete\n",
-            ]
-            mid_lines.extend(
-                [
-                    b"abcd/1234+WXYZ=,25,1645157987\n",
-                    b"abcd/1234+WXYZ=,25,1645157987\n",
-                ]
-                * 5
-            )
-            mid_lines.extend([b"end incomplete\n"])
-
-            end_lines = [
-                b"start incomplete\n",
+        lines = [b"id_,value,event_timestamp\n"]
+        lines.extend(
+            [
+                b"abcd/1234+WXYZ=,25,1645157987\n",
+                b"abcd/1234+WXYZ=,,1645157987\n",
+                b"abcdefghijklmnopqrstuvwxyz/1234+WXYZ=,1,1645157987\n",
             ]
-            end_lines.extend(
-                [
-                    b"abcd/1234+WXYZ=,25,1645157987\n",
-                    b"abcd/1234+WXYZ=,25,1645157987\n",
-                ]
-                * 5
-            )
-            stream_mock = MagicMock(name="stream_mock_obj")
-
-            if Range == "":
-                stream_mock.iter_lines.return_value = iter(start_lines)
-            elif Range == "bytes=0-9175039":
-                stream_mock.iter_lines.return_value = iter(start_lines)
-            elif Range == "bytes=9175040-18350079":
-                stream_mock.iter_lines.return_value = iter(mid_lines)
-            elif Range == "bytes=18350080-27525119":
-                stream_mock.iter_lines.return_value = iter(mid_lines)
-            elif Range == "bytes=27525120-36700159":
-                stream_mock.iter_lines.return_value = iter(end_lines)
-            else:
-                raise Exception(f"Unexpected range {Range}")
-
-            return {
-                "Body": stream_mock,
-                "ContentLength": 100,
-            }
-
-        self._boto3_client_mock.get_object.side_effect = mock_iter_lines
-
-        content_length = 35 * 1024 * 1024
-        self.storage_service_mock.get_file_size.return_value = content_length
+            * 13
+        )
+        content = b"".join(lines)
+        self.mock_s3_object(content)
+        self.storage_service_mock.get_file_size.return_value = len(content)
 
         expected_report = ValidationReport(
             validation_result=ValidationResult.SUCCESS,
             validator_name=INPUT_DATA_VALIDATOR_NAME,
-            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully",
-            details={"rows_processed_count": 39},
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully, with warnings on 'value'.",
+            details={
+                "rows_processed_count": 39,
+                "validation_warnings": {
+                    "value": {
+                        "empty_count": 13,
+                    },
+                },
+            },
         )
 
         validator = InputDataValidator(
@@ -1502,6 +1496,89 @@ class TestInputDataValidator(TestCase):
         report = validator.validate()
         self.assertEqual(report, expected_report)
 
+    @patch(
+        "fbpcs.pc_pre_validation.input_data_validator.STREAMING_LINE_TAIL_SIZE_IN_BYTES",
+        4,
+    )
+    @patch(
+        "fbpcs.pc_pre_validation.input_data_validator.STREAMING_PART_SIZE_IN_BYTES",
+        8,
+    )
+    def test_streamed_byte_ranges_cover_every_line_exactly_once(self) -> None:
+        header_line = b"id_,value,event_timestamp\n"
+        lines = [
+            b"abcd/1234+WXYZ=,25,1645157987\n",
+            b"a,,1\n",
+            b"abcdefghijklmnopqrstuvwxyzabcdefghijklmnopqrstuvwxyz,1,1645157987\n",
+            b"\n",
+            b"abcd=,10000000,1645157987\n",
+        ] * 3
+        # the last line does not end with a newline
+        lines.append(b"abcd=,1,1645157987")
+        content = header_line + b"".join(lines)
+        self.mock_s3_object(content)
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=True,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+        )
+        validator._file_size = len(content)
+        expected_line_ends = [
+            len(header_line) + len(b"".join(lines[: i + 1])) for i in range(len(lines))
+        ]
+
+        for num_ranges in (1, 2, 7, 16, len(content)):
+            boundaries = [
+                int(i * len(content) / num_ranges) for i in range(num_ranges + 1)
+            ]
+            streamed_lines = [
+                line
+                for start, end in zip(boundaries[:-1], boundaries[1:])
+                for line in validator._iter_streamed_lines(start, end)
+            ]
+            self.assertEqual(
+                streamed_lines,
+                list(zip([line.decode("utf-8") for line in lines], expected_line_ends)),
+            )
+
+    def test_split_byte_ranges_never_exceeds_max_parallelism(self) -> None:
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=True,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+        )
+        file_size = MAX_PARALLELISM * MIN_CHUNK_SIZE
+        # every worker timed out, and rows were appended since the checkpoint
+        remaining_byte_ranges = [
+            (i * MIN_CHUNK_SIZE + 1, (i + 1) * MIN_CHUNK_SIZE)
+            for i in range(MAX_PARALLELISM)
+        ] + [(file_size, 2 * file_size)]
+
+        split_byte_ranges = validator._split_byte_ranges(remaining_byte_ranges)
+
+        self.assertEqual(len(split_byte_ranges), MAX_PARALLELISM)
+        self.assertEqual(
+            sum(end - start for start, end in split_byte_ranges),
+            sum(end - start for start, end in remaining_byte_ranges),
+        )
+        self.assertEqual(validator._split_byte_ranges([(0, 1), (1, 2)]), [(0, 2)])
+        self.assertEqual(
+            len(
+                validator._split_byte_ranges(
+                    [(0, file_size), (file_size, 2 * file_size)]
+                )
+            ),
+            MAX_PARALLELISM,
+        )
+
     @patch("fbpcs.pc_pre_validation.input_data_validator.time")
     def test_streaming_preemptively_times_out_after_15_minutes(
         self, time_mock: Mock
@@ -1523,9 +1600,9 @@ class TestInputDataValidator(TestCase):
             message=expected_warning,
             details={"rows_processed_count": 100000},
         )
-        stream_mock = MagicMock(name="stream_mock_obj")
-        self._boto3_client_mock.get_object.return_value = {"Body": stream_mock}
-        stream_mock.iter_lines.side_effect = [iter(lines), iter(lines[1:])]
+        content = b"".join(lines)
+        self.mock_s3_object(content)
+        self.storage_service_mock.get_file_size.return_value = len(content)
         start_time = time.time()
         time_mock.time.side_effect = [
             start_time,
@@ -1546,6 +1623,346 @@ class TestInputDataValidator(TestCase):
         report = validator.validate()
         self.assertEqual(report, expected_report)
 
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_streaming_resumes_from_the_checkpoint_after_a_timeout(
+        self, time_mock: Mock
+    ) -> None:
+        lines = [b"id_,value,event_timestamp\n"]
+        lines.extend([b"abcd/1234+WXYZ=,,1645157987\n"] * 100002)
+        content = b"".join(lines)
+        self.mock_s3_object(content)
+        self.storage_service_mock.get_file_size.return_value = len(content)
+        self.storage_service_mock.file_exists.return_value = False
+        start_time = time.time()
+        time_mock.time.side_effect = [
+            start_time,
+            start_time,
+            start_time + 1200,
+        ]
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=True,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            checkpoint=True,
+        )
+        report = validator.validate()
+        self.assertEqual(report.details["rows_processed_count"], 100000)
+
+        checkpoint_path, checkpoint_json = self.storage_service_mock.write.call_args[0]
+        checkpoint = ValidationCheckpoint.from_json(checkpoint_json)
+        self.assertEqual(
+            checkpoint_path, f"{TEST_INPUT_FILE_PATH}.pre_validation_checkpoint.json"
+        )
+        self.assertEqual(checkpoint.rows_processed_count, 100000)
+        self.assertEqual(checkpoint.empty_counter, {"value": 100000})
+        self.assertEqual(
+            checkpoint.remaining_byte_ranges,
+            [(len(content) - 2 * len(lines[-1]), len(content))],
+        )
+
+        self.storage_service_mock.file_exists.return_value = True
+        self.storage_service_mock.read.return_value = checkpoint_json
+        time_mock.time.side_effect = None
+        time_mock.time.return_value = start_time
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully, with warnings on 'value'.",
+            details={
+                "rows_processed_count": 100002,
+                "validation_warnings": {
+                    "value": {
+                        "empty_count": 100002,
+                    },
+                },
+            },
+        )
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=True,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            checkpoint=True,
+        )
+        report = validator.validate()
+
+        self.assertEqual(report, expected_report)
+        _, checkpoint_json = self.storage_service_mock.write.call_args[0]
+        self.assertEqual(
+            ValidationCheckpoint.from_json(checkpoint_json).remaining_byte_ranges, []
+        )
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_streaming_with_a_checkpoint_only_validates_the_appended_rows(
+        self, time_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        lines = [b"id_,value,event_timestamp\n"]
+        lines.extend([b"abcd/1234+WXYZ=,25,1645157987\n"] * 10)
+        content = b"".join(lines)
+        appended_content = content + b"abcd/1234+WXYZ=,,1645157987\n" * 5
+        validation_issues = InputDataValidationIssues()
+        validation_issues.rows_processed_count = 10
+        checkpoint = ValidationCheckpoint.from_validation_issues(
+            settings=json.dumps(
+                [
+                    str(TEST_PRIVATE_COMPUTATION_ROLE),
+                    TEST_PUBLISHER_PC_PRE_VALIDATION,
+                    TEST_PARTNER_PC_PRE_VALIDATION,
+                    None,
+                    None,
+                ]
+            ),
+            header_row="id_,value,event_timestamp",
+            file_size=len(content),
+            fingerprint=hashlib.sha256(content).hexdigest(),
+            ends_with_newline=True,
+            remaining_byte_ranges=[],
+            validation_issues=validation_issues,
+        )
+        self.mock_s3_object(appended_content)
+        self.storage_service_mock.get_file_size.return_value = len(appended_content)
+        self.storage_service_mock.file_exists.return_value = True
+        self.storage_service_mock.read.return_value = checkpoint.to_json()
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully, with warnings on 'value'.",
+            details={
+                "rows_processed_count": 15,
+                "validation_warnings": {
+                    "value": {
+                        "empty_count": 5,
+                    },
+                },
+            },
+        )
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=True,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            checkpoint=True,
+        )
+        report = validator.validate()
+
+        self.assertEqual(report, expected_report)
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_streaming_ignores_the_checkpoint_of_a_different_file(
+        self, time_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        lines = [b"id_,value,event_timestamp\n"]
+        lines.extend([b"abcd/1234+WXYZ=,25,1645157987\n"] * 10)
+        content = b"".join(lines)
+        validation_issues = InputDataValidationIssues()
+        validation_issues.rows_processed_count = 10
+        checkpoint = ValidationCheckpoint.from_validation_issues(
+            settings=json.dumps(
+                [
+                    str(TEST_PRIVATE_COMPUTATION_ROLE),
+                    TEST_PUBLISHER_PC_PRE_VALIDATION,
+                    TEST_PARTNER_PC_PRE_VALIDATION,
+                    None,
+                    None,
+                ]
+            ),
+            header_row="id_,value,event_timestamp",
+            file_size=len(content),
+            fingerprint=hashlib.sha256(b"another file").hexdigest(),
+            ends_with_newline=True,
+            remaining_byte_ranges=[],
+            validation_issues=validation_issues,
+        )
+        self.mock_s3_object(content)
+        self.storage_service_mock.get_file_size.return_value = len(content)
+        self.storage_service_mock.file_exists.return_value = True
+        self.storage_service_mock.read.return_value = checkpoint.to_json()
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully",
+            details={
+                "rows_processed_count": 10,
+            },
+        )
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=True,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            checkpoint=True,
+        )
+        report = validator.validate()
+
+        self.assertEqual(report, expected_report)
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.ValidationReportCache")
+    def test_run_validations_returns_the_cached_report_without_reading_the_file(
+        self, report_cache_mock: Mock
+    ) -> None:
+        cached_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully",
+            details={"rows_processed_count": 1000},
+        )
+        report_cache_mock.return_value.get.return_value = cached_report
+        self._boto3_client_mock.head_object.return_value = {
+            "ETag": '"test-etag"',
+            "ContentLength": TEST_FILE_SIZE,
+        }
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            report_cache=True,
+        )
+        report = validator.validate()
+
+        self.assertEqual(report, cached_report)
+        report_cache_mock.assert_called_with(
+            self.storage_service_mock,
+            f"{TEST_INPUT_FILE_PATH}.pre_validation_report_cache.json",
+        )
+        self.assertIn("test-etag", report_cache_mock.return_value.get.call_args[0][0])
+        self.storage_service_mock.copy.assert_not_called()
+        self._boto3_client_mock.get_object.assert_not_called()
+        report_cache_mock.return_value.put.assert_not_called()
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.ValidationReportCache")
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_run_validations_caches_the_report_on_a_cache_miss(
+        self, time_mock: Mock, report_cache_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        report_cache_mock.return_value.get.return_value = None
+        self._boto3_client_mock.head_object.return_value = {
+            "ETag": '"test-etag"',
+            "ContentLength": TEST_FILE_SIZE,
+        }
+        self.write_lines_to_file(
+            [
+                b"id_,value,event_timestamp\n",
+                b"abcd/1234+WXYZ=,100,1645157987\n",
+            ]
+        )
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully",
+            details={"rows_processed_count": 1},
+        )
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            report_cache=True,
+        )
+        report = validator.validate()
+
+        self.assertEqual(report, expected_report)
+        cache_key = report_cache_mock.return_value.get.call_args[0][0]
+        report_cache_mock.return_value.put.assert_called_with(
+            cache_key, expected_report
+        )
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.ValidationReportCache")
+    def test_run_validations_does_not_cache_a_skipped_validation(
+        self, report_cache_mock: Mock
+    ) -> None:
+        report_cache_mock.return_value.get.return_value = None
+        self._boto3_client_mock.head_object.return_value = {
+            "ETag": '"test-etag"',
+            "ContentLength": INPUT_DATA_MAX_FILE_SIZE_IN_BYTES + 1,
+        }
+        self.storage_service_mock.get_file_size.return_value = (
+            INPUT_DATA_MAX_FILE_SIZE_IN_BYTES + 1
+        )
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            report_cache=True,
+        )
+        report = validator.validate()
+
+        self.assertIn("Skipped input_data validation", report.message)
+        report_cache_mock.return_value.put.assert_not_called()
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_run_validations_runs_the_workers_in_the_given_process_pool(
+        self, time_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        self.write_lines_to_file(
+            [
+                b"id_,value,event_timestamp\n",
+                b"abcd/1234+WXYZ=,100,1645157987\n",
+                b"abcd/1234+WXYZ=,,1645157987\n",
+            ]
+        )
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully, with warnings on 'value'.",
+            details={
+                "rows_processed_count": 2,
+                "validation_warnings": {
+                    "value": {
+                        "empty_count": 1,
+                    },
+                },
+            },
+        )
+
+        with ProcessPoolExecutor(max_workers=2) as process_pool:
+            for _ in range(2):
+                validator = InputDataValidator(
+                    input_file_path=TEST_INPUT_FILE_PATH,
+                    cloud_provider=TEST_CLOUD_PROVIDER,
+                    region=TEST_REGION,
+                    stream_file=TEST_STREAM_FILE,
+                    publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+                    partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+                    private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+                    process_pool=process_pool,
+                )
+                report = validator.validate()
+
+                self.assertEqual(report, expected_report)
+
     # def test_the_aggregated_value_per_cohort_cannot_exceed_max_int_for_pl(self) -> None:
     #     def mock_iter_lines(Bucket: str, Key: str, Range: str) -> Dict[str, Any]:
     #         lines1 = [
@@ -1824,3 +2241,292 @@ class TestInputDataValidator(TestCase):
         )
         report = validator.validate()
         self.assertEqual(report, expected_report)
+
+    def test_validate_lines_counts_the_same_issues_as_validate_line(self) -> None:
+        header_row = "id_,value,event_timestamp,cohort_id,id_email"
+        plain_lines = [
+            "abcd/1234+WXYZ=,100,1645157987,0,abcd\n",
+            "abcd/1234+WXYZ=,,1645157987,1,\n",
+            " ,2147483648,1545157987,0,a!\n",
+            "abcd/1234+WXYZ=,$100,1745157987,2,abcd\n",
+            "abcd/1234+WXYZ=,100,16451,1,abcd",
+        ]
+        quoted_lines = [
+            '"abcd/1234+WXYZ=",100,1645157987,0,abcd\n',
+            '"",2147483648,"1745157987",3,abcd\n',
+        ]
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            start_timestamp="1600000000",
+            end_timestamp="1700000000",
+        )
+
+        for lines in (plain_lines, plain_lines[:2] + quoted_lines + plain_lines[2:]):
+            row_issues = InputDataValidationIssues()
+            row_cohort_id_set = set()
+            for line in lines:
+                validator._validate_line(
+                    header_row, line, row_issues, row_cohort_id_set
+                )
+            batch_issues = InputDataValidationIssues()
+            batch_cohort_id_set = set()
+
+            validator._validate_lines(
+                header_row, lines, batch_issues, batch_cohort_id_set
+            )
+
+            self.assertEqual(batch_issues.empty_counter, row_issues.empty_counter)
+            self.assertEqual(
+                batch_issues.format_error_counter, row_issues.format_error_counter
+            )
+            self.assertEqual(
+                batch_issues.range_error_counter, row_issues.range_error_counter
+            )
+            self.assertEqual(batch_cohort_id_set, row_cohort_id_set)
+            self.assertEqual(batch_issues.rows_processed_count, len(lines))
+
+    def test_validate_lines_stops_at_the_first_line_with_an_error(self) -> None:
+        header_row = "id_,value,event_timestamp"
+        lines = [
+            "abcd/1234+WXYZ=,100,1645157987\n",
+            "abcd/1234+WXYZ=,100,1645157987\n",
+            "abcd/1234+WXYZ=,100,1645157987 \n",
+            "abcd/1234+WXYZ=,100,1645157987\n",
+        ]
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+        )
+        validation_issues = InputDataValidationIssues()
+
+        with self.assertRaisesRegex(
+            InputDataValidationException, "Detected an unexpected line ending"
+        ):
+            validator._validate_lines(header_row, lines, validation_issues, set())
+
+        self.assertEqual(validation_issues.rows_processed_count, 2)
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.shutil.disk_usage")
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_run_validations_with_mmap_when_the_file_is_larger_than_the_download_limit(
+        self, time_mock: Mock, disk_usage_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        disk_usage_mock.return_value.free = 2 * INPUT_DATA_MAX_FILE_SIZE_IN_BYTES
+        self.storage_service_mock.get_file_size.return_value = (
+            INPUT_DATA_MAX_FILE_SIZE_IN_BYTES + 1
+        )
+        lines = [
+            b"id_,value,event_timestamp\n",
+        ]
+        lines.extend(
+            [
+                b"abcd/1234+WXYZ=,100,1645157987\n",
+                b"abcd/1234+WXYZ=,,1645157987\n",
+            ]
+            * 5000
+        )
+        self.write_lines_to_file(lines)
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully, with warnings on 'value'.",
+            details={
+                "rows_processed_count": 10000,
+                "validation_warnings": {
+                    "value": {
+                        "empty_count": 5000,
+                    },
+                },
+            },
+        )
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            mmap_file=True,
+        )
+        report = validator.validate()
+
+        self.storage_service_mock.copy.assert_called_with(
+            TEST_INPUT_FILE_PATH, TEST_TEMP_FILEPATH
+        )
+        self.assertEqual(report, expected_report)
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.shutil.disk_usage")
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_run_validations_with_mmap_skips_when_there_is_not_enough_disk_space(
+        self, time_mock: Mock, disk_usage_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        disk_usage_mock.return_value.free = 1024 * 1024 * 1024
+        self.storage_service_mock.get_file_size.return_value = 99567123432
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=" ".join(
+                [
+                    f"WARNING: File: {TEST_INPUT_FILE_PATH} is too large to download.",
+                    "The available disk space is 1024 MB.",
+                    "Skipped input_data validation. completed validation successfully",
+                ]
+            ),
+            details={
+                "rows_processed_count": 0,
+            },
+        )
+
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            mmap_file=True,
+        )
+        report = validator.validate()
+
+        self.storage_service_mock.copy.assert_not_called()
+        self.assertEqual(report, expected_report)
+
+    @patch("fbpcs.pc_pre_validation.input_data_validator.time")
+    def test_create_byte_ranges_splits_the_file_on_line_endings(
+        self, time_mock: Mock
+    ) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        header_line = b"id_,value,event_timestamp\n"
+        lines = [
+            b"abcd/1234+WXYZ=,100,1645157987\n",
+            b"abcd/1234+WXYZ=,1,1645157987\n",
+            b"abcd=,10000000,1645157987\n",
+        ] * 7
+        self.write_lines_to_file([header_line] + lines)
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=TEST_STREAM_FILE,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            mmap_file=True,
+        )
+        validator._parallelism = 4
+
+        validator._create_byte_ranges()
+
+        self.assertEqual(len(validator._byte_ranges), 4)
+        with open(TEST_TEMP_FILEPATH, "rb") as f:
+            content = f.read()
+        self.assertEqual(validator._byte_ranges[0][0], len(header_line))
+        self.assertEqual(validator._byte_ranges[-1][1], len(content))
+        for (_, end), (start, _) in zip(
+            validator._byte_ranges[:-1], validator._byte_ranges[1:]
+        ):
+            self.assertEqual(end, start)
+            self.assertEqual(content[start - 1 : start], b"\n")
+        self.assertEqual(
+            b"".join(content[start:end] for start, end in validator._byte_ranges),
+            b"".join(lines),
+        )
+
+    @patch(
+        "fbpcs.pc_pre_validation.input_data_validator.SAMPLING_SAMPLE_SIZE_IN_BYTES",
+        1000,
+    )
+    @patch("fbpcs.pc_pre_validation.input_data_validator.SAMPLING_NUM_SAMPLES", 4)
+    def test_sampling_extrapolates_the_issues_of_the_samples(self) -> None:
+        lines = [b"id_,value,event_timestamp\n"]
+        lines.extend(
+            [b"abcd/1234+WXYZ=,10,1645157987\n", b"abcd/1234+WXYZ=,10,abc\n"] * 5000
+        )
+        content = b"".join(lines)
+        self.mock_s3_object(content)
+        self.storage_service_mock.get_file_size.return_value = len(content)
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=False,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            sampling=True,
+        )
+
+        report = validator.validate()
+
+        rows_processed_count = report.details["rows_processed_count"]
+        sampling_details = report.details["sampling"]
+        estimate = sampling_details["issue_rates"]["event_timestamp"][
+            "bad_format_count"
+        ]
+        self.assertEqual(report.validation_result, ValidationResult.FAILED)
+        self.assertIn(
+            f"(sampled {rows_processed_count} of an estimated", report.message
+        )
+        self.assertLess(rows_processed_count, 200)
+        self.assertAlmostEqual(
+            sampling_details["estimated_rows_count"], 10000, delta=500
+        )
+        self.assertAlmostEqual(estimate["rate"], 0.5, delta=0.05)
+        self.assertLessEqual(estimate["rate_lower_bound"], estimate["rate"])
+        self.assertGreaterEqual(estimate["rate_upper_bound"], estimate["rate"])
+        self.assertEqual(
+            report.details["validation_errors"]["event_timestamp"]["bad_format_count"],
+            estimate["count"],
+        )
+        self.assertFalse(validator._validated_all_rows)
+
+    @patch(
+        "fbpcs.pc_pre_validation.input_data_validator.SAMPLING_SAMPLE_SIZE_IN_BYTES",
+        1000,
+    )
+    @patch("fbpcs.pc_pre_validation.input_data_validator.SAMPLING_NUM_SAMPLES", 4)
+    def test_sampling_validates_small_files_entirely(self) -> None:
+        lines = [b"id_,value,event_timestamp\n"]
+        lines.extend([b"abcd/1234+WXYZ=,10,1645157987\n"] * 10)
+        content = b"".join(lines)
+        self.mock_s3_object(content)
+        self.storage_service_mock.get_file_size.return_value = len(content)
+        expected_report = ValidationReport(
+            validation_result=ValidationResult.SUCCESS,
+            validator_name=INPUT_DATA_VALIDATOR_NAME,
+            message=f"File: {TEST_INPUT_FILE_PATH} completed validation successfully",
+            details={
+                "rows_processed_count": 10,
+            },
+        )
+        validator = InputDataValidator(
+            input_file_path=TEST_INPUT_FILE_PATH,
+            cloud_provider=TEST_CLOUD_PROVIDER,
+            region=TEST_REGION,
+            stream_file=False,
+            publisher_pc_pre_validation=TEST_PUBLISHER_PC_PRE_VALIDATION,
+            partner_pc_pre_validation=TEST_PARTNER_PC_PRE_VALIDATION,
+            private_computation_role=TEST_PRIVATE_COMPUTATION_ROLE,
+            sampling=True,
+        )
+
+        report = validator.validate()
+
+        self.assertEqual(report, expected_report)
+        self.assertTrue(validator._validated_all_rows)
@@ -9,6 +9,7 @@ from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from fbpcs.pc_pre_validation import pc_pre_validation_cli as validation_cli
+from fbpcs.pc_pre_validation.constants import MAX_CONCURRENT_INPUT_FILES
 from fbpcs.pc_pre_validation.enums import ValidationResult
 from fbpcs.private_computation.entity.cloud_provider import CloudProvider
 from fbpcs.private_computation.entity.private_computation_instance import (
@@ -18,6 +19,7 @@ from fbpcs.private_computation.entity.private_computation_instance import (
 
 class TestPCPreValidationCLI(TestCase):
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.print")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.ProcessPoolExecutor")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.InputDataValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.BinaryFileValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.run_validators")
@@ -26,6 +28,7 @@ class TestPCPreValidationCLI(TestCase):
         run_validators_mock: Mock,
         binary_file_validator_mock: Mock,
         input_data_validator_mock: Mock,
+        process_pool_executor_mock: Mock,
         _print_mock: Mock,
     ) -> None:
         aggregated_result = ValidationResult.SUCCESS
@@ -55,6 +58,11 @@ class TestPCPreValidationCLI(TestCase):
             end_timestamp=None,
             access_key_id=None,
             access_key_data=None,
+            mmap_file=False,
+            checkpoint=False,
+            report_cache=False,
+            process_pool=process_pool_executor_mock().__enter__(),
+            sampling=False,
         )
         binary_file_validator_mock.assert_called_with(
             region=expected_region,
@@ -67,6 +75,7 @@ class TestPCPreValidationCLI(TestCase):
         )
 
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.print")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.ProcessPoolExecutor")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.InputDataValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.BinaryFileValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.run_validators")
@@ -75,6 +84,7 @@ class TestPCPreValidationCLI(TestCase):
         run_validators_mock: Mock,
         binary_file_validator_mock: Mock,
         input_data_validator_mock: Mock,
+        process_pool_executor_mock: Mock,
         _print_mock: Mock,
     ) -> None:
         aggregated_result = ValidationResult.SUCCESS
@@ -103,6 +113,10 @@ class TestPCPreValidationCLI(TestCase):
             f"--binary-version={expected_binary_version}",
             f"--private-computation-role={expected_pc_computation_role}",
             "--pre-validation-file-stream=enabled",
+            "--pre-validation-file-mmap=enabled",
+            "--pre-validation-checkpoint=enabled",
+            "--pre-validation-report-cache=enabled",
+            "--pre-validation-sampling=enabled",
             "--publisher-pc-pre-validation=enabled",
             "--partner-pc-pre-validation=enabled",
         ]
@@ -121,6 +135,11 @@ class TestPCPreValidationCLI(TestCase):
             end_timestamp=expected_end_timestamp,
             access_key_id=expected_access_key_id,
             access_key_data=expected_access_key_data,
+            mmap_file=True,
+            checkpoint=True,
+            report_cache=True,
+            process_pool=process_pool_executor_mock().__enter__(),
+            sampling=True,
         )
         binary_file_validator_mock.assert_called_with(
             region=expected_region,
@@ -133,6 +152,7 @@ class TestPCPreValidationCLI(TestCase):
         )
 
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.print")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.ProcessPoolExecutor")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.InputDataValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.BinaryFileValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.run_validators")
@@ -141,6 +161,7 @@ class TestPCPreValidationCLI(TestCase):
         run_validators_mock: Mock,
         binary_file_validator_mock: Mock,
         input_data_validator_mock: Mock,
+        _process_pool_executor_mock: Mock,
         _print_mock: Mock,
     ) -> None:
         aggregated_result = ValidationResult.FAILED
@@ -159,6 +180,7 @@ class TestPCPreValidationCLI(TestCase):
             validation_cli.main(argv)
 
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.print")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.ProcessPoolExecutor")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.InputDataValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.BinaryFileValidator")
     @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.run_validators")
@@ -167,6 +189,7 @@ class TestPCPreValidationCLI(TestCase):
         run_validators_mock: Mock,
         binary_file_validator_mock: Mock,
         input_data_validator_mock: Mock,
+        _process_pool_executor_mock: Mock,
         print_mock: Mock,
     ) -> None:
         aggregated_result = ValidationResult.SUCCESS
@@ -185,3 +208,99 @@ class TestPCPreValidationCLI(TestCase):
 
         print_str = str(print_mock.call_args[0])
         self.assertRegex(print_str, expected_overall_result_str)
+
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.print")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.ProcessPoolExecutor")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.InputDataValidator")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.BinaryFileValidator")
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.run_batch_validators")
+    def test_batch_mode_validates_each_input_file_and_the_binaries_once(
+        self,
+        run_batch_validators_mock: Mock,
+        binary_file_validator_mock: Mock,
+        input_data_validator_mock: Mock,
+        _process_pool_executor_mock: Mock,
+        _print_mock: Mock,
+    ) -> None:
+        run_batch_validators_mock.return_value = (
+            ValidationResult.SUCCESS,
+            "Aggregated report...",
+        )
+        input_file_paths = [
+            "https://test/input-file-path0",
+            "https://test/input-file-path1",
+        ]
+        argv = [
+            f"--input-file-paths={','.join(input_file_paths)}",
+            "--cloud-provider=AWS",
+            "--region=region1",
+        ]
+
+        validation_cli.main(argv)
+
+        self.assertEqual(
+            [
+                call.kwargs["input_file_path"]
+                for call in input_data_validator_mock.call_args_list
+            ],
+            input_file_paths,
+        )
+        binary_file_validator_mock.assert_called_once()
+        run_batch_validators_mock.assert_called_with(
+            {
+                input_file_path: [input_data_validator_mock()]
+                for input_file_path in input_file_paths
+            },
+            [binary_file_validator_mock()],
+            MAX_CONCURRENT_INPUT_FILES,
+        )
+
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.S3StorageService")
+    def test_get_input_file_paths_lists_the_files_under_the_prefix(
+        self, storage_service_mock: Mock
+    ) -> None:
+        storage_service_mock.return_value.list_files.return_value = [
+            "inputs/file-1.csv",
+            "inputs/file-0.csv",
+            "inputs/folder/",
+            "inputs/file-0.csv.pre_validation_checkpoint.json",
+            "inputs/file-0.csv.pre_validation_report_cache.json",
+        ]
+
+        input_file_paths = validation_cli.get_input_file_paths(
+            {
+                validation_cli.INPUT_FILE_PATHS: None,
+                validation_cli.INPUT_FILE_PREFIX: "https://test-bucket.s3.us-west-2.amazonaws.com/inputs/",
+                validation_cli.REGION: "us-west-2",
+                validation_cli.ACCESS_KEY_ID: None,
+                validation_cli.ACCESS_KEY_DATA: None,
+            }
+        )
+
+        self.assertEqual(
+            input_file_paths,
+            [
+                "https://test-bucket.s3.us-west-2.amazonaws.com/inputs/file-0.csv",
+                "https://test-bucket.s3.us-west-2.amazonaws.com/inputs/file-1.csv",
+            ],
+        )
+
+    @patch("fbpcs.pc_pre_validation.pc_pre_validation_cli.S3StorageService")
+    def test_get_input_file_paths_with_an_empty_prefix(
+        self, storage_service_mock: Mock
+    ) -> None:
+        storage_service_mock.return_value.list_files.side_effect = KeyError("Contents")
+        input_file_prefix = "https://test-bucket.s3.us-west-2.amazonaws.com/inputs/"
+
+        with self.assertRaisesRegex(
+            Exception, f"No input files found in {input_file_prefix}"
+        ):
+            validation_cli.get_input_file_paths(
+                {
+                    validation_cli.INPUT_FILE_PATHS: None,
+                    validation_cli.INPUT_FILE_PREFIX: input_file_prefix,
+                    validation_cli.REGION: "us-west-2",
+                    validation_cli.ACCESS_KEY_ID: None,
+                    validation_cli.ACCESS_KEY_DATA: None,
+                }
+            )
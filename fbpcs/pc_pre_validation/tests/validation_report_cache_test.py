@@ -0,0 +1,74 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+from typing import Dict
+from unittest import TestCase
+from unittest.mock import MagicMock, Mock, patch
+
+from fbpcs.pc_pre_validation.enums import ValidationResult
+from fbpcs.pc_pre_validation.validation_report import ValidationReport
+from fbpcs.pc_pre_validation.validation_report_cache import ValidationReportCache
+
+TEST_CACHE_PATH = "s3://test-bucket/test-file.csv.pre_validation_report_cache.json"
+TEST_TIMESTAMP = 1650000000.0
+
+
+class TestValidationReportCache(TestCase):
+    def setUp(self) -> None:
+        self.objects: Dict[str, str] = {}
+        storage_service = MagicMock()
+        storage_service.file_exists.side_effect = lambda path: path in self.objects
+        storage_service.read.side_effect = lambda path: self.objects[path]
+        storage_service.write.side_effect = self.objects.__setitem__
+        self.cache = ValidationReportCache(
+            storage_service, TEST_CACHE_PATH, ttl_in_seconds=100, max_entries=2
+        )
+
+    def _report(self, message: str) -> ValidationReport:
+        return ValidationReport(
+            validation_result=ValidationResult.FAILED,
+            validator_name="test_validator_name",
+            message=message,
+            details={"rows_processed_count": 5},
+        )
+
+    @patch("fbpcs.pc_pre_validation.validation_report_cache.time")
+    def test_get_returns_the_report_that_was_put(self, time_mock: Mock) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        self.cache.put("key", self._report("message"))
+
+        self.assertEqual(self.cache.get("key"), self._report("message"))
+        self.assertIsNone(self.cache.get("another key"))
+
+    @patch("fbpcs.pc_pre_validation.validation_report_cache.time")
+    def test_get_does_not_return_expired_reports(self, time_mock: Mock) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        self.cache.put("key", self._report("message"))
+
+        time_mock.time.return_value = TEST_TIMESTAMP + 101
+        self.assertIsNone(self.cache.get("key"))
+
+    @patch("fbpcs.pc_pre_validation.validation_report_cache.time")
+    def test_put_evicts_the_least_recently_used_report(self, time_mock: Mock) -> None:
+        time_mock.time.return_value = TEST_TIMESTAMP
+        self.cache.put("key 1", self._report("message 1"))
+        time_mock.time.return_value = TEST_TIMESTAMP + 1
+        self.cache.put("key 2", self._report("message 2"))
+        time_mock.time.return_value = TEST_TIMESTAMP + 2
+        self.cache.get("key 1")
+
+        time_mock.time.return_value = TEST_TIMESTAMP + 3
+        self.cache.put("key 3", self._report("message 3"))
+
+        self.assertEqual(self.cache.get("key 1"), self._report("message 1"))
+        self.assertIsNone(self.cache.get("key 2"))
+        self.assertEqual(self.cache.get("key 3"), self._report("message 3"))
+
+    def test_get_ignores_a_cache_that_cannot_be_parsed(self) -> None:
+        self.objects[TEST_CACHE_PATH] = "not json"
+
+        self.assertIsNone(self.cache.get("key"))
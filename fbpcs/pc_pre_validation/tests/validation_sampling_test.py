@@ -0,0 +1,60 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from fbpcs.pc_pre_validation.validation_sampling import (
+    estimate_issue_rate,
+    get_sample_byte_ranges,
+    IssueRateEstimate,
+)
+
+
+class TestValidationSampling(TestCase):
+    @patch("fbpcs.pc_pre_validation.validation_sampling.random")
+    def test_get_sample_byte_ranges_draws_one_range_in_each_stratum(
+        self, random_mock: Mock
+    ) -> None:
+        random_mock.randint.side_effect = lambda a, b: b
+
+        sample_byte_ranges = get_sample_byte_ranges(0, 1000, 4, 100)
+
+        self.assertEqual(
+            sample_byte_ranges, [(150, 250), (400, 500), (650, 750), (900, 1000)]
+        )
+
+    def test_get_sample_byte_ranges_stays_in_strata_smaller_than_the_samples(
+        self,
+    ) -> None:
+        sample_byte_ranges = get_sample_byte_ranges(10, 110, 4, 100)
+
+        self.assertEqual(sample_byte_ranges, [(10, 35), (35, 60), (60, 85), (85, 110)])
+
+    def test_estimate_issue_rate(self) -> None:
+        estimate = estimate_issue_rate([1, 3, 2, 2], [10, 10, 10, 10], 0.0, 1000)
+
+        self.assertEqual(estimate.count, 200)
+        self.assertAlmostEqual(estimate.rate, 0.2)
+        # The standard error of the rate is sqrt(2 / (4 * 3 * 100)) = 0.0408
+        self.assertAlmostEqual(estimate.rate_lower_bound, 0.2 - 1.96 * 0.040825, 4)
+        self.assertAlmostEqual(estimate.rate_upper_bound, 0.2 + 1.96 * 0.040825, 4)
+
+    def test_estimate_issue_rate_counts_at_least_the_issues_found(self) -> None:
+        estimate = estimate_issue_rate([1, 0], [10, 10], 1.0, 5)
+
+        self.assertEqual(estimate.count, 1)
+        self.assertEqual(estimate.rate_lower_bound, estimate.rate)
+        self.assertEqual(estimate.rate_upper_bound, estimate.rate)
+
+    def test_estimate_issue_rate_without_rows(self) -> None:
+        self.assertEqual(
+            estimate_issue_rate([0], [0], 0.5, 0),
+            IssueRateEstimate(
+                count=0, rate=0.0, rate_lower_bound=0.0, rate_upper_bound=0.0
+            ),
+        )
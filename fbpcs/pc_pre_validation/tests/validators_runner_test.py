@@ -10,7 +10,10 @@ from unittest import TestCase
 from fbpcs.pc_pre_validation.enums import ValidationResult
 from fbpcs.pc_pre_validation.validation_report import ValidationReport
 from fbpcs.pc_pre_validation.validator import Validator
-from fbpcs.pc_pre_validation.validators_runner import run_validators
+from fbpcs.pc_pre_validation.validators_runner import (
+    run_batch_validators,
+    run_validators,
+)
 
 
 class TestDummyValidator(Validator):
@@ -115,3 +118,27 @@ class TestValidationReport(TestCase):
 
         self.assertEqual(expected_aggregated_result, actual_result)
         self.assertEqual(expected_aggregated_report, actual_report)
+
+    def test_run_batch_validators_reports_each_input_file_then_the_batch(
+        self,
+    ) -> None:
+        expected_aggregated_result = ValidationResult.FAILED
+        expected_aggregated_report = "\n\n\n".join(
+            [
+                f"Input file: test-path-1\n\n{TEST_SUCCESSFUL_REPORT_1}",
+                f"Input file: test-path-2\n\n{TEST_FAILED_REPORT_1}",
+                f"All input files\n\n{TEST_SUCCESSFUL_REPORT_2}",
+            ]
+        )
+
+        (actual_result, actual_report) = run_batch_validators(
+            {
+                "test-path-1": [TestDummyValidator(TEST_SUCCESSFUL_REPORT_1)],
+                "test-path-2": [TestDummyValidator(TEST_FAILED_REPORT_1)],
+            },
+            [TestDummyValidator(TEST_SUCCESSFUL_REPORT_2)],
+            max_concurrent_input_files=2,
+        )
+
+        self.assertEqual(expected_aggregated_result, actual_result)
+        self.assertEqual(expected_aggregated_report, actual_report)
@@ -0,0 +1,94 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""
+The progress of a streaming input data validation, persisted next to the input file.
+
+A later run over the same file (or the same file with rows appended to it)
+restores the counters and only validates the byte ranges that are left.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from dataclasses_json import dataclass_json
+from fbpcs.pc_pre_validation.input_data_validation_issues import (
+    InputDataValidationIssues,
+)
+
+VALIDATION_CHECKPOINT_VERSION = 1
+
+
+@dataclass_json
+@dataclass
+class ValidationCheckpoint:
+    # The validator settings the counters were computed with
+    settings: str
+    header_row: str
+    file_size: int
+    # sha256 of the last VALIDATION_CHECKPOINT_FINGERPRINT_SIZE_IN_BYTES bytes of the file
+    fingerprint: str
+    ends_with_newline: bool
+    # [start, end) byte ranges whose lines have not been validated yet
+    remaining_byte_ranges: List[Tuple[int, int]]
+    rows_processed_count: int
+    empty_counter: Dict[str, int]
+    format_error_counter: Dict[str, int]
+    range_error_counter: Dict[str, int]
+    cohort_id_aggregates: Dict[str, int]
+    cohort_ids: List[int]
+    version: int = VALIDATION_CHECKPOINT_VERSION
+
+    @classmethod
+    def from_validation_issues(
+        cls,
+        settings: str,
+        header_row: str,
+        file_size: int,
+        fingerprint: str,
+        ends_with_newline: bool,
+        remaining_byte_ranges: Sequence[Tuple[int, int]],
+        validation_issues: InputDataValidationIssues,
+    ) -> "ValidationCheckpoint":
+        return cls(
+            settings=settings,
+            header_row=header_row,
+            file_size=file_size,
+            fingerprint=fingerprint,
+            ends_with_newline=ends_with_newline,
+            remaining_byte_ranges=sorted(remaining_byte_ranges),
+            rows_processed_count=validation_issues.rows_processed_count,
+            empty_counter=dict(validation_issues.empty_counter),
+            format_error_counter=dict(validation_issues.format_error_counter),
+            range_error_counter=dict(validation_issues.range_error_counter),
+            cohort_id_aggregates={
+                str(cohort_id): value
+                for cohort_id, value in validation_issues.cohort_id_aggregates.items()
+            },
+            cohort_ids=sorted(validation_issues.cohort_id_set),
+        )
+
+    def restore_validation_issues(
+        self, validation_issues: InputDataValidationIssues
+    ) -> None:
+        """
+        Add the counters of the checkpointed run to validation_issues.
+        """
+        checkpointed_issues = InputDataValidationIssues()
+        checkpointed_issues.empty_counter = Counter(self.empty_counter)
+        checkpointed_issues.format_error_counter = Counter(self.format_error_counter)
+        checkpointed_issues.range_error_counter = Counter(self.range_error_counter)
+        checkpointed_issues.cohort_id_aggregates = Counter(
+            {
+                int(cohort_id): value
+                for cohort_id, value in self.cohort_id_aggregates.items()
+            }
+        )
+        validation_issues.merge(checkpointed_issues)
+        validation_issues.rows_processed_count += self.rows_processed_count
+        validation_issues.cohort_id_set |= set(self.cohort_ids)
@@ -0,0 +1,108 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""
+A cache of input data validation reports, persisted in a single storage object.
+
+Entries expire VALIDATION_REPORT_CACHE_TTL_IN_SECONDS after they were stored,
+and the least recently used ones are evicted beyond VALIDATION_REPORT_CACHE_MAX_ENTRIES.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from botocore.exceptions import ClientError
+from dataclasses_json import dataclass_json
+from fbpcp.service.storage import StorageService
+from fbpcs.pc_pre_validation.constants import (
+    VALIDATION_REPORT_CACHE_MAX_ENTRIES,
+    VALIDATION_REPORT_CACHE_TTL_IN_SECONDS,
+)
+from fbpcs.pc_pre_validation.validation_report import ValidationReport
+
+# Bump when a change to the validations can change the report of the same file
+VALIDATION_REPORT_CACHE_VERSION = 1
+
+
+@dataclass_json
+@dataclass
+class ValidationReportCacheEntry:
+    report: ValidationReport
+    created_at: float
+    last_used_at: float
+
+
+class ValidationReportCache:
+    def __init__(
+        self,
+        storage_service: StorageService,
+        path: str,
+        ttl_in_seconds: int = VALIDATION_REPORT_CACHE_TTL_IN_SECONDS,
+        max_entries: int = VALIDATION_REPORT_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self._storage_service = storage_service
+        self._path = path
+        self._ttl_in_seconds = ttl_in_seconds
+        self._max_entries = max_entries
+
+    def get(self, key: str) -> Optional[ValidationReport]:
+        entries = self._read_entries()
+        entry = entries.get(key)
+        if not entry:
+            return None
+        entry.last_used_at = time.time()
+        self._write_entries(entries)
+        return entry.report
+
+    def put(self, key: str, report: ValidationReport) -> None:
+        entries = self._read_entries()
+        now = time.time()
+        entries[key] = ValidationReportCacheEntry(
+            report=report, created_at=now, last_used_at=now
+        )
+        self._write_entries(entries)
+
+    def _read_entries(self) -> Dict[str, ValidationReportCacheEntry]:
+        """Returns the entries that did not expire, the cache being empty when it can't be read"""
+        try:
+            if not self._storage_service.file_exists(self._path):
+                return {}
+            cache = json.loads(self._storage_service.read(self._path))
+            if cache.get("version") != VALIDATION_REPORT_CACHE_VERSION:
+                return {}
+            entries = {
+                key: ValidationReportCacheEntry.from_dict(entry)
+                for key, entry in cache["entries"].items()
+            }
+        except (ClientError, KeyError, TypeError, ValueError):
+            return {}
+
+        expired_at = time.time() - self._ttl_in_seconds
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if entry.created_at > expired_at
+        }
+
+    def _write_entries(self, entries: Dict[str, ValidationReportCacheEntry]) -> None:
+        least_recently_used_first = sorted(
+            entries.items(), key=lambda item: item[1].last_used_at
+        )
+        cache = {
+            "version": VALIDATION_REPORT_CACHE_VERSION,
+            "entries": {
+                key: entry.to_dict(encode_json=True)
+                for key, entry in least_recently_used_first[-self._max_entries :]
+            },
+        }
+        try:
+            self._storage_service.write(self._path, json.dumps(cache))
+        except ClientError:
+            # A cache that can't be written only costs a validation on the next run
+            pass
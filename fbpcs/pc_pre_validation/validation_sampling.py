@@ -0,0 +1,101 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""
+Estimates of the input data validation issues of a file, from random samples of it.
+
+The file is split into SAMPLING_NUM_SAMPLES strata of equal size, and a byte
+range of SAMPLING_SAMPLE_SIZE_IN_BYTES is drawn uniformly at random in each one.
+A sample validates the lines starting in its byte range, so every row of the
+file has the same chance to be sampled, whatever its length.
+
+The rows of a sample are not independent draws, the variance of the issue rates
+is estimated from the spread between the samples (a ratio estimator over clusters).
+"""
+
+import math
+import random
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+from dataclasses_json import dataclass_json
+from fbpcs.pc_pre_validation.constants import SAMPLING_CONFIDENCE_Z_SCORE
+
+
+@dataclass_json
+@dataclass
+class IssueRateEstimate:
+    # Estimated number of issues in the whole file
+    count: int
+    # Issues per row, and the bounds of its confidence interval
+    rate: float
+    rate_lower_bound: float
+    rate_upper_bound: float
+
+
+def get_sample_byte_ranges(
+    start: int, end: int, num_samples: int, sample_size: int
+) -> List[Tuple[int, int]]:
+    """Draw a random [start, end) byte range of sample_size in each of num_samples strata"""
+    stratum_size = (end - start) / num_samples
+    sample_byte_ranges = []
+    for i in range(num_samples):
+        stratum_start = start + int(i * stratum_size)
+        stratum_end = start + int((i + 1) * stratum_size)
+        sample_start = random.randint(
+            stratum_start, max(stratum_end - sample_size, stratum_start)
+        )
+        sample_byte_ranges.append(
+            (sample_start, min(sample_start + sample_size, stratum_end))
+        )
+    return sample_byte_ranges
+
+
+def estimate_issue_rate(
+    issue_counts: Sequence[int],
+    rows_counts: Sequence[int],
+    sampling_fraction: float,
+    estimated_rows_count: int,
+) -> IssueRateEstimate:
+    """Estimate the issue rate of the file from the issue and rows counts of each sample.
+
+    Args:
+        issue_counts: the number of issues found in each sample
+        rows_counts: the number of rows validated in each sample
+        sampling_fraction: the share of the file that was sampled, for the finite population correction
+        estimated_rows_count: the estimated number of rows in the whole file
+    """
+    num_samples = len(rows_counts)
+    total_rows = sum(rows_counts)
+    if not total_rows:
+        return IssueRateEstimate(
+            count=0, rate=0.0, rate_lower_bound=0.0, rate_upper_bound=0.0
+        )
+
+    rate = sum(issue_counts) / total_rows
+    standard_error = 0.0
+    if num_samples > 1:
+        mean_rows_count = total_rows / num_samples
+        residuals = sum(
+            (issue_count - rate * rows_count) ** 2
+            for issue_count, rows_count in zip(issue_counts, rows_counts)
+        )
+        variance = (
+            (1 - min(sampling_fraction, 1.0))
+            * residuals
+            / (num_samples * (num_samples - 1) * mean_rows_count**2)
+        )
+        standard_error = math.sqrt(variance)
+
+    margin = SAMPLING_CONFIDENCE_Z_SCORE * standard_error
+    return IssueRateEstimate(
+        # The issues that were found are in the file, whatever the estimate
+        count=max(round(rate * estimated_rows_count), sum(issue_counts)),
+        rate=rate,
+        rate_lower_bound=max(rate - margin, 0.0),
+        rate_upper_bound=rate + margin,
+    )
@@ -6,7 +6,8 @@
 
 # pyre-strict
 
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Mapping, Sequence, Tuple
 
 from fbpcs.pc_pre_validation.enums import ValidationResult
 from fbpcs.pc_pre_validation.validation_report import ValidationReport
@@ -19,15 +20,52 @@ def run_validators(validators: List[Validator]) -> Tuple[ValidationResult, str]:
         validator.validate() for validator in validators
     ]
 
+    aggregated_report = "\n\n".join([str(report) for report in validation_reports])
+
+    return (_aggregate_results(validation_reports), aggregated_report)
+
+
+def run_batch_validators(
+    input_file_validators: Mapping[str, Sequence[Validator]],
+    batch_validators: Sequence[Validator],
+    max_concurrent_input_files: int,
+) -> Tuple[ValidationResult, str]:
+    """Runs the validators of up to max_concurrent_input_files input files concurrently.
+
+    The batch validators, such as the binary file validator, run once for all the files.
+    The aggregated report has a section for each input file, then one for the batch.
+    """
+    with ThreadPoolExecutor(max_workers=max_concurrent_input_files) as executor:
+        input_file_reports = list(
+            executor.map(
+                lambda validators: [validator.validate() for validator in validators],
+                input_file_validators.values(),
+            )
+        )
+    batch_reports = [validator.validate() for validator in batch_validators]
+
+    sections = [
+        f"Input file: {input_file_path}\n\n"
+        + "\n\n".join([str(report) for report in reports])
+        for input_file_path, reports in zip(input_file_validators, input_file_reports)
+    ]
+    sections.append(
+        "All input files\n\n" + "\n\n".join([str(report) for report in batch_reports])
+    )
+    aggregated_report = "\n\n\n".join(sections)
+
+    all_reports = [
+        report for reports in input_file_reports for report in reports
+    ] + batch_reports
+    return (_aggregate_results(all_reports), aggregated_report)
+
+
+def _aggregate_results(validation_reports: List[ValidationReport]) -> ValidationResult:
     # aggregated result is SUCCESS only if all validators succeed.
     validator_results = [
         report.validation_result == ValidationResult.SUCCESS
         for report in validation_reports
     ]
-    aggregated_result = (
+    return (
         ValidationResult.SUCCESS if all(validator_results) else ValidationResult.FAILED
     )
-
-    aggregated_report = "\n\n".join([str(report) for report in validation_reports])
-
-    return (aggregated_result, aggregated_report)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from fbpcs.pl_coordinator.constants import (
+    GRAPHAPI_CONNECT_TIMEOUT,
+    GRAPHAPI_MAX_CONCURRENT_REQUESTS_PER_HOST,
+    GRAPHAPI_READ_TIMEOUT,
+)
+from requests.adapters import HTTPAdapter
+
+
+class AsyncHTTPClient:
+    """Sends HTTP requests from coroutines without blocking the event loop.
+
+    The requests share a session, whose keep-alive connections are reused across
+    requests. Each host gets a thread pool of max_concurrent_requests_per_host
+    threads to send its requests. Requests beyond that limit wait for a thread
+    while the event loop keeps running the other coroutines.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_requests_per_host: int = GRAPHAPI_MAX_CONCURRENT_REQUESTS_PER_HOST,
+        timeout: Tuple[float, float] = (
+            GRAPHAPI_CONNECT_TIMEOUT,
+            GRAPHAPI_READ_TIMEOUT,
+        ),
+    ) -> None:
+        self._max_concurrent_requests_per_host = max_concurrent_requests_per_host
+        self._timeout = timeout
+        self.session: requests.Session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_concurrent_requests_per_host)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
+
+    async def get(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return await self.request("GET", url, params)
+
+    async def post(
+        self, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return await self.request("POST", url, params)
+
+    async def request(
+        self, method: str, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(url),
+            functools.partial(self.request_sync, method, url, params),
+        )
+
+    def request_sync(
+        self, method: str, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        return self.session.request(method, url, params=params, timeout=self._timeout)
+
+    def close(self) -> None:
+        with self._executors_lock:
+            for executor in self._executors.values():
+                executor.shutdown(wait=False)
+            self._executors.clear()
+        self.session.close()
+
+    def _get_executor(self, url: str) -> ThreadPoolExecutor:
+        host = urlsplit(url).netloc
+        with self._executors_lock:
+            if host not in self._executors:
+                self._executors[host] = ThreadPoolExecutor(
+                    max_workers=self._max_concurrent_requests_per_host,
+                    thread_name_prefix=f"http-{host}",
+                )
+            return self._executors[host]
@@ -12,9 +12,11 @@ from typing import Any, Dict, List, Optional, Type, TypeVar
 
 import requests
 from fbpcs.bolt.bolt_checkpoint import bolt_checkpoint
-from fbpcs.bolt.bolt_client import BoltClient, BoltState
+from fbpcs.bolt.bolt_client import BoltClient, BoltState, single_flight
 from fbpcs.bolt.bolt_job import BoltCreateInstanceArgs
 from fbpcs.bolt.constants import FBPCS_GRAPH_API_TOKEN
+from fbpcs.pl_coordinator.async_http_client import AsyncHTTPClient
+from fbpcs.pl_coordinator.constants import GRAPHAPI_MAX_IDS_PER_REQUEST
 from fbpcs.pl_coordinator.exceptions import (
     GraphAPIGenericException,
     GraphAPITokenNotFound,
@@ -76,6 +78,7 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
         logger: Optional[logging.Logger] = None,
         graphapi_version: Optional[str] = None,
         graphapi_domain: Optional[str] = None,
+        http_client: Optional[AsyncHTTPClient] = None,
     ) -> None:
         """Bolt GraphAPI Client
 
@@ -84,17 +87,23 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
             - logger: logger
             - graphapi_version: version to use, e.g. "v13.0" or "v14.0"
             - graphapi_domain: domain, e.g. "graph.facebook.com"
+            - http_client: sends the requests of the async methods, so that they don't block the event loop
         """
 
-        self.logger: logging.Logger = (
-            logging.getLogger(__name__) if logger is None else logger
-        )
+        super().__init__(logger=logger)
         _graphapi_version = graphapi_version or GRAPHAPI_DEFAULT_VERSION
         _graphapi_domain = graphapi_domain or GRAPHAPI_DEFAULT_DOMAIN
         self.graphapi_url = f"{GRAPHAPI_HTTPS}{_graphapi_domain}/{_graphapi_version}"
         self.logger.info(f"GraphAPI URL: {self.graphapi_url}")
         self.access_token = self._get_graph_api_token(config)
         self.params = {"access_token": self.access_token}
+        self.http_client: AsyncHTTPClient = http_client or AsyncHTTPClient()
+        self._owns_http_client: bool = http_client is None
+
+    def close(self) -> None:
+        """Shuts down the http client, if it was created by this client"""
+        if self._owns_http_client:
+            self.http_client.close()
 
     @bolt_checkpoint(dump_params=True, dump_return_val=True)
     async def create_instance(
@@ -106,7 +115,7 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
             params["breakdown_key"] = json.dumps(instance_args.breakdown_key)
             if instance_args.run_id is not None:
                 params["run_id"] = instance_args.run_id
-            r = requests.post(
+            r = await self.http_client.post(
                 f"{self.graphapi_url}/{instance_args.study_id}/instances", params=params
             )
             self._check_err(r, "creating fb pl instance")
@@ -116,7 +125,7 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
             params["timestamp"] = instance_args.timestamp
             if instance_args.run_id is not None:
                 params["run_id"] = instance_args.run_id
-            r = requests.post(
+            r = await self.http_client.post(
                 f"{self.graphapi_url}/{instance_args.dataset_id}/instance",
                 params=params,
             )
@@ -152,7 +161,10 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
         """
         params = self.params.copy()
         params["operation"] = "NEXT"
-        r = requests.post(f"{self.graphapi_url}/{instance_id}", params=params)
+        r = await self.http_client.post(
+            f"{self.graphapi_url}/{instance_id}", params=params
+        )
+        self.invalidate_state(instance_id)
         if stage:
             msg = f"running stage {stage}"
         else:
@@ -168,7 +180,10 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
     ) -> None:
         params = self.params.copy()
         params["operation"] = "CANCEL"
-        r = requests.post(f"{self.graphapi_url}/{instance_id}", params=params)
+        r = await self.http_client.post(
+            f"{self.graphapi_url}/{instance_id}", params=params
+        )
+        self.invalidate_state(instance_id)
         if stage:
             msg = f"cancel current stage {stage}."
         else:
@@ -178,8 +193,35 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
     @bolt_checkpoint(
         dump_return_val=True,
     )
+    @single_flight
     async def update_instance(self, instance_id: str) -> BoltState:
         response = json.loads((await self.get_instance(instance_id)).text)
+        return self._get_bolt_state(response)
+
+    @bolt_checkpoint(
+        dump_return_val=True,
+    )
+    async def update_instances(self, instance_ids: List[str]) -> Dict[str, BoltState]:
+        states = {}
+        for i in range(0, len(instance_ids), GRAPHAPI_MAX_IDS_PER_REQUEST):
+            chunk = instance_ids[i : i + GRAPHAPI_MAX_IDS_PER_REQUEST]
+            params = self.params.copy()
+            params["ids"] = ",".join(chunk)
+            r = await self.http_client.get(f"{self.graphapi_url}/", params=params)
+            if r.status_code != 200:
+                # left out, update_instance raises the error to the caller
+                self.logger.warning(
+                    f"Error getting {len(chunk)} fb instances: {r.content}"
+                )
+                continue
+            for instance_id, response in json.loads(r.text).items():
+                try:
+                    states[instance_id] = self._get_bolt_state(response)
+                except RuntimeError as e:
+                    self.logger.warning(f"[{instance_id}] {e}")
+        return states
+
+    def _get_bolt_state(self, response: Dict[str, Any]) -> BoltState:
         response_status = response.get("status")
         try:
             status = GRAPHAPI_INSTANCE_STATUSES[response_status]
@@ -253,7 +295,9 @@ class BoltGraphAPIClient(BoltClient[BoltGraphAPICreateInstanceArgs]):
         return False
 
     async def get_instance(self, instance_id: str) -> requests.Response:
-        r = requests.get(f"{self.graphapi_url}/{instance_id}", self.params)
+        r = await self.http_client.get(
+            f"{self.graphapi_url}/{instance_id}", params=self.params
+        )
         self._check_err(r, "getting fb instance")
         return r
 
@@ -34,3 +34,11 @@ PROCESS_WAIT = 1  # interval between starting processes.
 INSTANCE_SLA = 86400  # 16 hr instance sla, 2 tries per stage, total 24 hrs (since the Ent expires after 24 hours)
 
 FBPCS_GRAPH_API_TOKEN = "FBPCS_GRAPH_API_TOKEN"
+
+# Graph API requests in flight to the same host, beyond which they wait for a connection
+GRAPHAPI_MAX_CONCURRENT_REQUESTS_PER_HOST = 32
+# seconds to connect to the Graph API, and to wait for each read of its response
+GRAPHAPI_CONNECT_TIMEOUT = 10
+GRAPHAPI_READ_TIMEOUT = 60
+# instances read by a single multi-id Graph API request
+GRAPHAPI_MAX_IDS_PER_REQUEST = 50
@@ -16,7 +16,10 @@ from fbpcs.bolt.bolt_checkpoint import bolt_checkpoint
 from fbpcs.bolt.bolt_hook import BoltHook, BoltHookArgs, BoltHookKey
 
 from fbpcs.bolt.bolt_job import BoltJob, BoltPlayerArgs
+from fbpcs.bolt.bolt_poll_policy import AdaptiveBoltPollPolicy
+from fbpcs.bolt.bolt_run_journal import BoltRunJournal
 from fbpcs.bolt.bolt_runner import BoltRunner
+from fbpcs.bolt.bolt_status_notifier import FileBoltStatusNotifier
 from fbpcs.bolt.bolt_summary import BoltSummary
 from fbpcs.bolt.oss_bolt_pcs import BoltPCSClient, BoltPCSCreateInstanceArgs
 from fbpcs.common.feature.pcs_feature_gate_utils import get_stage_flow
@@ -103,6 +106,9 @@ def run_study(
     output_dir: Optional[str] = None,
     graphapi_domain: Optional[str] = None,
     stage_timeout_override: Optional[int] = None,
+    run_journal_path: Optional[str] = None,
+    poll_history_journal_paths: Optional[List[str]] = None,
+    status_notification_dir: Optional[str] = None,
 ) -> None:
     bolt_summary = asyncio.run(
         run_study_async(
@@ -121,6 +127,9 @@ def run_study(
             output_dir,
             graphapi_domain,
             stage_timeout_override=stage_timeout_override,
+            run_journal_path=run_journal_path,
+            poll_history_journal_paths=poll_history_journal_paths,
+            status_notification_dir=status_notification_dir,
         )
     )
 
@@ -155,6 +164,9 @@ async def run_study_async(
     graphapi_domain: Optional[str] = None,
     bolt_hooks: Optional[Dict[BoltHookKey, List[BoltHook[BoltHookArgs]]]] = None,
     stage_timeout_override: Optional[int] = None,
+    run_journal_path: Optional[str] = None,
+    poll_history_journal_paths: Optional[List[str]] = None,
+    status_notification_dir: Optional[str] = None,
 ) -> BoltSummary:
 
     # Create a GraphApiTraceLoggingService specific for this study_id
@@ -180,26 +192,32 @@ async def run_study_async(
     # sets a unique default run id if run_id was None
     run_id = bolt_checkpoint.register_run_id(run_id)
 
-    return await _run_study_async_helper(
-        client=client,
-        trace_logging_svc=trace_logging_svc,
-        config=config,
-        study_id=study_id,
-        objective_ids=objective_ids,
-        input_paths=input_paths,
-        logger=logger,
-        stage_flow=stage_flow,
-        num_tries=num_tries,
-        dry_run=dry_run,
-        result_visibility=result_visibility,
-        final_stage=final_stage,
-        run_id=run_id,
-        graphapi_version=graphapi_version,
-        output_dir=output_dir,
-        graphapi_domain=graphapi_domain,
-        bolt_hooks=bolt_hooks,
-        stage_timeout_override=stage_timeout_override,
-    )
+    try:
+        return await _run_study_async_helper(
+            client=client,
+            trace_logging_svc=trace_logging_svc,
+            config=config,
+            study_id=study_id,
+            objective_ids=objective_ids,
+            input_paths=input_paths,
+            logger=logger,
+            stage_flow=stage_flow,
+            num_tries=num_tries,
+            dry_run=dry_run,
+            result_visibility=result_visibility,
+            final_stage=final_stage,
+            run_id=run_id,
+            graphapi_version=graphapi_version,
+            output_dir=output_dir,
+            graphapi_domain=graphapi_domain,
+            bolt_hooks=bolt_hooks,
+            stage_timeout_override=stage_timeout_override,
+            run_journal_path=run_journal_path,
+            poll_history_journal_paths=poll_history_journal_paths,
+            status_notification_dir=status_notification_dir,
+        )
+    finally:
+        client.close()
 
 
 @bolt_checkpoint(
@@ -352,6 +370,9 @@ async def _run_study_async_helper(
     graphapi_domain: Optional[str],
     bolt_hooks: Optional[Dict[BoltHookKey, List[BoltHook[BoltHookArgs]]]] = None,
     stage_timeout_override: Optional[int] = None,
+    run_journal_path: Optional[str] = None,
+    poll_history_journal_paths: Optional[List[str]] = None,
+    status_notification_dir: Optional[str] = None,
 ) -> BoltSummary:
     (
         instances_input_path,
@@ -427,6 +448,9 @@ async def _run_study_async_helper(
         job_list,
         graphapi_version=graphapi_version,
         graphapi_domain=graphapi_domain,
+        run_journal_path=run_journal_path,
+        poll_history_journal_paths=poll_history_journal_paths,
+        status_notification_dir=status_notification_dir,
     )
 
     ## Step 4: Print out the initial and end states
@@ -476,6 +500,9 @@ async def run_bolt(
     ],
     graphapi_version: Optional[str] = None,
     graphapi_domain: Optional[str] = None,
+    run_journal_path: Optional[str] = None,
+    poll_history_journal_paths: Optional[List[str]] = None,
+    status_notification_dir: Optional[str] = None,
 ) -> BoltSummary:
     """Run private lift with the BoltRunner in a dedicated function to ensure that
     the BoltRunner semaphore and runner.run_async share the same event loop.
@@ -484,6 +511,11 @@ async def run_bolt(
         config: The dict representation of a config.yml file
         logger: logger client
         job_list: The BoltJobs to execute
+        run_journal_path: if set, the jobs are journaled there and resume from it
+        poll_history_journal_paths: the run journals of past runs, whose stage
+            durations the stage polls adapt to
+        status_notification_dir: if set, a file named after an instance id created
+            there makes the jobs waiting on the instance poll it right away
     """
     if not job_list:
         raise OneCommandRunnerBaseException(
@@ -493,24 +525,60 @@ async def run_bolt(
         )
 
     # create the runner
+    partner_client = BoltPCSClient(
+        build_private_computation_service(
+            pc_config=config["private_computation"],
+            mpc_config=config["mpc"],
+            pid_config=config["pid"],
+            pph_config=config.get("post_processing_handlers", {}),
+            pid_pph_config=config.get("pid_post_processing_handlers", {}),
+            trace_logging_svc=trace_logging_svc,
+        ),
+    )
     runner = BoltRunner(
         publisher_client=publisher_client,
-        partner_client=BoltPCSClient(
-            build_private_computation_service(
-                pc_config=config["private_computation"],
-                mpc_config=config["mpc"],
-                pid_config=config["pid"],
-                pph_config=config.get("post_processing_handlers", {}),
-                pid_pph_config=config.get("pid_post_processing_handlers", {}),
-                trace_logging_svc=trace_logging_svc,
-            ),
-        ),
+        partner_client=partner_client,
         logger=logger,
         max_parallel_runs=MAX_NUM_INSTANCES,
+        batch_status_polls=True,
+        run_journal=BoltRunJournal(
+            run_journal_path, logger, run_identity=_get_run_identity(job_list)
+        )
+        if run_journal_path
+        else None,
+        poll_policy=AdaptiveBoltPollPolicy.from_run_journals(
+            poll_history_journal_paths, logger
+        )
+        if poll_history_journal_paths
+        else None,
+        status_notifier=FileBoltStatusNotifier(status_notification_dir)
+        if status_notification_dir
+        else None,
     )
 
     # run all jobs
-    return await runner.run_async(job_list)
+    try:
+        return await runner.run_async(job_list)
+    finally:
+        partner_client.close()
+
+
+def _get_run_identity(
+    job_list: List[
+        BoltJob[BoltPLGraphAPICreateInstanceArgs, BoltPCSCreateInstanceArgs]
+    ],
+) -> str:
+    # the instance and run ids are left out, they change when a run is resumed
+    return json.dumps(
+        sorted(
+            (
+                job.job_name,
+                job.publisher_bolt_args.create_instance_args.study_id,
+                job.partner_bolt_args.create_instance_args.input_path,
+            )
+            for job in job_list
+        )
+    )
 
 
 @bolt_checkpoint(component=LOG_COMPONENT)
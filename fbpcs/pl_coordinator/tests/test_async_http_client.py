@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import asyncio
+import threading
+import time
+import unittest
+from typing import Any, Dict, Optional
+from unittest.mock import MagicMock
+
+from fbpcs.pl_coordinator.async_http_client import AsyncHTTPClient
+
+
+class TestAsyncHTTPClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.client = AsyncHTTPClient(
+            max_concurrent_requests_per_host=2, timeout=(1, 2)
+        )
+        self.addCleanup(self.client.close)
+        self.in_flight: Dict[str, int] = {}
+        self.max_in_flight: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+        def request(
+            method: str, url: str, params: Optional[Dict[str, Any]], timeout: Any
+        ) -> MagicMock:
+            with self.lock:
+                self.in_flight[url] = self.in_flight.get(url, 0) + 1
+                self.max_in_flight[url] = max(
+                    self.max_in_flight.get(url, 0), self.in_flight[url]
+                )
+            time.sleep(0.05)
+            with self.lock:
+                self.in_flight[url] -= 1
+            return MagicMock(method=method, url=url, params=params, timeout=timeout)
+
+        self.client.session.request = MagicMock(side_effect=request)
+
+    async def test_get_and_post(self) -> None:
+        r = await self.client.get("https://graph.test/id", params={"a": "b"})
+        self.assertEqual(
+            (r.method, r.url, r.params, r.timeout),
+            ("GET", "https://graph.test/id", {"a": "b"}, (1, 2)),
+        )
+
+        r = await self.client.post("https://graph.test/id", params={"c": "d"})
+        self.assertEqual((r.method, r.params), ("POST", {"c": "d"}))
+
+    async def test_requests_do_not_block_the_event_loop(self) -> None:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        ticker = asyncio.create_task(tick())
+        await self.client.get("https://graph.test/id")
+        ticker.cancel()
+
+        # The ticker kept running while the request was sent
+        self.assertGreater(ticks, 2)
+
+    async def test_concurrent_requests_are_limited_per_host(self) -> None:
+        await asyncio.gather(
+            *(self.client.get("https://graph.test/id") for _ in range(6)),
+            *(self.client.get("https://other.test/id") for _ in range(6)),
+        )
+
+        self.assertEqual(
+            self.max_in_flight,
+            {"https://graph.test/id": 2, "https://other.test/id": 2},
+        )
@@ -37,7 +37,12 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
     def setUp(self, mock_logger) -> None:
         self.mock_logger = mock_logger
         config = {"access_token": ACCESS_TOKEN}
-        self.test_client = BoltGraphAPIClient(config, mock_logger)
+        self.mock_http_client = MagicMock()
+        self.mock_http_client.get = AsyncMock(return_value=MagicMock())
+        self.mock_http_client.post = AsyncMock(return_value=MagicMock())
+        self.test_client = BoltGraphAPIClient(
+            config, mock_logger, http_client=self.mock_http_client
+        )
         self.test_client._check_err = MagicMock()
 
     def test_customize_graphapi_domain(self) -> None:
@@ -116,8 +121,8 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
         with self.assertRaises(GraphAPITokenNotFound):
             BoltGraphAPIClient(config, self.mock_logger).access_token
 
-    @patch("fbpcs.pl_coordinator.bolt_graphapi_client.requests.post")
-    async def test_bolt_create_lift_instance(self, mock_post) -> None:
+    async def test_bolt_create_lift_instance(self) -> None:
+        mock_post = self.mock_http_client.post
         test_pl_args = BoltPLGraphAPICreateInstanceArgs(
             instance_id="test_pl",
             study_id="study_id",
@@ -137,8 +142,8 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
             },
         )
 
-    @patch("fbpcs.pl_coordinator.bolt_graphapi_client.requests.post")
-    async def test_bolt_create_attribution_instance(self, mock_post) -> None:
+    async def test_bolt_create_attribution_instance(self) -> None:
+        mock_post = self.mock_http_client.post
         test_pa_args = BoltPAGraphAPICreateInstanceArgs(
             instance_id="test_pa",
             dataset_id="dataset_id",
@@ -157,8 +162,8 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
             },
         )
 
-    @patch("fbpcs.pl_coordinator.bolt_graphapi_client.requests.post")
-    async def test_bolt_run_stage(self, mock_post) -> None:
+    async def test_bolt_run_stage(self) -> None:
+        mock_post = self.mock_http_client.post
         expected_params = {
             "access_token": ACCESS_TOKEN,
             "operation": "NEXT",
@@ -168,8 +173,8 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
             await self.test_client.run_stage(instance_id="id", stage=stage)
             mock_post.assert_called_once_with(f"{URL}/id", params=expected_params)
 
-    @patch("fbpcs.pl_coordinator.bolt_graphapi_client.requests.post")
-    async def test_bolt_cancel_current_stage(self, mock_post) -> None:
+    async def test_bolt_cancel_current_stage(self) -> None:
+        mock_post = self.mock_http_client.post
         expected_params = {
             "access_token": ACCESS_TOKEN,
             "operation": "CANCEL",
@@ -182,6 +187,18 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
                 )
                 mock_post.assert_called_once_with(f"{URL}/id", params=expected_params)
 
+    async def test_bolt_get_instance(self) -> None:
+        self.mock_http_client.get.return_value = self._get_graph_api_output(
+            {"id": "id"}
+        )
+
+        r = await self.test_client.get_instance("id")
+
+        self.assertEqual(r, self.mock_http_client.get.return_value)
+        self.mock_http_client.get.assert_called_once_with(
+            f"{URL}/id", params={"access_token": ACCESS_TOKEN}
+        )
+
     @patch(
         "fbpcs.pl_coordinator.bolt_graphapi_client.BoltGraphAPIClient.get_instance",
         new_callable=AsyncMock,
@@ -229,6 +246,54 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(state.issuer_certificate, "test_cert")
         self.assertEqual(state.server_hostnames, "domain.test")
 
+    async def test_bolt_update_instances(self) -> None:
+        self.mock_http_client.get.return_value = self._get_graph_api_output(
+            {
+                "id1": {"id": "id1", "status": "COMPUTATION_STARTED"},
+                "id2": {"id": "id2", "status": "COMPUTATION_COMPLETED"},
+                "id3": {"id": "id3", "status": "NOT_A_STATUS"},
+            }
+        )
+
+        states = await self.test_client.update_instances(["id1", "id2", "id3"])
+
+        self.mock_http_client.get.assert_called_once_with(
+            f"{URL}/", params={"access_token": ACCESS_TOKEN, "ids": "id1,id2,id3"}
+        )
+        self.assertEqual(
+            {
+                instance_id: state.pc_instance_status
+                for instance_id, state in states.items()
+            },
+            {
+                "id1": PrivateComputationInstanceStatus.COMPUTATION_STARTED,
+                "id2": PrivateComputationInstanceStatus.COMPUTATION_COMPLETED,
+            },
+        )
+
+    @patch("fbpcs.pl_coordinator.bolt_graphapi_client.GRAPHAPI_MAX_IDS_PER_REQUEST", 2)
+    async def test_bolt_update_instances_chunks_and_errors(self) -> None:
+        failed = self._get_graph_api_output({})
+        failed.status_code = 400
+        self.mock_http_client.get.side_effect = [
+            failed,
+            self._get_graph_api_output(
+                {"id3": {"id": "id3", "status": "COMPUTATION_STARTED"}}
+            ),
+        ]
+
+        states = await self.test_client.update_instances(["id1", "id2", "id3"])
+
+        self.assertEqual(
+            [
+                c.kwargs["params"]["ids"]
+                for c in self.mock_http_client.get.call_args_list
+            ],
+            ["id1,id2", "id3"],
+        )
+        # the instances of the failed request are left out
+        self.assertEqual(list(states), ["id3"])
+
     @patch(
         "fbpcs.pl_coordinator.bolt_graphapi_client.BoltGraphAPIClient.get_instance",
         new_callable=AsyncMock,
@@ -285,6 +350,17 @@ class TestBoltGraphAPIClient(unittest.IsolatedAsyncioTestCase):
                 if not instance_id:
                     mock_update.assert_not_called()
 
+    @patch("fbpcs.pl_coordinator.bolt_graphapi_client.AsyncHTTPClient")
+    def test_close(self, mock_http_client_class) -> None:
+        config = {"access_token": ACCESS_TOKEN}
+        test_client = BoltGraphAPIClient(config, self.mock_logger)
+        test_client.close()
+        mock_http_client_class.return_value.close.assert_called_once()
+
+        # a given http client is left to its owner
+        self.test_client.close()
+        self.mock_http_client.close.assert_not_called()
+
     def _get_graph_api_output(self, text: Any) -> requests.Response:
         r = requests.Response()
         r.status_code = 200
@@ -25,6 +25,10 @@ class PCSFeature(Enum):
     PA_TIMESTAMP_VALIDATION = "pa_timestamp_validation"
     PL_TIMESTAMP_VALIDATION = "pl_timestamp_validation"
     PRE_VALIDATION_FILE_STREAM = "pre_validation_file_stream"
+    PRE_VALIDATION_FILE_MMAP = "pre_validation_file_mmap"
+    PRE_VALIDATION_CHECKPOINT = "pre_validation_checkpoint"
+    PRE_VALIDATION_REPORT_CACHE = "pre_validation_report_cache"
+    PRE_VALIDATION_SAMPLING = "pre_validation_sampling"
     PID_FILTER_LOW_QUALITY_IDENTIFIER_THRESH166 = (
         "pid_filter_low_quality_identifier_thresh166"
     )
@@ -11,14 +11,12 @@ import logging
 import os
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, TYPE_CHECKING, Union
+from typing import Any, Dict, List, Optional, Type, TYPE_CHECKING, Union
 
 import marshmallow
 from dataclasses_json.mm import SchemaType
 
 if TYPE_CHECKING:
-    from typing import Type
-
     from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
         PrivateComputationBaseStageFlow,
     )
@@ -26,6 +24,7 @@ if TYPE_CHECKING:
 from pathlib import Path
 
 from fbpcp.entity.container_instance import ContainerInstance
+from fbpcs.common.entity.dataclass_decoder import get_dataclass_decoder
 from fbpcs.common.entity.instance_base import InstanceBase
 from fbpcs.common.entity.stage_state_instance import (
     StageStateInstance,
@@ -83,6 +82,29 @@ class PrivateComputationInstance(InstanceBase):
     def loads_schema(cls, json_schema_str: str) -> "PrivateComputationInstance":
         json_object = json.loads(json_schema_str)
 
+        # instances dumped by dumps_schema don't need marshmallow's validation
+        try:
+            return cls._fast_loads(json_object)
+        except Exception as err:
+            logging.debug(f"falling back to the marshmallow schemas: {err!r}")
+
+        return cls._loads_with_schemas(json_object)
+
+    @classmethod
+    def _fast_loads(cls, json_object: Dict[str, Any]) -> "PrivateComputationInstance":
+        infra_config_decoder = get_dataclass_decoder(InfraConfig)
+        product_config_decoder = get_dataclass_decoder(
+            cls._product_config_cls(json_object)
+        )
+        return PrivateComputationInstance(
+            infra_config=infra_config_decoder(json_object["infra_config"]),
+            product_config=product_config_decoder(json_object["product_config"]),
+        )
+
+    @classmethod
+    def _loads_with_schemas(
+        cls, json_object: Dict[str, Any]
+    ) -> "PrivateComputationInstance":
         # create infra config
         infra_config: InfraConfig = InfraConfig.schema().loads(
             json.dumps(json_object["infra_config"]),
@@ -118,14 +140,19 @@ class PrivateComputationInstance(InstanceBase):
         """
         return the corresponding SchemaType object based on the product_config type
         """
+        # pyre-ignore[16] Undefined attribute
+        return cls._product_config_cls(json_object).schema()
+
+    @classmethod
+    def _product_config_cls(cls, json_object: Dict[str, Any]) -> Type[ProductConfig]:
         if json_object["infra_config"]["game_type"] == "ATTRIBUTION":
-            return AttributionConfig.schema()
+            return AttributionConfig
         elif json_object["infra_config"]["game_type"] == "LIFT":
-            return LiftConfig.schema()
+            return LiftConfig
         elif json_object["infra_config"]["game_type"] == "PRIVATE_ID_DFCA":
-            return PrivateIdDfcaConfig.schema()
+            return PrivateIdDfcaConfig
         elif json_object["infra_config"]["game_type"] == "ANONYMIZER":
-            return AnonymizerConfig.schema()
+            return AnonymizerConfig
         raise RuntimeError(f"Invalid product config: {json_object}")
 
     @classmethod
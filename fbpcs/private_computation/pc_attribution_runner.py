@@ -186,28 +186,31 @@ async def run_attribution_async(
     # sets a unique default run id if run_id was None
     run_id = bolt_checkpoint.register_run_id(run_id)
 
-    return await _run_attribution_async_helper(
-        client=client,
-        trace_logging_svc=trace_logging_svc,
-        config=config,
-        dataset_id=dataset_id,
-        input_path=input_path,
-        timestamp=timestamp,
-        attribution_rule=attribution_rule,
-        aggregation_type=aggregation_type,
-        concurrency=concurrency,
-        num_files_per_mpc_container=num_files_per_mpc_container,
-        k_anonymity_threshold=k_anonymity_threshold,
-        stage_flow=stage_flow,
-        logger=logger,
-        num_tries=num_tries,
-        final_stage=final_stage,
-        run_id=run_id,
-        graphapi_version=graphapi_version,
-        graphapi_domain=graphapi_domain,
-        bolt_hooks=bolt_hooks,
-        stage_timeout_override=stage_timeout_override,
-    )
+    try:
+        return await _run_attribution_async_helper(
+            client=client,
+            trace_logging_svc=trace_logging_svc,
+            config=config,
+            dataset_id=dataset_id,
+            input_path=input_path,
+            timestamp=timestamp,
+            attribution_rule=attribution_rule,
+            aggregation_type=aggregation_type,
+            concurrency=concurrency,
+            num_files_per_mpc_container=num_files_per_mpc_container,
+            k_anonymity_threshold=k_anonymity_threshold,
+            stage_flow=stage_flow,
+            logger=logger,
+            num_tries=num_tries,
+            final_stage=final_stage,
+            run_id=run_id,
+            graphapi_version=graphapi_version,
+            graphapi_domain=graphapi_domain,
+            bolt_hooks=bolt_hooks,
+            stage_timeout_override=stage_timeout_override,
+        )
+    finally:
+        client.close()
 
 
 @bolt_checkpoint(
@@ -439,24 +442,29 @@ async def run_bolt(
             "Submit at least one job to call this API",
         )
 
+    partner_client = BoltPCSClient(
+        build_private_computation_service(
+            pc_config=config["private_computation"],
+            mpc_config=config["mpc"],
+            pid_config=config["pid"],
+            pph_config=config.get("post_processing_handlers", {}),
+            pid_pph_config=config.get("pid_post_processing_handlers", {}),
+            trace_logging_svc=trace_logging_svc,
+        ),
+    )
     runner = BoltRunner(
         publisher_client=publisher_client,
-        partner_client=BoltPCSClient(
-            build_private_computation_service(
-                pc_config=config["private_computation"],
-                mpc_config=config["mpc"],
-                pid_config=config["pid"],
-                pph_config=config.get("post_processing_handlers", {}),
-                pid_pph_config=config.get("pid_post_processing_handlers", {}),
-                trace_logging_svc=trace_logging_svc,
-            ),
-        ),
+        partner_client=partner_client,
         logger=logger,
         max_parallel_runs=MAX_NUM_INSTANCES,
+        batch_status_polls=True,
     )
 
     # run all jobs
-    return await runner.run_async(job_list)
+    try:
+        return await runner.run_async(job_list)
+    finally:
+        partner_client.close()
 
 
 @bolt_checkpoint(
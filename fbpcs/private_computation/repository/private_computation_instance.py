@@ -7,6 +7,7 @@
 # pyre-strict
 
 import abc
+from typing import Optional
 
 from fbpcs.private_computation.entity.private_computation_instance import (
     PrivateComputationInstance,
@@ -29,3 +30,12 @@ class PrivateComputationInstanceRepository(abc.ABC):
     @abc.abstractmethod
     def delete(self, instance_id: str) -> None:
         pass
+
+    def get_version(self, instance_id: str) -> Optional[str]:
+        """Gets a stamp of the stored instance that changes whenever it is written
+
+        Returns:
+            The version of the instance, or None if the repository doesn't
+            track versions
+        """
+        return None
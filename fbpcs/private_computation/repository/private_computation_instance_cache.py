@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationInstance,
+)
+
+# Number of instances kept by default
+DEFAULT_INSTANCE_CACHE_SIZE = 128
+
+
+class PrivateComputationInstanceCache:
+    """An in-process LRU cache of the instances read from or written to a repository
+
+    Each instance is kept serialized, and every get decodes a new copy of it, so
+    that a reader mutating an instance it doesn't write, e.g. because a check
+    failed after the mutation, can't change what the next reader gets.
+
+    Each entry is stamped with the version the repository had for the instance
+    when it was cached. When check_version is set, an entry is only used if the
+    repository still has that version, so that the writes of other processes
+    sharing the storage are seen. Otherwise, the entries are used until they are
+    written through the cache or invalidated.
+
+    The cache is safe to use from several threads, e.g. the executor threads
+    of BoltPCSClient.
+    """
+
+    def __init__(
+        self, max_size: int = DEFAULT_INSTANCE_CACHE_SIZE, check_version: bool = False
+    ) -> None:
+        self.max_size = max_size
+        self.check_version = check_version
+        self._entries: "OrderedDict[str, Tuple[str, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, instance_id: str, version: Optional[str] = None
+    ) -> Optional[PrivateComputationInstance]:
+        """Gets a copy of the cached instance, if it has the given version when check_version is set"""
+        with self._lock:
+            entry = self._entries.get(instance_id)
+            if entry is None:
+                return None
+            schema, cached_version = entry
+            if self.check_version and (version is None or version != cached_version):
+                self._entries.pop(instance_id, None)
+                return None
+            self._entries.move_to_end(instance_id)
+        return PrivateComputationInstance.loads_schema(schema)
+
+    def put(
+        self, instance: PrivateComputationInstance, version: Optional[str] = None
+    ) -> None:
+        instance_id = instance.get_instance_id()
+        schema = instance.dumps_schema()
+        with self._lock:
+            self._entries[instance_id] = (schema, version)
+            self._entries.move_to_end(instance_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, instance_id: str) -> None:
+        with self._lock:
+            self._entries.pop(instance_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
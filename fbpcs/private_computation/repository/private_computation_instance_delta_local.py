@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+from fbpcs.common.repository.instance_delta_local import (
+    DEFAULT_COMPACTION_THRESHOLD,
+    LocalDeltaInstanceRepository,
+)
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationInstance,
+)
+from fbpcs.private_computation.repository.private_computation_instance import (
+    PrivateComputationInstanceRepository,
+)
+
+
+class LocalDeltaPrivateComputationInstanceRepository(
+    PrivateComputationInstanceRepository
+):
+    def __init__(
+        self, base_dir: str, compaction_threshold: int = DEFAULT_COMPACTION_THRESHOLD
+    ) -> None:
+        self.repo = LocalDeltaInstanceRepository(base_dir, compaction_threshold)
+
+    def create(self, instance: PrivateComputationInstance) -> None:
+        self.repo.create(instance)
+
+    def read(self, instance_id: str) -> PrivateComputationInstance:
+        return PrivateComputationInstance.loads_schema(self.repo.read(instance_id))
+
+    def update(self, instance: PrivateComputationInstance) -> None:
+        self.repo.update(instance)
+
+    def delete(self, instance_id: str) -> None:
+        self.repo.delete(instance_id)
+
+    def get_version(self, instance_id: str) -> str:
+        return self.repo.get_version(instance_id)
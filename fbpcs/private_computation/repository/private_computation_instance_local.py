@@ -30,3 +30,6 @@ class LocalPrivateComputationInstanceRepository(PrivateComputationInstanceReposi
 
     def delete(self, instance_id: str) -> None:
         self.repo.delete(instance_id)
+
+    def get_version(self, instance_id: str) -> str:
+        return self.repo.get_version(instance_id)
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from fbpcs.private_computation.entity.infra_config import (
+    PrivateComputationGameType,
+    PrivateComputationRole,
+)
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationInstance,
+)
+from fbpcs.private_computation.entity.private_computation_status import (
+    PrivateComputationInstanceStatus,
+)
+from fbpcs.private_computation.repository.private_computation_instance import (
+    PrivateComputationInstanceRepository,
+)
+
+# Seconds a write waits for the lock of the database held by another writer
+SQLITE_BUSY_TIMEOUT_SEC = 30
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS private_computation_instances (
+        instance_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        role TEXT NOT NULL,
+        game_type TEXT NOT NULL,
+        status_update_ts INTEGER NOT NULL,
+        instance TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_pc_instances_status ON private_computation_instances (status, status_update_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_pc_instances_role ON private_computation_instances (role)",
+    "CREATE INDEX IF NOT EXISTS idx_pc_instances_game_type ON private_computation_instances (game_type)",
+    "CREATE INDEX IF NOT EXISTS idx_pc_instances_status_update_ts ON private_computation_instances (status_update_ts)",
+)
+
+
+class SqlitePrivateComputationInstanceRepository(PrivateComputationInstanceRepository):
+    """Stores the instances in a SQLite database
+
+    The status, role, game type and status_update_ts of each instance are
+    indexed columns next to its serialized schema, so that instances can be
+    listed without reading all of them. Every write is a transaction that bumps
+    the version of the instance. compare_and_update only writes an instance
+    still at the version read with get_version before it. PrivateComputationService
+    doesn't use it: it writes with update, and its last write wins. The database
+    is in WAL mode, so that reads don't wait for writes.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._local = threading.local()
+        self._get_connection().execute("PRAGMA journal_mode=WAL")
+        with self._transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def create(self, instance: PrivateComputationInstance) -> None:
+        with self._transaction() as conn:
+            try:
+                conn.execute(
+                    "INSERT INTO private_computation_instances"
+                    " (instance_id, status, role, game_type, status_update_ts, instance)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    self._get_row(instance),
+                )
+            except sqlite3.IntegrityError:
+                raise RuntimeError(f"{instance.get_instance_id()} already exists")
+
+    def read(self, instance_id: str) -> PrivateComputationInstance:
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT instance FROM private_computation_instances WHERE instance_id = ?",
+                (instance_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            raise RuntimeError(f"{instance_id} does not exist")
+        return PrivateComputationInstance.loads_schema(row[0])
+
+    def update(self, instance: PrivateComputationInstance) -> None:
+        with self._transaction() as conn:
+            if not self._update(conn, instance):
+                raise RuntimeError(f"{instance.get_instance_id()} does not exist")
+
+    def compare_and_update(
+        self,
+        instance: PrivateComputationInstance,
+        expected_version: str,
+    ) -> bool:
+        """Updates the instance only if no other write happened since expected_version
+
+        Args:
+            - instance: the instance to write
+            - expected_version: the version returned by get_version before the
+                instance was read
+
+        Returns:
+            True if the instance was written, False if another writer wrote it
+            in the meantime
+
+        Raises:
+            RuntimeError: the instance does not exist
+        """
+        with self._transaction() as conn:
+            if self._update(conn, instance, int(expected_version)):
+                return True
+            if not self._exist(conn, instance.get_instance_id()):
+                raise RuntimeError(f"{instance.get_instance_id()} does not exist")
+            return False
+
+    def delete(self, instance_id: str) -> None:
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM private_computation_instances WHERE instance_id = ?",
+                (instance_id,),
+            )
+            if cursor.rowcount == 0:
+                raise RuntimeError(f"{instance_id} does not exist")
+
+    def get_version(self, instance_id: str) -> str:
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT version FROM private_computation_instances WHERE instance_id = ?",
+                (instance_id,),
+            )
+            .fetchone()
+        )
+        if row is None:
+            raise RuntimeError(f"{instance_id} does not exist")
+        return str(row[0])
+
+    def list_instance_ids(
+        self,
+        statuses: Optional[Iterable[PrivateComputationInstanceStatus]] = None,
+        role: Optional[PrivateComputationRole] = None,
+        game_type: Optional[PrivateComputationGameType] = None,
+        updated_after: Optional[int] = None,
+        updated_before: Optional[int] = None,
+    ) -> List[str]:
+        """Lists the ids of the instances matching all the given filters
+
+        Args:
+            - statuses: the instances in any of these statuses, e.g. the started statuses
+            - role: the instances of this role
+            - game_type: the instances of this game type
+            - updated_after: the instances with a status_update_ts at or after this time
+            - updated_before: the instances with a status_update_ts before this time
+
+        Returns:
+            The instance ids, from the least to the most recently updated
+        """
+        query, params = self._get_query(
+            "instance_id", statuses, role, game_type, updated_after, updated_before
+        )
+        return [row[0] for row in self._get_connection().execute(query, params)]
+
+    def list_instances(
+        self,
+        statuses: Optional[Iterable[PrivateComputationInstanceStatus]] = None,
+        role: Optional[PrivateComputationRole] = None,
+        game_type: Optional[PrivateComputationGameType] = None,
+        updated_after: Optional[int] = None,
+        updated_before: Optional[int] = None,
+    ) -> List[PrivateComputationInstance]:
+        """Lists the instances matching all the given filters, as list_instance_ids"""
+        query, params = self._get_query(
+            "instance", statuses, role, game_type, updated_after, updated_before
+        )
+        return [
+            PrivateComputationInstance.loads_schema(row[0])
+            for row in self._get_connection().execute(query, params)
+        ]
+
+    def _get_connection(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, timeout=SQLITE_BUSY_TIMEOUT_SEC, isolation_level=None
+            )
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._get_connection()
+        # take the write lock upfront, so that a read-then-write can't be interleaved
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _update(
+        self,
+        conn: sqlite3.Connection,
+        instance: PrivateComputationInstance,
+        expected_version: Optional[int] = None,
+    ) -> bool:
+        instance_id, status, _, _, status_update_ts, schema = self._get_row(instance)
+        query = (
+            "UPDATE private_computation_instances"
+            " SET status = ?, status_update_ts = ?, instance = ?, version = version + 1"
+            " WHERE instance_id = ?"
+        )
+        params: List[Any] = [status, status_update_ts, schema, instance_id]
+        if expected_version is not None:
+            query += " AND version = ?"
+            params.append(expected_version)
+        return conn.execute(query, params).rowcount > 0
+
+    def _exist(self, conn: sqlite3.Connection, instance_id: str) -> bool:
+        return (
+            conn.execute(
+                "SELECT 1 FROM private_computation_instances WHERE instance_id = ?",
+                (instance_id,),
+            ).fetchone()
+            is not None
+        )
+
+    def _get_row(
+        self, instance: PrivateComputationInstance
+    ) -> Tuple[str, str, str, str, int, str]:
+        infra_config = instance.infra_config
+        return (
+            instance.get_instance_id(),
+            infra_config.status.value,
+            infra_config.role.value,
+            infra_config.game_type.value,
+            infra_config.status_update_ts,
+            instance.dumps_schema(),
+        )
+
+    def _get_query(
+        self,
+        column: str,
+        statuses: Optional[Iterable[PrivateComputationInstanceStatus]],
+        role: Optional[PrivateComputationRole],
+        game_type: Optional[PrivateComputationGameType],
+        updated_after: Optional[int],
+        updated_before: Optional[int],
+    ) -> Tuple[str, List[Any]]:
+        conditions = []
+        params: List[Any] = []
+        if statuses is not None:
+            status_values = [status.value for status in statuses]
+            conditions.append(f"status IN ({', '.join('?' * len(status_values))})")
+            params.extend(status_values)
+        if role is not None:
+            conditions.append("role = ?")
+            params.append(role.value)
+        if game_type is not None:
+            conditions.append("game_type = ?")
+            params.append(game_type.value)
+        if updated_after is not None:
+            conditions.append("status_update_ts >= ?")
+            params.append(updated_after)
+        if updated_before is not None:
+            conditions.append("status_update_ts < ?")
+            params.append(updated_before)
+        query = f"SELECT {column} FROM private_computation_instances"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return query + " ORDER BY status_update_ts, instance_id", params
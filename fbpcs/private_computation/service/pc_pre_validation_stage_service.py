@@ -119,6 +119,18 @@ class PCPreValidationStageService(PrivateComputationStageService):
         pre_validation_file_stream_flag = pc_instance.has_feature(
             PCSFeature.PRE_VALIDATION_FILE_STREAM
         )
+        pre_validation_file_mmap_flag = pc_instance.has_feature(
+            PCSFeature.PRE_VALIDATION_FILE_MMAP
+        )
+        pre_validation_checkpoint_flag = pc_instance.has_feature(
+            PCSFeature.PRE_VALIDATION_CHECKPOINT
+        )
+        pre_validation_report_cache_flag = pc_instance.has_feature(
+            PCSFeature.PRE_VALIDATION_REPORT_CACHE
+        )
+        pre_validation_sampling_flag = pc_instance.has_feature(
+            PCSFeature.PRE_VALIDATION_SAMPLING
+        )
         publisher_pc_pre_validation_flag = pc_instance.has_feature(
             PCSFeature.PUBLISHER_PC_PRE_VALIDATION
         )
@@ -135,6 +147,10 @@ class PCPreValidationStageService(PrivateComputationStageService):
             private_computation_role=pc_instance.infra_config.role,
             input_path_start_ts=pc_instance.product_config.common.input_path_start_ts,
             input_path_end_ts=pc_instance.product_config.common.input_path_end_ts,
+            pre_validation_file_mmap_flag=pre_validation_file_mmap_flag,
+            pre_validation_checkpoint_flag=pre_validation_checkpoint_flag,
+            pre_validation_report_cache_flag=pre_validation_report_cache_flag,
+            pre_validation_sampling_flag=pre_validation_sampling_flag,
         )
         env_vars = generate_env_vars_dict(repository_path=binary_config.repository_path)
         should_wait_spin_up: bool = (
@@ -24,6 +24,10 @@ def get_cmd_args(
     input_path_start_ts: Optional[str],
     input_path_end_ts: Optional[str],
     private_computation_role: Optional[PrivateComputationRole] = None,
+    pre_validation_file_mmap_flag: bool = False,
+    pre_validation_checkpoint_flag: bool = False,
+    pre_validation_report_cache_flag: bool = False,
+    pre_validation_sampling_flag: bool = False,
 ) -> str:
     args = [
         f"--input-file-path={input_path}",
@@ -45,6 +49,18 @@ def get_cmd_args(
     if pre_validation_file_stream_flag:
         args.append("--pre-validation-file-stream=enabled")
 
+    if pre_validation_file_mmap_flag:
+        args.append("--pre-validation-file-mmap=enabled")
+
+    if pre_validation_checkpoint_flag:
+        args.append("--pre-validation-checkpoint=enabled")
+
+    if pre_validation_report_cache_flag:
+        args.append("--pre-validation-report-cache=enabled")
+
+    if pre_validation_sampling_flag:
+        args.append("--pre-validation-sampling=enabled")
+
     if publisher_pc_pre_validation_flag:
         args.append("--publisher-pc-pre-validation=enabled")
 
@@ -74,6 +74,9 @@ from fbpcs.private_computation.entity.product_config import (
 from fbpcs.private_computation.repository.private_computation_instance import (
     PrivateComputationInstanceRepository,
 )
+from fbpcs.private_computation.repository.private_computation_instance_cache import (
+    PrivateComputationInstanceCache,
+)
 from fbpcs.private_computation.service.constants import (
     CA_CERT_PATH,
     DEFAULT_CONCURRENCY,
@@ -129,11 +132,14 @@ class PrivateComputationService:
         trace_logging_svc: Optional[TraceLoggingService] = None,
         log_retriever: Optional[LogRetriever] = None,
         logger: Optional[logging.Logger] = None,
+        instance_cache: Optional[PrivateComputationInstanceCache] = None,
     ) -> None:
         """Constructor of PrivateComputationService
         instance_repository -- repository to CRUD PrivateComputationInstance
+        instance_cache -- if set, the instances read and written are cached, so that they are read once per command or poll
         """
         self.instance_repository = instance_repository
+        self.instance_cache = instance_cache
         self.storage_svc = storage_svc
         self.mpc_svc = mpc_svc
         self.onedocker_svc = onedocker_svc
@@ -344,14 +350,30 @@ class PrivateComputationService:
             entity=PCSERVICE_ENTITY_NAME, prefix="instance_repo_create"
         ):
             self.instance_repository.create(instance=instance)
+        self._cache_instance(instance)
 
     def _instance_repo_read(self, instance_id: str) -> PrivateComputationInstance:
+        instance_cache = self.instance_cache
+        version = None
+        if instance_cache is not None:
+            version = self._get_instance_version(instance_id)
+            instance = instance_cache.get(instance_id, version)
+            if instance is not None:
+                self.metric_svc.bump_entity_key(
+                    PCSERVICE_ENTITY_NAME, "instance_cache_hit"
+                )
+                return instance
+
         with self.metric_svc.bump_num_times_called_and_error_count(
             entity=PCSERVICE_ENTITY_NAME, prefix="instance_repo_read"
         ), self.metric_svc.timer(
             entity=PCSERVICE_ENTITY_NAME, prefix="instance_repo_read"
         ):
-            return self.instance_repository.read(instance_id=instance_id)
+            instance = self.instance_repository.read(instance_id=instance_id)
+        if instance_cache is not None:
+            # the version is read first, so that a concurrent write makes it stale
+            instance_cache.put(instance, version)
+        return instance
 
     def _instance_repo_update(self, instance: PrivateComputationInstance) -> None:
         with self.metric_svc.bump_num_times_called_and_error_count(
@@ -359,7 +381,28 @@ class PrivateComputationService:
         ), self.metric_svc.timer(
             entity=PCSERVICE_ENTITY_NAME, prefix="instance_repo_update"
         ):
-            self.instance_repository.update(instance=instance)
+            try:
+                self.instance_repository.update(instance=instance)
+            except Exception:
+                # the write may have been partially applied
+                self._invalidate_cached_instance(instance.get_instance_id())
+                raise
+        self._cache_instance(instance)
+
+    def _get_instance_version(self, instance_id: str) -> Optional[str]:
+        if self.instance_cache is not None and self.instance_cache.check_version:
+            return self.instance_repository.get_version(instance_id)
+        return None
+
+    def _cache_instance(self, instance: PrivateComputationInstance) -> None:
+        if self.instance_cache is not None:
+            self.instance_cache.put(
+                instance, self._get_instance_version(instance.get_instance_id())
+            )
+
+    def _invalidate_cached_instance(self, instance_id: str) -> None:
+        if self.instance_cache is not None:
+            self.instance_cache.invalidate(instance_id)
 
     def _get_number_of_mpc_containers(
         self,
@@ -6,7 +6,9 @@
 
 # pyre-strict
 
+import json
 import unittest
+from unittest.mock import patch
 
 from fbpcs.common.entity.stage_state_instance import StageStateInstance
 
@@ -77,3 +79,24 @@ class TestInstanceSerde(unittest.TestCase):
         # this tests that new fields can be serialized
         pc_instance = gen_dummy_pc_instance()
         pc_instance.dumps_schema()
+
+    def test_pc_fast_deserialization(self) -> None:
+        # the fast path must read instances as the marshmallow schemas do
+        with open(LIFT_PC_PATH) as f:
+            old_instance_json = json.load(f)
+        new_instance_json = json.loads(gen_dummy_pc_instance().dumps_schema())
+        for instance_json in (old_instance_json, new_instance_json):
+            self.assertEqual(
+                PrivateComputationInstance._fast_loads(instance_json),
+                PrivateComputationInstance._loads_with_schemas(instance_json),
+            )
+
+    @patch.object(PrivateComputationInstance, "_fast_loads")
+    def test_pc_deserialization_fallback(self, mock_fast_loads) -> None:
+        mock_fast_loads.side_effect = KeyError("status")
+        pc_instance = gen_dummy_pc_instance()
+
+        self.assertEqual(
+            PrivateComputationInstance.loads_schema(pc_instance.dumps_schema()),
+            pc_instance,
+        )
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from fbpcs.private_computation.entity.infra_config import (
+    InfraConfig,
+    PrivateComputationGameType,
+)
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationInstance,
+    PrivateComputationInstanceStatus,
+    PrivateComputationRole,
+)
+from fbpcs.private_computation.entity.product_config import (
+    CommonProductConfig,
+    LiftConfig,
+)
+from fbpcs.private_computation.repository.private_computation_instance_cache import (
+    PrivateComputationInstanceCache,
+)
+
+
+class TestPrivateComputationInstanceCache(unittest.TestCase):
+    def test_lru(self) -> None:
+        cache = PrivateComputationInstanceCache(max_size=2)
+        instances = [self._get_instance(f"id{i}") for i in range(3)]
+        cache.put(instances[0])
+        cache.put(instances[1])
+        # id0 becomes the most recently used
+        self.assertEqual(cache.get("id0"), instances[0])
+
+        cache.put(instances[2])
+
+        self.assertIsNone(cache.get("id1"))
+        self.assertEqual(cache.get("id0"), instances[0])
+        self.assertEqual(cache.get("id2"), instances[2])
+        cache.invalidate("id2")
+        self.assertIsNone(cache.get("id2"))
+
+    def test_get_returns_copies(self) -> None:
+        cache = PrivateComputationInstanceCache()
+        instance = self._get_instance("id0")
+        cache.put(instance)
+
+        cached_instance = cache.get("id0")
+        self.assertIsNot(cached_instance, instance)
+        # pyre-ignore[16] Optional has no attribute infra_config
+        cached_instance.infra_config.retry_counter += 1
+        instance.infra_config.retry_counter += 2
+
+        self.assertEqual(cache.get("id0"), self._get_instance("id0"))
+
+    def test_check_version(self) -> None:
+        cache = PrivateComputationInstanceCache(check_version=True)
+        instance = self._get_instance("id0")
+        cache.put(instance, "1")
+
+        self.assertEqual(cache.get("id0", "1"), instance)
+        self.assertIsNone(cache.get("id0", "2"))
+        # the stale entry is dropped
+        self.assertIsNone(cache.get("id0", "1"))
+
+    def test_without_version_check(self) -> None:
+        cache = PrivateComputationInstanceCache()
+        instance = self._get_instance("id0")
+        cache.put(instance, "1")
+
+        self.assertEqual(cache.get("id0", "2"), instance)
+
+    def test_concurrent_access(self) -> None:
+        cache = PrivateComputationInstanceCache(max_size=2, check_version=True)
+        instances = [self._get_instance(f"id{i}") for i in range(3)]
+
+        def use_cache(i: int) -> None:
+            for _ in range(100):
+                cache.put(instances[i % 3], "1")
+                # a stale version drops the entry
+                cache.get(f"id{i % 3}", "2")
+                cache.invalidate(f"id{(i + 1) % 3}")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # any error of a thread is raised here
+            list(executor.map(use_cache, range(8)))
+
+        cache.put(instances[0], "1")
+        self.assertEqual(cache.get("id0", "1"), instances[0])
+
+    def _get_instance(self, instance_id: str) -> PrivateComputationInstance:
+        infra_config: InfraConfig = InfraConfig(
+            instance_id=instance_id,
+            role=PrivateComputationRole.PUBLISHER,
+            status=PrivateComputationInstanceStatus.CREATED,
+            status_update_ts=1600000000,
+            instances=[],
+            game_type=PrivateComputationGameType.LIFT,
+            num_pid_containers=1,
+            num_mpc_containers=1,
+            num_files_per_mpc_container=1,
+            mpc_compute_concurrency=1,
+            status_updates=[],
+        )
+        return PrivateComputationInstance(
+            infra_config=infra_config,
+            product_config=LiftConfig(
+                common=CommonProductConfig(input_path="in", output_dir="out"),
+            ),
+        )
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+import os
+import tempfile
+import unittest
+
+from fbpcs.common.entity.stage_state_instance import StageStateInstance
+from fbpcs.private_computation.entity.infra_config import (
+    InfraConfig,
+    PrivateComputationGameType,
+)
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationInstance,
+    PrivateComputationInstanceStatus,
+    PrivateComputationRole,
+)
+from fbpcs.private_computation.entity.product_config import (
+    CommonProductConfig,
+    LiftConfig,
+)
+from fbpcs.private_computation.repository.private_computation_instance_sqlite import (
+    SqlitePrivateComputationInstanceRepository,
+)
+
+
+class TestSqlitePrivateComputationInstanceRepository(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "instances.db")
+        self.repo = SqlitePrivateComputationInstanceRepository(self.db_path)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def test_create_read_delete(self) -> None:
+        instance = self._get_instance("id1")
+        self.repo.create(instance)
+
+        self.assertEqual(self.repo.read("id1"), instance)
+        with self.assertRaises(RuntimeError):
+            self.repo.create(instance)
+
+        self.repo.delete("id1")
+        with self.assertRaises(RuntimeError):
+            self.repo.read("id1")
+        with self.assertRaises(RuntimeError):
+            self.repo.delete("id1")
+
+    def test_update(self) -> None:
+        instance = self._get_instance("id1")
+        with self.assertRaises(RuntimeError):
+            self.repo.update(instance)
+        self.repo.create(instance)
+
+        instance.infra_config.instances.append(
+            StageStateInstance(instance_id="id1", stage_name="aggregation")
+        )
+        instance.infra_config.status = (
+            PrivateComputationInstanceStatus.ID_MATCHING_STARTED
+        )
+        self.repo.update(instance)
+
+        # the database outlives the repository
+        repo = SqlitePrivateComputationInstanceRepository(self.db_path)
+        self.assertEqual(repo.read("id1"), instance)
+        self.assertEqual(repo.get_version("id1"), "1")
+        self.assertEqual(
+            repo.list_instance_ids(
+                statuses=[PrivateComputationInstanceStatus.ID_MATCHING_STARTED]
+            ),
+            ["id1"],
+        )
+
+    def test_compare_and_update(self) -> None:
+        instance = self._get_instance("id1")
+        self.repo.create(instance)
+        version = self.repo.get_version("id1")
+        other_instance = self.repo.read("id1")
+
+        instance.infra_config.status = (
+            PrivateComputationInstanceStatus.ID_MATCHING_STARTED
+        )
+        self.assertTrue(self.repo.compare_and_update(instance, version))
+        # another poller read the same version, and didn't change the status
+        other_instance.infra_config.retry_counter = 1
+        self.assertFalse(self.repo.compare_and_update(other_instance, version))
+        self.assertEqual(self.repo.read("id1"), instance)
+
+        self.assertTrue(
+            self.repo.compare_and_update(other_instance, self.repo.get_version("id1"))
+        )
+        with self.assertRaises(RuntimeError):
+            self.repo.compare_and_update(self._get_instance("id2"), version)
+
+    def test_list_instances(self) -> None:
+        self.repo.create(
+            self._get_instance(
+                "id1", status=PrivateComputationInstanceStatus.COMPUTATION_STARTED
+            )
+        )
+        self.repo.create(
+            self._get_instance(
+                "id2",
+                role=PrivateComputationRole.PARTNER,
+                status_update_ts=1500000000,
+            )
+        )
+        self.repo.create(
+            self._get_instance(
+                "id3",
+                status=PrivateComputationInstanceStatus.ID_MATCHING_STARTED,
+                game_type=PrivateComputationGameType.ATTRIBUTION,
+            )
+        )
+        started_statuses = [
+            status
+            for status in PrivateComputationInstanceStatus
+            if status.value.endswith("_STARTED")
+        ]
+
+        self.assertEqual(self.repo.list_instance_ids(), ["id2", "id1", "id3"])
+        self.assertEqual(
+            self.repo.list_instance_ids(statuses=started_statuses), ["id1", "id3"]
+        )
+        self.assertEqual(
+            self.repo.list_instance_ids(
+                statuses=started_statuses,
+                game_type=PrivateComputationGameType.LIFT,
+            ),
+            ["id1"],
+        )
+        self.assertEqual(
+            self.repo.list_instance_ids(role=PrivateComputationRole.PARTNER), ["id2"]
+        )
+        self.assertEqual(
+            self.repo.list_instance_ids(updated_after=1600000000), ["id1", "id3"]
+        )
+        self.assertEqual(
+            self.repo.list_instance_ids(updated_before=1600000000), ["id2"]
+        )
+        self.assertEqual(self.repo.list_instance_ids(statuses=[]), [])
+        self.assertEqual(
+            self.repo.list_instances(role=PrivateComputationRole.PARTNER),
+            [self.repo.read("id2")],
+        )
+
+    def _get_instance(
+        self,
+        instance_id: str,
+        status: PrivateComputationInstanceStatus = PrivateComputationInstanceStatus.CREATED,
+        role: PrivateComputationRole = PrivateComputationRole.PUBLISHER,
+        game_type: PrivateComputationGameType = PrivateComputationGameType.LIFT,
+        status_update_ts: int = 1600000000,
+    ) -> PrivateComputationInstance:
+        infra_config: InfraConfig = InfraConfig(
+            instance_id=instance_id,
+            role=role,
+            status=status,
+            status_update_ts=status_update_ts,
+            instances=[
+                StageStateInstance(instance_id=instance_id, stage_name="compute")
+            ],
+            game_type=game_type,
+            num_pid_containers=4,
+            num_mpc_containers=4,
+            num_files_per_mpc_container=40,
+            mpc_compute_concurrency=1,
+            status_updates=[],
+        )
+        return PrivateComputationInstance(
+            infra_config=infra_config,
+            product_config=LiftConfig(
+                common=CommonProductConfig(input_path="in", output_dir="out"),
+            ),
+        )
@@ -517,6 +517,288 @@ class TestPCPreValidationStageService(IsolatedAsyncioTestCase):
             pc_instance.infra_config.instances, [mock_stage_state_instance()]
         )
 
+    @patch.object(RunBinaryBaseService, "start_containers")
+    @patch(
+        "fbpcs.private_computation.service.pc_pre_validation_stage_service.StageStateInstance"
+    )
+    async def test_run_async_when_file_mmap_feature_is_enabled_passes_it_to_the_cli(
+        self, mock_stage_state_instance, mock_run_binary_base_service_start_containers
+    ) -> None:
+        pc_instance = PrivateComputationInstance(
+            infra_config=self._get_infra_config(
+                {
+                    PCSFeature.PRE_VALIDATION_FILE_MMAP,
+                    PCSFeature.PUBLISHER_PC_PRE_VALIDATION,
+                    PCSFeature.PARTNER_PC_PRE_VALIDATION,
+                }
+            ),
+            product_config=self._product_config,
+        )
+        mock_container_instance = MagicMock()
+        mock_onedocker_svc = MagicMock()
+        mock_run_binary_base_service_start_containers.return_value = [
+            mock_container_instance
+        ]
+        region = "us-west-1"
+        expected_cmd_args = " ".join(
+            [
+                f"--input-file-path={pc_instance.product_config.common.input_path}",
+                "--cloud-provider=AWS",
+                f"--region={region}",
+                "--binary-version=latest",
+                f"--private-computation-role={PrivateComputationRole.PARTNER}",
+                "--pre-validation-file-mmap=enabled",
+                "--publisher-pc-pre-validation=enabled",
+                "--partner-pc-pre-validation=enabled",
+            ]
+        )
+        pc_validator_config = PCValidatorConfig(
+            region=region,
+            pc_pre_validator_enabled=True,
+        )
+        stage_service = PCPreValidationStageService(
+            pc_validator_config, mock_onedocker_svc, self.onedocker_binary_config_map
+        )
+
+        await stage_service.run_async(
+            pc_instance, NullCertificateProvider(), NullCertificateProvider(), "", ""
+        )
+
+        env_vars = generate_env_vars_dict(repository_path="test_path/")
+        mock_run_binary_base_service_start_containers.assert_called_with(
+            cmd_args_list=[expected_cmd_args],
+            onedocker_svc=mock_onedocker_svc,
+            binary_version="latest",
+            binary_name=OneDockerBinaryNames.PC_PRE_VALIDATION.value,
+            timeout=1200,
+            env_vars=env_vars,
+            wait_for_containers_to_start_up=True,
+            existing_containers=None,
+            container_type=ContainerType.LARGE,
+            permission=ContainerPermissionConfig(self.container_permission_id),
+        )
+
+        mock_stage_state_instance.assert_called_with(
+            pc_instance.infra_config.instance_id,
+            pc_instance.current_stage.name,
+            containers=[mock_container_instance],
+        )
+        self.assertEqual(
+            pc_instance.infra_config.instances, [mock_stage_state_instance()]
+        )
+
+    @patch.object(RunBinaryBaseService, "start_containers")
+    @patch(
+        "fbpcs.private_computation.service.pc_pre_validation_stage_service.StageStateInstance"
+    )
+    async def test_run_async_when_checkpoint_feature_is_enabled_passes_it_to_the_cli(
+        self, mock_stage_state_instance, mock_run_binary_base_service_start_containers
+    ) -> None:
+        pc_instance = PrivateComputationInstance(
+            infra_config=self._get_infra_config(
+                {
+                    PCSFeature.PRE_VALIDATION_FILE_STREAM,
+                    PCSFeature.PRE_VALIDATION_CHECKPOINT,
+                    PCSFeature.PUBLISHER_PC_PRE_VALIDATION,
+                    PCSFeature.PARTNER_PC_PRE_VALIDATION,
+                }
+            ),
+            product_config=self._product_config,
+        )
+        mock_container_instance = MagicMock()
+        mock_onedocker_svc = MagicMock()
+        mock_run_binary_base_service_start_containers.return_value = [
+            mock_container_instance
+        ]
+        region = "us-west-1"
+        expected_cmd_args = " ".join(
+            [
+                f"--input-file-path={pc_instance.product_config.common.input_path}",
+                "--cloud-provider=AWS",
+                f"--region={region}",
+                "--binary-version=latest",
+                f"--private-computation-role={PrivateComputationRole.PARTNER}",
+                "--pre-validation-file-stream=enabled",
+                "--pre-validation-checkpoint=enabled",
+                "--publisher-pc-pre-validation=enabled",
+                "--partner-pc-pre-validation=enabled",
+            ]
+        )
+        pc_validator_config = PCValidatorConfig(
+            region=region,
+            pc_pre_validator_enabled=True,
+        )
+        stage_service = PCPreValidationStageService(
+            pc_validator_config, mock_onedocker_svc, self.onedocker_binary_config_map
+        )
+
+        await stage_service.run_async(
+            pc_instance, NullCertificateProvider(), NullCertificateProvider(), "", ""
+        )
+
+        env_vars = generate_env_vars_dict(repository_path="test_path/")
+        mock_run_binary_base_service_start_containers.assert_called_with(
+            cmd_args_list=[expected_cmd_args],
+            onedocker_svc=mock_onedocker_svc,
+            binary_version="latest",
+            binary_name=OneDockerBinaryNames.PC_PRE_VALIDATION.value,
+            timeout=1200,
+            env_vars=env_vars,
+            wait_for_containers_to_start_up=True,
+            existing_containers=None,
+            container_type=ContainerType.LARGE,
+            permission=ContainerPermissionConfig(self.container_permission_id),
+        )
+
+        mock_stage_state_instance.assert_called_with(
+            pc_instance.infra_config.instance_id,
+            pc_instance.current_stage.name,
+            containers=[mock_container_instance],
+        )
+        self.assertEqual(
+            pc_instance.infra_config.instances, [mock_stage_state_instance()]
+        )
+
+    @patch.object(RunBinaryBaseService, "start_containers")
+    @patch(
+        "fbpcs.private_computation.service.pc_pre_validation_stage_service.StageStateInstance"
+    )
+    async def test_run_async_when_report_cache_feature_is_enabled_passes_it_to_the_cli(
+        self, mock_stage_state_instance, mock_run_binary_base_service_start_containers
+    ) -> None:
+        pc_instance = PrivateComputationInstance(
+            infra_config=self._get_infra_config(
+                {
+                    PCSFeature.PRE_VALIDATION_REPORT_CACHE,
+                    PCSFeature.PUBLISHER_PC_PRE_VALIDATION,
+                    PCSFeature.PARTNER_PC_PRE_VALIDATION,
+                }
+            ),
+            product_config=self._product_config,
+        )
+        mock_container_instance = MagicMock()
+        mock_onedocker_svc = MagicMock()
+        mock_run_binary_base_service_start_containers.return_value = [
+            mock_container_instance
+        ]
+        region = "us-west-1"
+        expected_cmd_args = " ".join(
+            [
+                f"--input-file-path={pc_instance.product_config.common.input_path}",
+                "--cloud-provider=AWS",
+                f"--region={region}",
+                "--binary-version=latest",
+                f"--private-computation-role={PrivateComputationRole.PARTNER}",
+                "--pre-validation-report-cache=enabled",
+                "--publisher-pc-pre-validation=enabled",
+                "--partner-pc-pre-validation=enabled",
+            ]
+        )
+        pc_validator_config = PCValidatorConfig(
+            region=region,
+            pc_pre_validator_enabled=True,
+        )
+        stage_service = PCPreValidationStageService(
+            pc_validator_config, mock_onedocker_svc, self.onedocker_binary_config_map
+        )
+
+        await stage_service.run_async(
+            pc_instance, NullCertificateProvider(), NullCertificateProvider(), "", ""
+        )
+
+        env_vars = generate_env_vars_dict(repository_path="test_path/")
+        mock_run_binary_base_service_start_containers.assert_called_with(
+            cmd_args_list=[expected_cmd_args],
+            onedocker_svc=mock_onedocker_svc,
+            binary_version="latest",
+            binary_name=OneDockerBinaryNames.PC_PRE_VALIDATION.value,
+            timeout=1200,
+            env_vars=env_vars,
+            wait_for_containers_to_start_up=True,
+            existing_containers=None,
+            container_type=ContainerType.LARGE,
+            permission=ContainerPermissionConfig(self.container_permission_id),
+        )
+
+        mock_stage_state_instance.assert_called_with(
+            pc_instance.infra_config.instance_id,
+            pc_instance.current_stage.name,
+            containers=[mock_container_instance],
+        )
+        self.assertEqual(
+            pc_instance.infra_config.instances, [mock_stage_state_instance()]
+        )
+
+    @patch.object(RunBinaryBaseService, "start_containers")
+    @patch(
+        "fbpcs.private_computation.service.pc_pre_validation_stage_service.StageStateInstance"
+    )
+    async def test_run_async_when_sampling_feature_is_enabled_passes_it_to_the_cli(
+        self, mock_stage_state_instance, mock_run_binary_base_service_start_containers
+    ) -> None:
+        pc_instance = PrivateComputationInstance(
+            infra_config=self._get_infra_config(
+                {
+                    PCSFeature.PRE_VALIDATION_SAMPLING,
+                    PCSFeature.PUBLISHER_PC_PRE_VALIDATION,
+                    PCSFeature.PARTNER_PC_PRE_VALIDATION,
+                }
+            ),
+            product_config=self._product_config,
+        )
+        mock_container_instance = MagicMock()
+        mock_onedocker_svc = MagicMock()
+        mock_run_binary_base_service_start_containers.return_value = [
+            mock_container_instance
+        ]
+        region = "us-west-1"
+        expected_cmd_args = " ".join(
+            [
+                f"--input-file-path={pc_instance.product_config.common.input_path}",
+                "--cloud-provider=AWS",
+                f"--region={region}",
+                "--binary-version=latest",
+                f"--private-computation-role={PrivateComputationRole.PARTNER}",
+                "--pre-validation-sampling=enabled",
+                "--publisher-pc-pre-validation=enabled",
+                "--partner-pc-pre-validation=enabled",
+            ]
+        )
+        pc_validator_config = PCValidatorConfig(
+            region=region,
+            pc_pre_validator_enabled=True,
+        )
+        stage_service = PCPreValidationStageService(
+            pc_validator_config, mock_onedocker_svc, self.onedocker_binary_config_map
+        )
+
+        await stage_service.run_async(
+            pc_instance, NullCertificateProvider(), NullCertificateProvider(), "", ""
+        )
+
+        env_vars = generate_env_vars_dict(repository_path="test_path/")
+        mock_run_binary_base_service_start_containers.assert_called_with(
+            cmd_args_list=[expected_cmd_args],
+            onedocker_svc=mock_onedocker_svc,
+            binary_version="latest",
+            binary_name=OneDockerBinaryNames.PC_PRE_VALIDATION.value,
+            timeout=1200,
+            env_vars=env_vars,
+            wait_for_containers_to_start_up=True,
+            existing_containers=None,
+            container_type=ContainerType.LARGE,
+            permission=ContainerPermissionConfig(self.container_permission_id),
+        )
+
+        mock_stage_state_instance.assert_called_with(
+            pc_instance.infra_config.instance_id,
+            pc_instance.current_stage.name,
+            containers=[mock_container_instance],
+        )
+        self.assertEqual(
+            pc_instance.infra_config.instances, [mock_stage_state_instance()]
+        )
+
     def test_should_run_pre_validation_gk_setting_publisher_role(self):
         pc_instance = self._pc_instance
         region = "us-west-1"
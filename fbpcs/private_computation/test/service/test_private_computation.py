@@ -46,6 +46,9 @@ from fbpcs.private_computation.entity.product_config import (
     LiftConfig,
     ProductConfig,
 )
+from fbpcs.private_computation.repository.private_computation_instance_cache import (
+    PrivateComputationInstanceCache,
+)
 from fbpcs.private_computation.service.constants import (
     CA_CERT_PATH,
     DEFAULT_K_ANONYMITY_THRESHOLD_PA,
@@ -632,6 +635,102 @@ class TestPrivateComputationService(unittest.IsolatedAsyncioTestCase):
         instance_mock.current_stage.get_stage_service().get_status.assert_called_once()
         self.private_computation_service.logger.warning.assert_called_once()
 
+    def test_instance_cache(self) -> None:
+        # Arrange
+        self.private_computation_service.instance_cache = (
+            PrivateComputationInstanceCache(check_version=True)
+        )
+        instance_repository = self.private_computation_service.instance_repository
+        pc_instance = self.create_sample_instance(
+            status=PrivateComputationInstanceStatus.CREATED,
+            role=PrivateComputationRole.PARTNER,
+        )
+        instance_repository.read = MagicMock(return_value=pc_instance)
+        instance_repository.get_version = MagicMock(return_value="1")
+        instance_repository.update = MagicMock(
+            side_effect=lambda instance: setattr(
+                instance_repository.get_version, "return_value", "2"
+            )
+        )
+
+        # Act
+        self.private_computation_service.get_instance(self.test_private_computation_id)
+        self.private_computation_service.update_input_path(
+            self.test_private_computation_id, "new_input_path"
+        )
+        cached_instance = self.private_computation_service.get_instance(
+            self.test_private_computation_id
+        )
+        # another process wrote the instance
+        instance_repository.get_version.return_value = "3"
+        self.private_computation_service.get_instance(self.test_private_computation_id)
+
+        # Assert
+        # the instance written by update_input_path
+        self.assertEqual(
+            cached_instance.product_config.common.input_path, "new_input_path"
+        )
+        self.assertEqual(instance_repository.read.call_count, 2)
+
+    def test_instance_cache_failed_update(self) -> None:
+        # Arrange
+        self.private_computation_service.instance_cache = (
+            PrivateComputationInstanceCache()
+        )
+        instance_repository = self.private_computation_service.instance_repository
+        instance_repository.read = MagicMock(
+            return_value=self.create_sample_instance(
+                status=PrivateComputationInstanceStatus.CREATED,
+                role=PrivateComputationRole.PARTNER,
+            )
+        )
+        instance_repository.update = MagicMock(side_effect=RuntimeError())
+
+        # Act
+        with self.assertRaises(RuntimeError):
+            self.private_computation_service.update_input_path(
+                self.test_private_computation_id, "new_input_path"
+            )
+        self.private_computation_service.get_instance(self.test_private_computation_id)
+
+        # Assert
+        # the instance mutated without being written is read again
+        self.assertEqual(instance_repository.read.call_count, 2)
+
+    def test_instance_cache_failed_validation(self) -> None:
+        # Arrange
+        self.private_computation_service.instance_cache = (
+            PrivateComputationInstanceCache()
+        )
+        instance_repository = self.private_computation_service.instance_repository
+        stage = PrivateComputationStageFlow.COMPUTE
+        instance_repository.read = MagicMock(
+            return_value=self.create_sample_instance(
+                status=stage.failed_status,
+                role=PrivateComputationRole.PARTNER,
+                pcs_features={PCSFeature.PCF_TLS},
+            )
+        )
+
+        # Act
+        for _ in range(2):
+            # _validate_tls_data raises after the retry counter is incremented
+            with self.assertRaises(ValueError):
+                self.private_computation_service.run_stage(
+                    self.test_private_computation_id,
+                    stage,
+                    AsyncMock(spec=self._get_dummy_stage_svc()),
+                    server_ips=["127.0.0.1"],
+                )
+        pc_instance = self.private_computation_service.get_instance(
+            self.test_private_computation_id
+        )
+
+        # Assert
+        instance_repository.read.assert_called_once()
+        instance_repository.update.assert_not_called()
+        self.assertEqual(pc_instance.infra_config.retry_counter, 0)
+
     @staticmethod
     def _get_dummy_stage_svc() -> PrivateComputationStageService:
         """create a DummyTestStageService class and instantiate an instance of it"""
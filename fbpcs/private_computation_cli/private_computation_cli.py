@@ -16,7 +16,7 @@ Usage:
     pc-cli run_stage <instance_id> --stage=<stage> --config=<config_file> [--server_ips=<server_ips> --dry_run] [options]
     pc-cli get_instance <instance_id> --config=<config_file> [options]
     pc-cli get_server_ips <instance_id> --config=<config_file> [options]
-    pc-cli run_study <study_id> --config=<config_file> --input_paths=<input_paths> [--objective_ids=<objective_ids> --output_dir=<output_dir> --tries_per_stage=<tries_per_stage> --result_visibility=<result_visibility> --run_id=<run_id> --graphapi_version=<graphapi_version> --graphapi_domain=<graphapi_domain> --dry_run --stage_timeout_override_seconds=<stage_timeout_override_seconds>] [options]
+    pc-cli run_study <study_id> --config=<config_file> --input_paths=<input_paths> [--objective_ids=<objective_ids> --output_dir=<output_dir> --tries_per_stage=<tries_per_stage> --result_visibility=<result_visibility> --run_id=<run_id> --graphapi_version=<graphapi_version> --graphapi_domain=<graphapi_domain> --dry_run --stage_timeout_override_seconds=<stage_timeout_override_seconds> --run_journal=<run_journal> --poll_history=<run_journals> --status_notification_dir=<status_notification_dir>] [options]
     pc-cli pre_validate [<study_id>] --config=<config_file> [--objective_ids=<objective_ids>] --input_paths=<input_paths> [--tries_per_stage=<tries_per_stage> --dry_run] [options]
     pc-cli cancel_current_stage <instance_id> --config=<config_file> [options]
     pc-cli print_instance <instance_id> --config=<config_file> [options]
@@ -25,7 +25,7 @@ Usage:
     pc-cli get_attribution_dataset_info --dataset_id=<dataset_id> --config=<config_file> [options]
     pc-cli run_attribution --config=<config_file> --dataset_id=<dataset_id> --input_path=<input_path> --timestamp=<timestamp> --attribution_rule=<attribution_rule> --aggregation_type=<aggregation_type> --concurrency=<concurrency> --num_files_per_mpc_container=<num_files_per_mpc_container> --k_anonymity_threshold=<k_anonymity_threshold> [--run_id=<run_id> --graphapi_version=<graphapi_version> --graphapi_domain=<graphapi_domain> --stage_timeout_override_seconds=<stage_timeout_override_seconds>] [options]
     pc-cli pre_validate --config=<config_file> [--dataset_id=<dataset_id>] --input_path=<input_path> [--timestamp=<timestamp> --attribution_rule=<attribution_rule> --aggregation_type=<aggregation_type> --concurrency=<concurrency> --num_files_per_mpc_container=<num_files_per_mpc_container> --k_anonymity_threshold=<k_anonymity_threshold>] [options]
-    pc-cli bolt_e2e --bolt_config=<bolt_config_file> [options]
+    pc-cli bolt_e2e --bolt_config=<bolt_config_file> [--trace_path=<trace_path>] [options]
     pc-cli secret_scrubber <secret_input_path> <scrubbed_output_path> [options]
 
 
@@ -49,6 +49,7 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import schema
 from docopt import docopt
+from fbpcs.bolt.bolt_summary_exporter import write_chrome_trace
 from fbpcs.bolt.read_config import parse_bolt_config
 from fbpcs.common.service.graphapi_trace_logging_service import (
     GraphApiTraceLoggingService,
@@ -270,6 +271,10 @@ def main(argv: Optional[List[str]] = None) -> None:
             "--graphapi_version": schema.Or(None, str),
             "--graphapi_domain": schema.Or(None, str),
             "--stage": schema.Or(None, str),
+            "--run_journal": schema.Or(None, str),
+            "--poll_history": schema.Or(None, schema.Use(lambda arg: arg.split(","))),
+            "--status_notification_dir": schema.Or(None, str),
+            "--trace_path": schema.Or(None, str),
             "--verbose": bool,
             "--help": bool,
         }
@@ -448,6 +453,9 @@ def main(argv: Optional[List[str]] = None) -> None:
             final_stage=PrivateComputationStageFlow.AGGREGATE,
             output_dir=arguments["--output_dir"],
             stage_timeout_override=stage_timeout_override,
+            run_journal_path=arguments["--run_journal"],
+            poll_history_journal_paths=arguments["--poll_history"],
+            status_notification_dir=arguments["--status_notification_dir"],
         )
     elif arguments["run_attribution"]:
         stage_flow = PrivateComputationPCF2StageFlow
@@ -518,7 +526,13 @@ def main(argv: Optional[List[str]] = None) -> None:
     elif arguments["bolt_e2e"]:
         bolt_config = ConfigYamlDict.from_file(arguments["--bolt_config"])
         bolt_runner, jobs = parse_bolt_config(config=bolt_config, logger=logger)
-        bolt_summary = asyncio.run(bolt_runner.run_async(jobs))
+        try:
+            bolt_summary = asyncio.run(bolt_runner.run_async(jobs))
+        finally:
+            bolt_runner.publisher_client.close()
+            bolt_runner.partner_client.close()
+        if arguments["--trace_path"]:
+            write_chrome_trace([bolt_summary], arguments["--trace_path"])
         if bolt_summary.is_failure:
             raise RuntimeError(f"Jobs failed: {bolt_summary.failed_job_names}")
         else:
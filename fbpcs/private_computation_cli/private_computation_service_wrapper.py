@@ -38,6 +38,9 @@ from fbpcs.private_computation.entity.product_config import (
 from fbpcs.private_computation.repository.private_computation_instance import (
     PrivateComputationInstanceRepository,
 )
+from fbpcs.private_computation.repository.private_computation_instance_cache import (
+    PrivateComputationInstanceCache,
+)
 
 from fbpcs.private_computation.service.mpc.mpc import MPCService
 from fbpcs.private_computation.service.mpc.mpc_game import MPCGameService
@@ -455,6 +458,14 @@ def build_private_computation_service(
     repository_service = reflect.get_instance(
         instance_repository_config, PrivateComputationInstanceRepository
     )
+    instance_cache_config = pc_config["dependency"].get(
+        "PrivateComputationInstanceCache"
+    )
+    instance_cache = (
+        reflect.get_instance(instance_cache_config, PrivateComputationInstanceCache)
+        if instance_cache_config
+        else None
+    )
     maybe_log_retriever = _try_build_log_retriever(
         pc_config["dependency"].get("LogRetriever")
     )
@@ -501,6 +512,7 @@ def build_private_computation_service(
         metric_svc=metric_svc,
         trace_logging_svc=trace_logging_svc,
         log_retriever=container_service.log_retriever,
+        instance_cache=instance_cache,
     )
 
 
@@ -14,7 +14,7 @@ import random
 import time
 from typing import Any, List
 from unittest import TestCase
-from unittest.mock import MagicMock, patch, PropertyMock
+from unittest.mock import AsyncMock, MagicMock, patch, PropertyMock
 
 import requests
 from fbpcs.pl_coordinator import pl_study_runner
@@ -528,6 +528,39 @@ class TestPlStudyRunner(TestCase):
             logger_mock,
         )
 
+    @patch("fbpcs.pl_coordinator.pl_study_runner.build_private_computation_service")
+    @patch("fbpcs.pl_coordinator.pl_study_runner.BoltPCSClient")
+    @patch("fbpcs.pl_coordinator.pl_study_runner.BoltRunJournal")
+    @patch("fbpcs.pl_coordinator.pl_study_runner.BoltRunner")
+    def test_run_bolt_run_journal(
+        self, mock_runner, mock_journal, mock_pcs_client, mock_build_pcs
+    ) -> None:
+        mock_runner.return_value.run_async = AsyncMock()
+        job = MagicMock()
+        job.job_name = "job"
+        job.publisher_bolt_args.create_instance_args.study_id = self.TEST_STUDY_ID
+        job.partner_bolt_args.create_instance_args.input_path = "input_path"
+
+        asyncio.run(
+            pl_study_runner.run_bolt(
+                self.client_mock,
+                MagicMock(),
+                {"private_computation": {}, "mpc": {}, "pid": {}},
+                self.test_logger,
+                [job],
+                run_journal_path="journal.jsonl",
+            )
+        )
+
+        mock_journal.assert_called_once_with(
+            "journal.jsonl",
+            self.test_logger,
+            run_identity=json.dumps([["job", self.TEST_STUDY_ID, "input_path"]]),
+        )
+        self.assertIs(
+            mock_runner.call_args.kwargs["run_journal"], mock_journal.return_value
+        )
+
     async def _get_graph_api_output(
         self, status: str, feature_list: List[str]
     ) -> requests.Response:
@@ -340,6 +340,9 @@ class TestPrivateComputationCli(TestCase):
                 "--dry_run",
                 f"--output_dir={self.temp_dir_path}",
                 "--stage_timeout_override=4567",
+                "--run_journal=journal.jsonl",
+                "--poll_history=journal1.jsonl,journal2.jsonl",
+                "--status_notification_dir=notifications",
             ]
         )
         pc_cli.main(argv)
@@ -347,6 +350,17 @@ class TestPrivateComputationCli(TestCase):
         self.assertEquals(
             run_study_mock.call_args.kwargs["stage_timeout_override"], 4567
         )
+        self.assertEquals(
+            run_study_mock.call_args.kwargs["run_journal_path"], "journal.jsonl"
+        )
+        self.assertEqual(
+            run_study_mock.call_args.kwargs["poll_history_journal_paths"],
+            ["journal1.jsonl", "journal2.jsonl"],
+        )
+        self.assertEqual(
+            run_study_mock.call_args.kwargs["status_notification_dir"],
+            "notifications",
+        )
 
     @patch("fbpcs.private_computation_cli.private_computation_cli.PreValidateService")
     @patch("fbpcs.private_computation_cli.private_computation_cli.logging.getLogger")
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+CLI tool to benchmark the input data validation of pc_pre_validation
+
+The inputs are generated with the column model of gen_fake_data, and validated
+by InputDataValidator against a local directory standing in for their S3 bucket.
+
+Usage:
+    benchmark_pre_validation [options]
+
+Options:
+    -h --help                     Show this help
+    -n --num_records=<n>          Number of records of each input file [default: 100000]
+    --formats=<formats>           Comma-separated list of input formats, among pl, pa and dfca [default: pl,pa,dfca]
+    --modes=<modes>               Comma-separated list of validation modes, among local, mmap and stream [default: local,stream]
+    --work_dir=<dir>              Directory of the generated input files [default: /tmp/pc_pre_validation_benchmark]
+    --output_json=<path>          Also append the results to this file, one JSON object per line
+"""
+
+import contextlib
+import json
+import os
+import resource
+import shutil
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import docopt
+import schema
+from fbpcs.pc_pre_validation.input_data_validator import InputDataValidator
+from fbpcs.pc_pre_validation.validation_report import ValidationReport
+from fbpcs.private_computation.entity.cloud_provider import CloudProvider
+from fbpcs.private_computation.entity.private_computation_instance import (
+    PrivateComputationRole,
+)
+from fbpcs.scripts.gen_fake_data import _generate_line, InputColumn
+
+BENCHMARK_BUCKET = "pc-pre-validation-benchmark"
+BENCHMARK_REGION = "us-west-2"
+
+# The header of each input format, and the gen_fake_data column each of its columns is generated from
+INPUT_FORMATS: Dict[str, List[Tuple[str, InputColumn]]] = {
+    "pl": [
+        ("id_", InputColumn.id_),
+        ("event_timestamp", InputColumn.event_timestamp),
+        ("value", InputColumn.value),
+    ],
+    "pa": [
+        ("id_", InputColumn.id_),
+        ("conversion_timestamp", InputColumn.event_timestamp),
+        ("conversion_value", InputColumn.value),
+        ("conversion_metadata", InputColumn.features),
+    ],
+    "dfca": [
+        ("id_", InputColumn.id_),
+        ("partner_user_id", InputColumn.row_count),
+    ],
+}
+
+# The InputDataValidator arguments of each validation mode
+VALIDATION_MODES: Dict[str, Dict[str, bool]] = {
+    "local": {"stream_file": False, "mmap_file": False},
+    "mmap": {"stream_file": False, "mmap_file": True},
+    "stream": {"stream_file": True, "mmap_file": False},
+}
+
+PHASES: List[str] = ["download", "shard", "validate", "merge"]
+
+
+@dataclass
+class BenchmarkResult:
+    input_format: str
+    mode: str
+    rows_count: int
+    file_size: int
+    duration: float
+    # Peak resident set size of this process and of the largest worker process so far, in MB
+    peak_rss_mb: float
+    peak_worker_rss_mb: float
+    phase_durations: Dict[str, float]
+    validation_result: str
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_count / self.duration
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.file_size / (1024 * 1024) / self.duration
+
+
+class LocalS3Body:
+    """The streaming body of a local object, read lazily like a botocore StreamingBody"""
+
+    def __init__(self, local_path: str, start: int, end: Optional[int]) -> None:
+        self._local_path = local_path
+        self._start = start
+        self._end = end
+
+    def read(self) -> bytes:
+        with open(self._local_path, "rb") as f:
+            f.seek(self._start)
+            if self._end is None:
+                return f.read()
+            return f.read(self._end - self._start + 1)
+
+    def iter_lines(self, keepends: bool = False) -> Iterator[bytes]:
+        with open(self._local_path, "rb") as f:
+            f.seek(self._start)
+            for line in f:
+                yield line if keepends else line.rstrip(b"\r\n")
+
+
+class LocalS3Client:
+    """The part of the boto3 S3 client that InputDataValidator uses, serving a local file"""
+
+    def __init__(self, local_path: str) -> None:
+        self._local_path = local_path
+
+    def get_object(self, Bucket: str, Key: str, Range: str = "") -> Dict[str, Any]:
+        if not Range:
+            return {"Body": LocalS3Body(self._local_path, 0, None)}
+        start, end = Range[len("bytes=") :].split("-")
+        return {"Body": LocalS3Body(self._local_path, int(start), int(end))}
+
+    def head_object(self, Bucket: str, Key: str) -> Dict[str, Any]:
+        stat = os.stat(self._local_path)
+        return {
+            "ETag": f'"{stat.st_mtime_ns}-{stat.st_size}"',
+            "ContentLength": stat.st_size,
+        }
+
+
+class LocalStorageService:
+    """The part of S3StorageService that InputDataValidator uses, serving a local file.
+
+    The sidecar objects (checkpoints, report caches) are kept in memory.
+    """
+
+    def __init__(self, local_path: str) -> None:
+        self._local_path = local_path
+        self._objects: Dict[str, str] = {}
+
+    def get_file_size(self, filename: str) -> int:
+        return os.path.getsize(self._local_path)
+
+    def copy(self, source: str, destination: str) -> None:
+        shutil.copyfile(self._local_path, destination)
+
+    def file_exists(self, filename: str) -> bool:
+        return filename in self._objects
+
+    def read(self, filename: str) -> str:
+        return self._objects[filename]
+
+    def write(self, filename: str, data: str) -> None:
+        self._objects[filename] = data
+
+
+class BenchmarkInputDataValidator(InputDataValidator):
+    """An InputDataValidator that reads a local file, and times the phases of the validation"""
+
+    def __init__(self, local_path: str, **kwargs: Any) -> None:
+        # Used by _create_s3_client, which the constructor calls
+        self._benchmark_local_path = local_path
+        super().__init__(**kwargs)
+        self._storage_service = LocalStorageService(local_path)
+        self.phase_durations: Dict[str, float] = defaultdict(float)
+
+    def _create_s3_client(self) -> LocalS3Client:
+        return LocalS3Client(self._benchmark_local_path)
+
+    @contextlib.contextmanager
+    def _timed(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_durations[phase] += time.perf_counter() - start
+
+    def _download_input_file(self) -> None:
+        with self._timed("download"):
+            super()._download_input_file()
+
+    def _create_shards(self) -> None:
+        with self._timed("shard"):
+            super()._create_shards()
+
+    def _create_byte_ranges(self) -> None:
+        with self._timed("shard"):
+            super()._create_byte_ranges()
+
+    def _split_byte_ranges(self, *args: Any, **kwargs: Any) -> List[Tuple[int, int]]:
+        with self._timed("shard"):
+            return super()._split_byte_ranges(*args, **kwargs)
+
+    def _run_workers(self, *args: Any, **kwargs: Any) -> List[Any]:
+        validate_duration = self.phase_durations["validate"]
+        start = time.perf_counter()
+        results = super()._run_workers(*args, **kwargs)
+        # What is left once the workers returned is merging their results
+        self.phase_durations["merge"] += (
+            time.perf_counter()
+            - start
+            - (self.phase_durations["validate"] - validate_duration)
+        )
+        return results
+
+    def _map_workers(self, *args: Any, **kwargs: Any) -> List[Any]:
+        with self._timed("validate"):
+            return super()._map_workers(*args, **kwargs)
+
+
+def generate_input_file(input_format: str, num_records: int, path: str) -> None:
+    names = [name for name, _ in INPUT_FORMATS[input_format]]
+    columns = [column for _, column in INPUT_FORMATS[input_format]]
+    with open(path, "w") as f_out:
+        f_out.write(",".join(names) + "\n")
+        for i in range(num_records):
+            out_line = _generate_line(
+                i,
+                "",
+                columns,
+                opportunity_rate=1.0,
+                test_rate=0.5,
+                # Every row has a purchase, so that its timestamp is valid
+                purchase_rate=1.0,
+                incrementality_rate=0.0,
+                min_ts=1600000000,
+                max_ts=1600001000,
+                num_conversions=1,
+                md5_id=True,
+            )
+            f_out.write(",".join(out_line) + "\n")
+
+
+def _get_peak_rss_mb(who: int) -> float:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(who).ru_maxrss / 1024
+
+
+def run_benchmark(
+    input_format: str, mode: str, local_path: str
+) -> Tuple[BenchmarkResult, ValidationReport]:
+    validator = BenchmarkInputDataValidator(
+        local_path,
+        input_file_path=f"https://{BENCHMARK_BUCKET}.s3.{BENCHMARK_REGION}.amazonaws.com/{os.path.basename(local_path)}",
+        cloud_provider=CloudProvider.AWS,
+        region=BENCHMARK_REGION,
+        publisher_pc_pre_validation=False,
+        partner_pc_pre_validation=True,
+        private_computation_role=PrivateComputationRole.PARTNER,
+        **VALIDATION_MODES[mode],
+    )
+    start = time.perf_counter()
+    report = validator.validate()
+    duration = time.perf_counter() - start
+
+    details = report.details or {}
+    result = BenchmarkResult(
+        input_format=input_format,
+        mode=mode,
+        rows_count=details.get("rows_processed_count", 0),
+        file_size=os.path.getsize(local_path),
+        duration=duration,
+        peak_rss_mb=_get_peak_rss_mb(resource.RUSAGE_SELF),
+        peak_worker_rss_mb=_get_peak_rss_mb(resource.RUSAGE_CHILDREN),
+        phase_durations={phase: validator.phase_durations[phase] for phase in PHASES},
+        validation_result=report.validation_result.value,
+    )
+    return result, report
+
+
+def format_results(results: List[BenchmarkResult]) -> str:
+    header = [
+        "format",
+        "mode",
+        "rows",
+        "MB",
+        "seconds",
+        "rows/s",
+        "MB/s",
+        "peak RSS MB",
+        "peak worker RSS MB",
+    ] + [f"{phase} s" for phase in PHASES]
+    rows = [header]
+    for result in results:
+        rows.append(
+            [
+                result.input_format,
+                result.mode,
+                str(result.rows_count),
+                f"{result.file_size / (1024 * 1024):.1f}",
+                f"{result.duration:.2f}",
+                f"{result.rows_per_second:.0f}",
+                f"{result.mb_per_second:.1f}",
+                f"{result.peak_rss_mb:.0f}",
+                f"{result.peak_worker_rss_mb:.0f}",
+            ]
+            + [f"{result.phase_durations[phase]:.2f}" for phase in PHASES]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(value.rjust(width) for value, width in zip(row, widths))
+        for row in rows
+    )
+
+
+def main() -> None:
+    comma_separated = schema.Use(lambda arg: arg.split(","))
+    args_schema = schema.Schema(
+        {
+            "--num_records": schema.Use(int),
+            "--formats": schema.And(
+                comma_separated, lambda formats: set(formats) <= set(INPUT_FORMATS)
+            ),
+            "--modes": schema.And(
+                comma_separated, lambda modes: set(modes) <= set(VALIDATION_MODES)
+            ),
+            "--work_dir": str,
+            "--output_json": schema.Or(None, str),
+            "--help": bool,
+        }
+    )
+    args = args_schema.validate(docopt.docopt(__doc__))
+
+    os.makedirs(args["--work_dir"], exist_ok=True)
+    results = []
+    for input_format in args["--formats"]:
+        local_path = os.path.join(
+            args["--work_dir"], f"{input_format}-{args['--num_records']}.csv"
+        )
+        generate_input_file(input_format, args["--num_records"], local_path)
+        for mode in args["--modes"]:
+            result, report = run_benchmark(input_format, mode, local_path)
+            if result.validation_result != "success":
+                print(f"WARNING: {input_format} {mode} {report.message}")
+            results.append(result)
+
+    # The peak RSS is the maximum since this process started, not for each run
+    print(format_results(results))
+    if args["--output_json"]:
+        with open(args["--output_json"], "a") as f_out:
+            for result in results:
+                f_out.write(json.dumps(asdict(result)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+"""
+CLI tool to load test BoltRunner against simulated publisher and partner instances
+
+The jobs run on SimulatedBoltClient, so that max_parallel_runs and polling can
+be tuned without reaching real infrastructure.
+
+Usage:
+    bolt_load_test [options]
+
+Options:
+    -h --help                           Show this help
+    -n --num_jobs=<n>                   Number of jobs [default: 500]
+    --max_parallel_runs=<n>             Number of jobs run at the same time [default: 10]
+    --poll_interval=<seconds>           Poll interval of the jobs [default: 5]
+    --batch_status_polls                If set, the status polls of the jobs waiting at the same time are batched
+    --num_tries=<n>                     Number of tries of each stage
+    --stage_flow=<stage_flow>           Stage flow of the instances [default: PrivateComputationStageFlow]
+    --stage_duration=<seconds>          Duration of each stage [default: 10]
+    --stage_duration_jitter=<ratio>     Stages last their duration times a uniform factor in [1 - ratio, 1 + ratio] [default: 0.2]
+    --stage_failure_rate=<p>            Probability that a stage run fails [default: 0]
+    --throttle_rate=<p>                 Probability that a request is throttled [default: 0]
+    --max_requests_per_second=<n>       Requests over this rate to each player's backend are throttled
+    --latency_median=<seconds>          Median latency of the requests [default: 0.05]
+    --latency_sigma=<sigma>             Sigma of the log-normal latency of the requests [default: 0.5]
+    --state_staleness=<seconds>         Seconds the state of an instance read by a client is reused [default: 1]
+    --seed=<seed>                       Seed of the simulation
+    --output_json=<path>                Also append the result to this file, as a JSON object
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Type
+
+import docopt
+import schema
+from fbpcs.bolt.bolt_job import BoltJob, BoltPlayerArgs
+from fbpcs.bolt.bolt_runner import BoltRunner
+from fbpcs.bolt.simulated_bolt_client import (
+    SimulatedBoltClient,
+    SimulatedBoltClientConfig,
+    SimulatedBoltCreateInstanceArgs,
+)
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+)
+from fbpcs.private_computation.stage_flows.private_computation_stage_flow import (
+    PrivateComputationStageFlow,
+)
+
+# Seconds between two checks of the event loop lag
+EVENT_LOOP_LAG_CHECK_INTERVAL = 0.1
+
+
+@dataclass
+class LoadTestResult:
+    num_jobs: int
+    num_successes: int
+    # Seconds from the start of the first job to the end of the last one
+    makespan: float
+    # CPU time of this process during the run, in seconds
+    coordinator_cpu_time: float
+    # How late the event loop ran a callback scheduled at a fixed interval, in seconds
+    max_event_loop_lag: float
+    p95_event_loop_lag: float
+    # Requests to the simulated backends of both players, by BoltClient method
+    request_counts: Dict[str, int]
+    throttled_requests: int
+
+    @property
+    def coordinator_cpu_utilization(self) -> float:
+        return self.coordinator_cpu_time / self.makespan
+
+    @property
+    def requests_per_second(self) -> float:
+        return sum(self.request_counts.values()) / self.makespan
+
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up a task sleeping at a fixed interval"""
+
+    def __init__(self, interval: float = EVENT_LOOP_LAG_CHECK_INTERVAL) -> None:
+        self.interval = interval
+        self.lags: List[float] = []
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(loop.time() - start - self.interval, 0))
+
+
+async def run_load_test(
+    num_jobs: int,
+    client_config: SimulatedBoltClientConfig,
+    max_parallel_runs: Optional[int] = None,
+    poll_interval: int = 5,
+    batch_status_polls: bool = False,
+    num_tries: Optional[int] = None,
+    stage_flow: Type[PrivateComputationBaseStageFlow] = PrivateComputationStageFlow,
+    logger: Optional[logging.Logger] = None,
+) -> LoadTestResult:
+    publisher_client = SimulatedBoltClient(client_config, logger)
+    partner_client = SimulatedBoltClient(
+        SimulatedBoltClientConfig(
+            **{
+                **asdict(client_config),
+                # the players don't share their random draws
+                "seed": None if client_config.seed is None else client_config.seed + 1,
+            }
+        ),
+        logger,
+    )
+    runner = BoltRunner(
+        publisher_client=publisher_client,
+        partner_client=partner_client,
+        max_parallel_runs=max_parallel_runs,
+        num_tries=num_tries,
+        logger=logger,
+        batch_status_polls=batch_status_polls,
+    )
+    jobs = [
+        BoltJob(
+            job_name=f"load_test_job_{i}",
+            publisher_bolt_args=BoltPlayerArgs(
+                SimulatedBoltCreateInstanceArgs(
+                    instance_id=f"publisher_{i}", stage_flow=stage_flow
+                )
+            ),
+            partner_bolt_args=BoltPlayerArgs(
+                SimulatedBoltCreateInstanceArgs(
+                    instance_id=f"partner_{i}", stage_flow=stage_flow
+                )
+            ),
+            poll_interval=poll_interval,
+        )
+        for i in range(num_jobs)
+    ]
+
+    monitor = EventLoopLagMonitor()
+    monitor_task = asyncio.ensure_future(monitor.run())
+    start = time.perf_counter()
+    start_cpu_time = time.process_time()
+    try:
+        summary = await runner.run_async(jobs)
+    finally:
+        monitor_task.cancel()
+    makespan = time.perf_counter() - start
+    coordinator_cpu_time = time.process_time() - start_cpu_time
+
+    lags = sorted(monitor.lags) or [0.0]
+    return LoadTestResult(
+        num_jobs=num_jobs,
+        num_successes=summary.num_successes,
+        makespan=makespan,
+        coordinator_cpu_time=coordinator_cpu_time,
+        max_event_loop_lag=lags[-1],
+        p95_event_loop_lag=lags[int(0.95 * (len(lags) - 1))],
+        request_counts=dict(
+            publisher_client.request_counts + partner_client.request_counts
+        ),
+        throttled_requests=publisher_client.throttled_requests
+        + partner_client.throttled_requests,
+    )
+
+
+def format_result(result: LoadTestResult) -> str:
+    lines = [
+        f"jobs: {result.num_jobs}, succeeded: {result.num_successes}",
+        f"makespan: {result.makespan:.2f} s",
+        f"coordinator CPU: {result.coordinator_cpu_time:.2f} s ({result.coordinator_cpu_utilization:.1%})",
+        f"event loop lag: p95 {result.p95_event_loop_lag * 1000:.1f} ms, max {result.max_event_loop_lag * 1000:.1f} ms",
+        f"requests: {sum(result.request_counts.values())} ({result.requests_per_second:.1f}/s), throttled: {result.throttled_requests}",
+    ]
+    for method, count in Counter(result.request_counts).most_common():
+        lines.append(f"    {method}: {count} ({count / result.makespan:.1f}/s)")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    optional_int = schema.Or(None, schema.Use(int))
+    args_schema = schema.Schema(
+        {
+            "--num_jobs": schema.Use(int),
+            "--max_parallel_runs": schema.Use(int),
+            "--poll_interval": schema.Use(int),
+            "--batch_status_polls": bool,
+            "--num_tries": optional_int,
+            "--stage_flow": schema.Use(PrivateComputationBaseStageFlow.cls_name_to_cls),
+            "--stage_duration": schema.Use(float),
+            "--stage_duration_jitter": schema.Use(float),
+            "--stage_failure_rate": schema.Use(float),
+            "--throttle_rate": schema.Use(float),
+            "--max_requests_per_second": schema.Or(None, schema.Use(float)),
+            "--latency_median": schema.Use(float),
+            "--latency_sigma": schema.Use(float),
+            "--state_staleness": schema.Use(float),
+            "--seed": optional_int,
+            "--output_json": schema.Or(None, str),
+            "--help": bool,
+        }
+    )
+    args = args_schema.validate(docopt.docopt(__doc__))
+
+    # the runner logs every poll of every job
+    logging.basicConfig(level=logging.WARNING)
+    client_config = SimulatedBoltClientConfig(
+        default_stage_duration=args["--stage_duration"],
+        stage_duration_jitter=args["--stage_duration_jitter"],
+        stage_failure_rate=args["--stage_failure_rate"],
+        throttle_rate=args["--throttle_rate"],
+        max_requests_per_second=args["--max_requests_per_second"],
+        latency_median=args["--latency_median"],
+        latency_sigma=args["--latency_sigma"],
+        state_staleness=args["--state_staleness"],
+        seed=args["--seed"],
+    )
+    result = asyncio.run(
+        run_load_test(
+            num_jobs=args["--num_jobs"],
+            client_config=client_config,
+            max_parallel_runs=args["--max_parallel_runs"],
+            poll_interval=args["--poll_interval"],
+            batch_status_polls=args["--batch_status_polls"],
+            num_tries=args["--num_tries"],
+            stage_flow=args["--stage_flow"],
+        )
+    )
+
+    print(format_result(result))
+    if args["--output_json"]:
+        with open(args["--output_json"], "a") as f_out:
+            f_out.write(json.dumps(asdict(result)) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import os
+import tempfile
+import unittest
+
+from fbpcs.pc_pre_validation.enums import ValidationResult
+from fbpcs.scripts import benchmark_pre_validation
+
+
+class TestBenchmarkPreValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.work_dir.cleanup)
+
+    def test_generate_input_file(self) -> None:
+        path = os.path.join(self.work_dir.name, "pa.csv")
+
+        benchmark_pre_validation.generate_input_file("pa", 10, path)
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(
+            lines[0], "id_,conversion_timestamp,conversion_value,conversion_metadata"
+        )
+        self.assertEqual(len(lines), 11)
+        self.assertTrue(all(len(line.split(",")) == 4 for line in lines))
+
+    def test_run_benchmark(self) -> None:
+        for input_format in benchmark_pre_validation.INPUT_FORMATS:
+            path = os.path.join(self.work_dir.name, f"{input_format}.csv")
+            benchmark_pre_validation.generate_input_file(input_format, 100, path)
+            for mode in benchmark_pre_validation.VALIDATION_MODES:
+                with self.subTest(input_format=input_format, mode=mode):
+                    result, report = benchmark_pre_validation.run_benchmark(
+                        input_format, mode, path
+                    )
+
+                    self.assertEqual(report.validation_result, ValidationResult.SUCCESS)
+                    self.assertEqual(result.rows_count, 100)
+                    self.assertEqual(result.file_size, os.path.getsize(path))
+                    self.assertGreater(result.phase_durations["validate"], 0)
+                    self.assertEqual(
+                        result.phase_durations["download"] > 0, mode != "stream"
+                    )
+
+    def test_format_results(self) -> None:
+        result = benchmark_pre_validation.BenchmarkResult(
+            input_format="pl",
+            mode="stream",
+            rows_count=1000,
+            file_size=2 * 1024 * 1024,
+            duration=2.0,
+            peak_rss_mb=100.0,
+            peak_worker_rss_mb=50.0,
+            phase_durations={
+                "download": 0.0,
+                "shard": 0.1,
+                "validate": 1.8,
+                "merge": 0.1,
+            },
+            validation_result="success",
+        )
+
+        header, row = benchmark_pre_validation.format_results([result]).splitlines()
+
+        self.assertEqual(
+            row.split(),
+            [
+                "pl",
+                "stream",
+                "1000",
+                "2.0",
+                "2.00",
+                "500",
+                "1.0",
+                "100",
+                "50",
+                "0.00",
+                "0.10",
+                "1.80",
+                "0.10",
+            ],
+        )
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+import unittest
+
+from fbpcs.bolt.simulated_bolt_client import SimulatedBoltClientConfig
+from fbpcs.private_computation.entity.private_computation_status import (
+    PrivateComputationInstanceStatus,
+)
+from fbpcs.private_computation.service.private_computation_stage_service import (
+    PrivateComputationStageService,
+    PrivateComputationStageServiceArgs,
+)
+from fbpcs.private_computation.stage_flows.private_computation_base_stage_flow import (
+    PrivateComputationBaseStageFlow,
+    PrivateComputationStageFlowData,
+)
+from fbpcs.scripts import bolt_load_test
+
+
+class TestBoltLoadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_run_load_test(self) -> None:
+        result = await bolt_load_test.run_load_test(
+            num_jobs=20,
+            client_config=SimulatedBoltClientConfig(
+                default_stage_duration=0.01, state_staleness=0, seed=0
+            ),
+            max_parallel_runs=5,
+            poll_interval=0,
+            stage_flow=DummyLoadTestStageFlow,
+        )
+
+        self.assertEqual(result.num_jobs, 20)
+        self.assertEqual(result.num_successes, 20)
+        self.assertGreater(result.makespan, 0)
+        self.assertGreater(result.coordinator_cpu_time, 0)
+        self.assertGreaterEqual(result.max_event_loop_lag, result.p95_event_loop_lag)
+        # both players of each job ran the stage once
+        self.assertEqual(result.request_counts["run_stage"], 2 * 20)
+        self.assertEqual(result.request_counts["create_instance"], 2 * 20)
+        self.assertEqual(result.throttled_requests, 0)
+
+    def test_format_result(self) -> None:
+        result = bolt_load_test.LoadTestResult(
+            num_jobs=10,
+            num_successes=9,
+            makespan=10.0,
+            coordinator_cpu_time=1.0,
+            max_event_loop_lag=0.01,
+            p95_event_loop_lag=0.002,
+            request_counts={"run_stage": 20, "update_instance": 80},
+            throttled_requests=3,
+        )
+
+        lines = bolt_load_test.format_result(result).splitlines()
+
+        self.assertEqual(lines[0], "jobs: 10, succeeded: 9")
+        self.assertEqual(lines[2], "coordinator CPU: 1.00 s (10.0%)")
+        self.assertEqual(lines[3], "event loop lag: p95 2.0 ms, max 10.0 ms")
+        self.assertEqual(lines[4], "requests: 100 (10.0/s), throttled: 3")
+        self.assertEqual(lines[5], "    update_instance: 80 (8.0/s)")
+
+
+class DummyLoadTestStageFlow(PrivateComputationBaseStageFlow):
+    CREATED = PrivateComputationStageFlowData(
+        initialized_status=PrivateComputationInstanceStatus.CREATION_INITIALIZED,
+        started_status=PrivateComputationInstanceStatus.CREATION_STARTED,
+        completed_status=PrivateComputationInstanceStatus.CREATED,
+        failed_status=PrivateComputationInstanceStatus.CREATION_FAILED,
+        is_joint_stage=False,
+    )
+    ID_MATCH = PrivateComputationStageFlowData(
+        initialized_status=PrivateComputationInstanceStatus.ID_MATCHING_INITIALIZED,
+        started_status=PrivateComputationInstanceStatus.ID_MATCHING_STARTED,
+        completed_status=PrivateComputationInstanceStatus.ID_MATCHING_COMPLETED,
+        failed_status=PrivateComputationInstanceStatus.ID_MATCHING_FAILED,
+        is_joint_stage=True,
+    )
+
+    def get_stage_service(
+        self, args: PrivateComputationStageServiceArgs
+    ) -> PrivateComputationStageService:
+        raise NotImplementedError()